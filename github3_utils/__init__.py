@@ -56,22 +56,26 @@ Handy utilities for `github3.py <https://github3.readthedocs.io/en/latest/>`_.
 import datetime
 import os
 from contextlib import contextmanager
-from typing import Iterable, Iterator, List, Optional, Union, cast, overload
-
-# 3rd party
-import attr
-from apeye_core import URL
-from click import echo
-from github3 import GitHub
-from github3.orgs import Organization
-from github3.repos import Repository, ShortRepository
-from github3.repos.branch import Branch
-from github3.users import User
-from typing_extensions import Literal
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, Iterator, List, Optional, Union, cast, overload
 
 # this package
+from github3_utils._instrumentation import instrumented
 from github3_utils.headers import LUKE_CAGE
 
+# Third-party packages are imported when first needed, to keep ``import github3_utils`` fast.
+if TYPE_CHECKING:
+	# 3rd party
+	from github3 import GitHub
+	from github3.orgs import Organization
+	from github3.repos import Repository, ShortRepository
+	from github3.repos.branch import Branch
+	from github3.users import User
+	from typing_extensions import Literal
+
+	# this package
+	from github3_utils._impersonate import Impersonate
+	from github3_utils.caching import TTLCache
+
 __author__: str = "Dominic Davis-Foster"
 __copyright__: str = "2020 Dominic Davis-Foster"
 __license__: str = "MIT License"
@@ -86,6 +90,7 @@ __all__ = (
 		"Impersonate",
 		"get_repos",
 		"iter_repos",
+		"iter_owner_repos",
 		)
 
 
@@ -105,7 +110,7 @@ class RateLimitExceeded(RuntimeError):
 
 
 @contextmanager
-def echo_rate_limit(github: GitHub, verbose: bool = True) -> Iterator[GitHub]:
+def echo_rate_limit(github: "GitHub", verbose: bool = True) -> Iterator["GitHub"]:
 	"""
 	Contextmanager to echo the GitHub API rate limit before and after making a series of requests.
 
@@ -115,6 +120,9 @@ def echo_rate_limit(github: GitHub, verbose: bool = True) -> Iterator[GitHub]:
 	:raises: :exc:`click.Abort` if the rate limit has been exceeded.
 	"""
 
+	# 3rd party
+	from click import echo
+
 	rate = github.rate_limit()["rate"]
 	remaining_requests = rate["remaining"]
 	reset = datetime.datetime.fromtimestamp(rate["reset"])
@@ -136,19 +144,30 @@ def echo_rate_limit(github: GitHub, verbose: bool = True) -> Iterator[GitHub]:
 		echo(f"Used {used_requests} requests. {new_remaining_requests} remaining. Resets at {reset}")
 
 
-def get_user(github: GitHub) -> User:
+@instrumented
+def get_user(github: "GitHub", cache: Optional["TTLCache"] = None) -> "User":
 	"""
 	Retrieve a :class:`github3.users.User` object for the authenticated user.
 
 	:param github:
+	:param cache: A cache for the user's details, which is shared between calls.
+
+		.. versionadded:: 0.9.0
 	"""
 
+	# 3rd party
+	from github3.users import User
+
+	# this package
+	from github3_utils.caching import _cached_json
+
 	url = github._build_url("user")
-	json = github._json(github._get(url), 200)
+	json = _cached_json(cache, github, ("user", ), lambda: github._json(github._get(url), 200))
 	return github._instance_or_null(User, json)
 
 
-def protect_branch(branch: Branch, status_checks: Optional[List[str]] = None) -> bool:
+@instrumented
+def protect_branch(branch: "Branch", status_checks: Optional[List[str]] = None) -> bool:
 	"""
 	Enable force push protection and configure status check enforcement.
 
@@ -159,6 +178,9 @@ def protect_branch(branch: Branch, status_checks: Optional[List[str]] = None) ->
 	:returns: :py:obj:`True` if successful, :py:obj:`False` otherwise.
 	"""
 
+	# 3rd party
+	from apeye_core import URL
+
 	previous_values = None
 	previous_protection = getattr(branch, "original_protection", {})
 
@@ -168,19 +190,9 @@ def protect_branch(branch: Branch, status_checks: Optional[List[str]] = None) ->
 	if status_checks is None and previous_values:
 		status_checks = previous_values["contexts"]
 
-	edit = {
-			"required_status_checks": {"strict": False, "contexts": status_checks},
-			"enforce_admins": None,
-			"required_pull_request_reviews": {
-					"dismiss_stale_reviews": False,
-					"required_approving_review_count": 1,
-					},
-			"restrictions": None,
-			}
-
 	resp = branch._put(
 			str(URL(branch._api) / "protection"),
-			json=edit,
+			json=_protection_edit(status_checks),
 			headers=LUKE_CAGE,
 			)
 
@@ -191,87 +203,39 @@ def protect_branch(branch: Branch, status_checks: Optional[List[str]] = None) ->
 		return False
 
 
-@attr.s
-class Impersonate:
-	"""
-	Context manager to make commits as a specific user.
-
-	Sets the following environment variables:
-
-	* ``GIT_COMMITTER_NAME``
-	* ``GIT_COMMITTER_EMAIL``
-	* ``GIT_AUTHOR_NAME``
-	* ``GIT_AUTHOR_EMAIL``
-
-	.. attention::
+def _protection_edit(status_checks: Optional[List[str]]) -> Dict[str, Any]:
+	# The body of the request to protect a branch.
 
-		Any changes to environment variables made during the scope
-		of the context manager will be reset on exit.
-
-	.. latex:clearpage::
-
-	:bold-title:`Example:`
-
-	.. code-block:: python
-
-		name = "repo-helper[bot]"
-		email = f"74742576+{name}@users.noreply.github.com"
-
-		commit_as_bot = Impersonate(name=name, email=email)
-
-		with commit_as_bot():
-			...
-
-	"""
-
-	#: The name of the committer.
-	name: str = attr.ib()
-
-	#: The email address of the committer.
-	email: str = attr.ib()
-
-	@contextmanager
-	def __call__(self) -> Iterator[None]:
-		"""
-		The context manager itself.
-		"""
-
-		_environ = dict(os.environ)  # or os.environ.copy()
-
-		try:
-			name = "repo-helper[bot]"
-			email = f"74742576+{name}@users.noreply.github.com"
-
-			os.environ["GIT_COMMITTER_NAME"] = name
-			os.environ["GIT_COMMITTER_EMAIL"] = email
-			os.environ["GIT_AUTHOR_NAME"] = name
-			os.environ["GIT_AUTHOR_EMAIL"] = email
-
-			yield
-
-		finally:
-			os.environ.clear()
-			os.environ.update(_environ)
+	return {
+			"required_status_checks": {"strict": False, "contexts": status_checks},
+			"enforce_admins": None,
+			"required_pull_request_reviews": {
+					"dismiss_stale_reviews": False,
+					"required_approving_review_count": 1,
+					},
+			"restrictions": None,
+			}
 
 
 @overload
 def get_repos(
-		user_or_org: Union[User, Organization],
-		full: Literal[True],
-		) -> Iterator[Repository]: ...
+		user_or_org: Union["User", "Organization"],
+		full: "Literal[True]",
+		) -> Iterator["Repository"]: ...
 
 
 @overload
 def get_repos(
-		user_or_org: Union[User, Organization],
-		full: Literal[False] = ...,
-		) -> Iterator[ShortRepository]: ...
+		user_or_org: Union["User", "Organization"],
+		full: "Literal[False]" = ...,
+		) -> Iterator["ShortRepository"]: ...
 
 
+@instrumented
 def get_repos(
-		user_or_org: Union[User, Organization],
+		user_or_org: Union["User", "Organization"],
 		full: bool = False,
-		) -> Union[Iterator[Repository], Iterator[ShortRepository]]:
+		) -> Union[Iterator["Repository"], Iterator["ShortRepository"]]:
 	"""
 	Returns an iterator over the user or organisation's repositories.
 
@@ -282,22 +246,31 @@ def get_repos(
 		Otherwise, yields :class:`~github3.repos.repo.ShortRepository` objects
 	"""
 
+	# 3rd party
+	from github3.repos import ShortRepository
+
+	# this package
+	from github3_utils.pagination import Paginator
+
 	url = user_or_org._build_url("users", user_or_org.login, "repos")
 	params = {"type": "owner", "sort": "full_name", "direction": "asc"}
 
-	repo: ShortRepository
-	for repo in user_or_org._iter(-1, url, ShortRepository, params):  # type: ignore[arg-type,assignment]
+	for repo in Paginator(user_or_org, url, params, ShortRepository):
 		if full:
-			yield cast(Repository, repo.refresh())
+			yield cast("Repository", repo.refresh())
 		else:
 			yield repo
 
 
+@instrumented
 def iter_repos(
-		github: GitHub,
+		github: "GitHub",
 		users: Iterable[str] = (),
 		orgs: Iterable[str] = (),
-		) -> Iterator[ShortRepository]:
+		cache: Optional["TTLCache"] = None,
+		*,
+		resolve: bool = True,
+		) -> Iterator["ShortRepository"]:
 	"""
 	Returns an iterator over the repositories belonging to all ``users`` and all ``orgs``.
 
@@ -306,21 +279,148 @@ def iter_repos(
 	:param github:
 	:param users: An iterable of usernames to fetch the repositories for.
 	:param orgs: An iterable of organization names to fetch the repositories for.
+	:param cache: A cache for the details of the users and organizations, which is shared between calls.
+		The repositories themselves are not cached.
+
+		.. versionadded:: 0.9.0
+
+	:param resolve: If :py:obj:`False` the users and organizations are not looked up first,
+		and their repositories are listed with :func:`~.iter_owner_repos`.
+		This saves a request per owner, but a missing owner raises :exc:`github3.exceptions.NotFoundError`
+		rather than :exc:`ValueError`.
+
+		.. versionadded:: 0.9.0
 	"""
 
+	if not resolve:
+		for user in users:
+			yield from iter_owner_repos(github, user)
+		for org in orgs:
+			yield from iter_owner_repos(github, org, org=True)
+		return
+
+	# 3rd party
+	from github3.orgs import Organization
+	from github3.users import User
+
+	# this package
+	from github3_utils.caching import _cached_json
+
+	def lookup(kind: str, login: str, fetch: Callable[[str], Any]) -> Any:
+		if cache is None:
+			return fetch(login)
+
+		def fetch_json() -> Optional[Dict[str, Any]]:
+			owner = fetch(login)
+			return None if owner is None else owner.as_dict()
+
+		# Logins are case insensitive.
+		json = _cached_json(cache, github, (kind, login.lower()), fetch_json)
+		return github._instance_or_null(User if kind == "users" else Organization, json)
+
 	# pylint: disable=loop-invariant-statement
 	for user in users:
-		_user: Optional[User] = github.user(user)
+		_user: Optional["User"] = lookup("users", user, github.user)
 		if _user is None:
 			raise ValueError(f"No such user {user}")
 
 		yield from get_repos(_user, full=False)
 
 	for org in orgs:
-		_org: Optional[Organization] = github.organization(org)
+		_org: Optional["Organization"] = lookup("orgs", org, github.organization)
 
 		if _org is None:
 			raise ValueError(f"No such organization {org}")
 
 		yield from get_repos(_org, full=False)
 	# pylint: enable=loop-invariant-statement
+
+
+@instrumented
+def iter_owner_repos(
+		github: "GitHub",
+		owner: str,
+		*,
+		org: bool = False,
+		type: Optional[str] = None,  # noqa: A002  # pylint: disable=redefined-builtin
+		visibility: Optional[str] = None,
+		sort: str = "full_name",
+		direction: Optional[str] = None,
+		since: Union[str, datetime.datetime, None] = None,
+		) -> Iterator["ShortRepository"]:
+	"""
+	Returns an iterator over the repositories belonging to a user or organization,
+	without first looking up the user or organization.
+
+	.. versionadded:: 0.9.0
+
+	The filters are applied by GitHub, so repositories which don't match are never sent.
+
+	:param github:
+	:param owner: The login of the user or organization.
+	:param org: Whether ``owner`` is an organization.
+	:param type: The type of repositories to list, such as ``'sources'`` or ``'forks'``.
+		Defaults to ``'owner'`` for users and ``'all'`` for organizations.
+	:param visibility: Not supported by the endpoints for listing a user's or organization's repositories,
+		which ignore it. Use ``type='public'`` or ``type='private'`` for organizations instead.
+	:param sort: ``'full_name'``, ``'created'``, ``'updated'`` or ``'pushed'``.
+	:param direction: ``'asc'`` or ``'desc'``. Defaults to ascending for ``full_name`` and descending otherwise.
+	:param since: Stop at the first repository last pushed (or updated) before this time.
+		Requires ``sort`` to be ``'pushed'`` or ``'updated'``, in descending order.
+		Naive datetimes are taken to be in UTC.
+	"""  # noqa: D400
+
+	# 3rd party
+	from github3.repos import ShortRepository
+
+	# this package
+	from github3_utils.pagination import DEFAULT_READ_AHEAD, Paginator
+
+	if visibility is not None:
+		raise ValueError(
+				"GitHub doesn't filter a user's or organization's repositories by 'visibility'. "
+				"Use type='public' or type='private' for organizations instead.",
+				)
+
+	params = {"type": type or ("all" if org else "owner"), "sort": sort}
+
+	if direction is not None:
+		params["direction"] = direction
+
+	if since is not None:
+		if sort not in {"pushed", "updated"} or direction not in {None, "desc"}:
+			raise ValueError("'since' requires sort='pushed' or sort='updated', in descending order.")
+
+		if isinstance(since, datetime.datetime):
+			if since.tzinfo is not None:
+				since = since.astimezone(datetime.timezone.utc)
+			since = since.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+	url = github._build_url("orgs" if org else "users", owner, "repos")
+
+	# Scans with a cutoff usually stop within the first page, so don't request pages which won't be needed.
+	repos = Paginator(github, url, params, read_ahead=DEFAULT_READ_AHEAD if since is None else 0)
+
+	for json in repos:
+		# GitHub's timestamps are in UTC and have a fixed width, so compare them as strings.
+		if since is not None and (json.get(f"{sort}_at") or '') < since:
+			return
+
+		yield ShortRepository(json, github)
+
+
+if os.environ.get("GITHUB3_UTILS_PROFILE", '0') not in {'', '0'}:  # pragma: no cover
+	# this package
+	from github3_utils.profiling import _start_from_environment
+
+	_start_from_environment()
+
+
+def __getattr__(name: str) -> Any:
+	if name == "Impersonate":
+		# this package
+		from github3_utils._impersonate import Impersonate
+
+		return Impersonate
+
+	raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
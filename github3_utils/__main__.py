@@ -0,0 +1,443 @@
+#!/usr/bin/env python3
+#
+#  __main__.py
+"""
+The ``github3-utils`` command-line interface.
+
+.. versionadded:: 0.9.0
+
+Each subcommand writes one JSON object per line to standard output as soon as it is available,
+so results can be consumed by other tools before the whole run has finished.
+
+.. code-block:: bash
+
+	$ github3-utils repos --user domdfcoding --org sphinx-toolbox --jobs 4 | jq -r .full_name
+
+The ``--jobs`` option controls how many repositories (or owners, or installations) are processed at once.
+If any of them fail a line of the form ``{"target": ..., "error": ...}`` is written in place of its results,
+and the command exits with a non-zero status once the remaining jobs have finished.
+With the ``--http2`` option the jobs' requests share one HTTP/2 connection (see :mod:`github3_utils.transport`).
+"""
+#
+#  Copyright © 2026 Dominic Davis-Foster <dominic@davis-foster.co.uk>
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+#  EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+#  MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+#  IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+#  DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+#  OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+#  OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+# stdlib
+import json
+import os
+import queue
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, TypeVar
+
+# 3rd party
+import click
+
+# this package
+from github3_utils.click import token_option
+
+if TYPE_CHECKING:
+	# 3rd party
+	from github3 import GitHub
+
+__all__ = ("main", )
+
+_T = TypeVar("_T")
+_C = TypeVar("_C", bound=click.Command)
+
+#: Marks the end of the results for one target on the results queue.
+_DONE = object()
+
+
+def _make_client(tokens: Sequence[str], api_url: str, jobs: int, http2: bool = False) -> "GitHub":
+	# 3rd party
+	from github3 import GitHub
+	from requests.adapters import HTTPAdapter
+
+	# this package
+	from github3_utils.single_flight import SingleFlight
+	from github3_utils.token_pool import TokenPool
+
+	github = GitHub()
+	github.session.base_url = api_url.rstrip('/')
+
+	if tokens:
+		TokenPool(tokens).install(github)
+
+	if http2:
+		# this package
+		from github3_utils.transport import HTTPXAdapter
+
+		# The worker threads' requests share one connection.
+		HTTPXAdapter.install(github)
+	else:
+		# Allow one pooled connection per worker thread.
+		adapter = HTTPAdapter(pool_maxsize=max(jobs, 10))
+		github.session.mount("https://", adapter)
+		github.session.mount("http://", adapter)
+
+	if jobs > 1:
+		# Workers often ask for the same resource at once, such as a repository's public key.
+		SingleFlight().install(github)
+
+	return github
+
+
+def _parse_repository(ctx: click.Context, param: click.Parameter, value: Sequence[str]) -> List[Tuple[str, str]]:
+	repositories = []
+
+	for full_name in value:
+		owner, _, name = full_name.partition('/')
+		if not owner or not name or '/' in name:
+			raise click.BadParameter(f"{full_name!r} is not of the form OWNER/REPO", ctx=ctx, param=param)
+		repositories.append((owner, name))
+
+	return repositories
+
+
+def _stream(
+		func: Callable[[_T], Iterable[Dict[str, Any]]],
+		targets: Sequence[_T],
+		jobs: int,
+		describe: Callable[[_T], str] = str,
+		) -> int:
+	"""
+	Call ``func`` for each target in a pool of ``jobs`` threads,
+	writing each result to stdout as a line of JSON as soon as it is produced.
+
+	:returns: The number of targets which failed.
+	"""  # noqa: D400
+
+	results: "queue.Queue[Any]" = queue.Queue()
+
+	def work(target: _T) -> None:
+		try:
+			for record in func(target):
+				results.put(record)
+		except Exception as e:  # pylint: disable=broad-except
+			results.put(_Failure(describe(target), e))
+		finally:
+			results.put(_DONE)
+
+	failures = 0
+	remaining = len(targets)
+
+	with ThreadPoolExecutor(max_workers=max(jobs, 1)) as pool:
+		for target in targets:
+			pool.submit(work, target)
+
+		while remaining:
+			record = results.get()
+
+			if record is _DONE:
+				remaining -= 1
+				continue
+
+			if isinstance(record, _Failure):
+				failures += 1
+				record = record.to_dict()
+
+			click.echo(json.dumps(record, default=str))
+
+	return failures
+
+
+class _Failure:
+
+	def __init__(self, target: str, error: Exception):
+		self.target = target
+		self.error = error
+
+	def to_dict(self) -> Dict[str, str]:
+		return {"target": self.target, "error": f"{type(self.error).__name__}: {self.error}"}
+
+
+def _finish(failures: int) -> None:
+	if failures:
+		click.echo(f"{failures} job{'s' if failures != 1 else ''} failed.", err=True)
+		sys.exit(1)
+
+
+def _common_options(func: _C) -> _C:
+	jobs_option = click.option(
+			"-j",
+			"--jobs",
+			type=click.IntRange(min=1),
+			default=1,
+			show_default=True,
+			help="The number of jobs to run concurrently.",
+			)
+	api_url_option = click.option(
+			"--api-url",
+			type=click.STRING,
+			default="https://api.github.com",
+			show_default=True,
+			envvar="GITHUB_API_URL",
+			help="The base URL of the GitHub API.",
+			)
+
+	http2_option = click.option(
+			"--http2",
+			is_flag=True,
+			default=False,
+			help="Send the requests over HTTP/2. Requires the 'http2' extra.",
+			)
+
+	return api_url_option(jobs_option(http2_option(func)))
+
+
+@click.group(context_settings={"help_option_names": ["-h", "--help"]})
+def main() -> None:
+	"""
+	Handy utilities for github3.py.
+	"""
+
+
+@_common_options
+@click.option("-u", "--user", "users", multiple=True, help="List repositories belonging to this user.")
+@click.option("-o", "--org", "orgs", multiple=True, help="List repositories belonging to this organization.")
+@token_option(multiple=True)
+@main.command()
+def repos(
+		tokens: Tuple[str, ...],
+		users: Sequence[str],
+		orgs: Sequence[str],
+		jobs: int,
+		api_url: str,
+		http2: bool,
+		) -> None:
+	"""
+	List the repositories belonging to users and organizations.
+	"""
+
+	# this package
+	from github3_utils import iter_owner_repos
+
+	github = _make_client(tokens, api_url, jobs, http2)
+
+	def list_owner(owner: Tuple[str, str]) -> Iterator[Dict[str, Any]]:
+		owner_type, login = owner
+
+		for repo in iter_owner_repos(github, login, org=owner_type == "org"):
+			yield repo.as_dict()
+
+	owners = [("user", user) for user in users] + [("org", org) for org in orgs]
+	_finish(_stream(list_owner, owners, jobs, describe=lambda owner: owner[1]))
+
+
+@_common_options
+@click.option(
+		"--app-id",
+		type=click.INT,
+		required=True,
+		envvar="GITHUB_APP_ID",
+		help="The integer identifier for the GitHub App.",
+		)
+@click.option(
+		"--private-key",
+		type=click.Path(exists=True, dir_okay=False),
+		required=True,
+		envvar="GITHUB_APP_PRIVATE_KEY",
+		help="The file containing the private key for the GitHub App.",
+		)
+@main.command()
+def installations(app_id: int, private_key: str, jobs: int, api_url: str, http2: bool) -> None:
+	"""
+	List the repositories a GitHub App is installed for.
+	"""
+
+	# this package
+	from github3_utils.apps import ContextSwitcher, _iter_installation_repos
+
+	with open(private_key, "rb") as fp:
+		private_key_pem = fp.read()
+
+	context_switcher = ContextSwitcher(_make_client((), api_url, jobs, http2), private_key_pem, app_id)
+	app_client = context_switcher.app_client()
+
+	def list_installation(installation: Any) -> Iterator[Dict[str, Any]]:
+		client = context_switcher.installation_client(installation)
+
+		for repository in _iter_installation_repos(client, installation):
+			yield {"installation_id": installation.id, **repository}
+
+	_finish(
+			_stream(
+					list_installation,
+					list(app_client.app_installations()),
+					jobs,
+					describe=lambda installation: installation.account["login"],
+					),
+			)
+
+
+@_common_options
+@click.argument("repositories", metavar="OWNER/REPO...", nargs=-1, required=True, callback=_parse_repository)
+@click.option(
+		"-n",
+		"--number",
+		"numbers",
+		type=click.INT,
+		multiple=True,
+		help="Only label this pull request. By default all open pull requests are labelled.",
+		)
+@token_option(multiple=True)
+@main.command("label-failures")
+def label_failures(
+		tokens: Tuple[str, ...],
+		repositories: List[Tuple[str, str]],
+		numbers: Sequence[int],
+		jobs: int,
+		api_url: str,
+		http2: bool,
+		) -> None:
+	"""
+	Label pull requests with the names of their failing checks.
+	"""
+
+	# this package
+	from github3_utils.check_labels import label_pr_failures
+
+	github = _make_client(tokens, api_url, jobs, http2)
+
+	def list_pulls(repository: Tuple[str, str]) -> Iterator[Tuple[str, Any]]:
+		repo = github.repository(*repository)
+
+		if numbers:
+			for number in numbers:
+				yield repo.full_name, repo.pull_request(number)
+		else:
+			for pull in repo.pull_requests(state="open"):
+				yield repo.full_name, pull
+
+	pulls: List[Tuple[str, Any]] = []
+	failures = 0
+
+	for repository in repositories:
+		try:
+			pulls.extend(list_pulls(repository))
+		except Exception as e:  # pylint: disable=broad-except
+			failures += 1
+			click.echo(json.dumps(_Failure('/'.join(repository), e).to_dict()))
+
+	def label(target: Tuple[str, Any]) -> Iterator[Dict[str, Any]]:
+		full_name, pull = target
+		labels = label_pr_failures(pull)
+		yield {"repository": full_name, "number": pull.number, "labels": sorted(labels)}
+
+	failures += _stream(label, pulls, jobs, describe=lambda target: f"{target[0]}#{target[1].number}")
+	_finish(failures)
+
+
+@_common_options
+@click.argument("repositories", metavar="OWNER/REPO...", nargs=-1, required=True, callback=_parse_repository)
+@click.option(
+		"-s",
+		"--secret",
+		"secrets",
+		multiple=True,
+		required=True,
+		help="The name of a secret to set. The value is read from the environment variable of the same name.",
+		)
+@token_option(multiple=True)
+@main.command("sync-secrets")
+def sync_secrets(
+		tokens: Tuple[str, ...],
+		repositories: List[Tuple[str, str]],
+		secrets: Sequence[str],
+		jobs: int,
+		api_url: str,
+		http2: bool,
+		) -> None:
+	"""
+	Set GitHub Actions secrets on repositories.
+	"""
+
+	# this package
+	from github3_utils.secrets import get_public_key, set_secret
+
+	missing = [name for name in secrets if name not in os.environ]
+	if missing:
+		raise click.UsageError(f"The environment variable(s) {', '.join(missing)} are not set.")
+
+	values = {name: os.environ[name] for name in secrets}
+	github = _make_client(tokens, api_url, jobs, http2)
+
+	def sync(repository: Tuple[str, str]) -> Iterator[Dict[str, Any]]:
+		repo = github.repository(*repository)
+		public_key = get_public_key(repo)
+
+		for name, value in values.items():
+			response = set_secret(repo, name, value, public_key)
+			response.raise_for_status()
+			status = "created" if response.status_code == 201 else "updated"
+			yield {"repository": repo.full_name, "secret": name, "status": status}
+
+	_finish(_stream(sync, repositories, jobs, describe='/'.join))
+
+
+@_common_options
+@click.argument("repositories", metavar="OWNER/REPO...", nargs=-1, required=True, callback=_parse_repository)
+@click.option(
+		"-b",
+		"--branch",
+		type=click.STRING,
+		default=None,
+		help="The branch to protect. Defaults to each repository's default branch.",
+		)
+@click.option(
+		"-c",
+		"--check",
+		"checks",
+		multiple=True,
+		help="A status check which must pass before merging. If omitted the existing checks are kept.",
+		)
+@token_option(multiple=True)
+@main.command()
+def protect(
+		tokens: Tuple[str, ...],
+		repositories: List[Tuple[str, str]],
+		branch: Optional[str],
+		checks: Sequence[str],
+		jobs: int,
+		api_url: str,
+		http2: bool,
+		) -> None:
+	"""
+	Enable branch protection and required status checks.
+	"""
+
+	# this package
+	from github3_utils import protect_branch
+
+	github = _make_client(tokens, api_url, jobs, http2)
+
+	def protect_repository(repository: Tuple[str, str]) -> Iterator[Dict[str, Any]]:
+		repo = github.repository(*repository)
+		branch_name = branch or repo.default_branch
+		protected = protect_branch(repo.branch(branch_name), list(checks) or None)
+		yield {"repository": repo.full_name, "branch": branch_name, "protected": protected}
+
+	_finish(_stream(protect_repository, repositories, jobs, describe='/'.join))
+
+
+if __name__ == "__main__":
+	sys.exit(main())
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+#
+#  _impersonate.py
+"""
+:class:`~github3_utils.Impersonate`, which is defined separately so :mod:`attr` is only imported when it is used.
+"""
+#
+#  Copyright © 2020 Dominic Davis-Foster <dominic@davis-foster.co.uk>
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+#  EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+#  MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+#  IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+#  DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+#  OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+#  OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+# stdlib
+import os
+from contextlib import contextmanager
+from typing import Iterator
+
+# 3rd party
+import attr
+
+__all__ = ("Impersonate", )
+
+
+@attr.s
+class Impersonate:
+	"""
+	Context manager to make commits as a specific user.
+
+	Sets the following environment variables:
+
+	* ``GIT_COMMITTER_NAME``
+	* ``GIT_COMMITTER_EMAIL``
+	* ``GIT_AUTHOR_NAME``
+	* ``GIT_AUTHOR_EMAIL``
+
+	.. attention::
+
+		Any changes to environment variables made during the scope
+		of the context manager will be reset on exit.
+
+	.. latex:clearpage::
+
+	:bold-title:`Example:`
+
+	.. code-block:: python
+
+		name = "repo-helper[bot]"
+		email = f"74742576+{name}@users.noreply.github.com"
+
+		commit_as_bot = Impersonate(name=name, email=email)
+
+		with commit_as_bot():
+			...
+
+	"""
+
+	#: The name of the committer.
+	name: str = attr.ib()
+
+	#: The email address of the committer.
+	email: str = attr.ib()
+
+	@contextmanager
+	def __call__(self) -> Iterator[None]:
+		"""
+		The context manager itself.
+		"""
+
+		_environ = dict(os.environ)  # or os.environ.copy()
+
+		try:
+			name = "repo-helper[bot]"
+			email = f"74742576+{name}@users.noreply.github.com"
+
+			os.environ["GIT_COMMITTER_NAME"] = name
+			os.environ["GIT_COMMITTER_EMAIL"] = email
+			os.environ["GIT_AUTHOR_NAME"] = name
+			os.environ["GIT_AUTHOR_EMAIL"] = email
+
+			yield
+
+		finally:
+			os.environ.clear()
+			os.environ.update(_environ)
+
+
+# Documented, and importable, as github3_utils.Impersonate
+Impersonate.__module__ = "github3_utils"
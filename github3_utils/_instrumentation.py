@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+#
+#  _instrumentation.py
+"""
+Tracks which ``github3_utils`` helper function is making requests, for use by metrics and other instrumentation.
+"""
+#
+#  Copyright © 2026 Dominic Davis-Foster <dominic@davis-foster.co.uk>
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+#  EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+#  MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+#  IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+#  DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+#  OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+#  OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+# stdlib
+import functools
+import sys
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple, TypeVar
+
+if sys.version_info >= (3, 8):  # pragma: no cover (<py38)
+	# stdlib
+	from typing import Protocol
+else:  # pragma: no cover (py38+)
+	# 3rd party
+	from typing_extensions import Protocol
+
+__all__ = (
+		"HelperCall",
+		"HelperListener",
+		"add_listener",
+		"current_call",
+		"current_helper",
+		"instrumented",
+		"remove_listener",
+		)
+
+_F = TypeVar("_F", bound=Callable[..., Any])
+
+# Equal to inspect.CO_GENERATOR. The inspect module is slow to import.
+_CO_GENERATOR = 0x20
+
+
+class HelperCall:
+	"""
+	Represents a single call to a ``github3_utils`` helper function.
+
+	:param name: The name of the helper function.
+	:param parent: The helper call which was executing when this one started, if any.
+	"""
+
+	__slots__ = ("name", "parent", "data")
+
+	def __init__(self, name: str, parent: Optional["HelperCall"]):
+		self.name = name
+		self.parent = parent
+
+		#: Storage for listeners to associate their own state (such as a tracing span) with the call.
+		self.data: Dict[Any, Any] = {}
+
+
+class HelperListener(Protocol):
+	"""
+	:class:`typing.Protocol` for objects notified when helper functions start and finish.
+	"""
+
+	def helper_started(self, call: HelperCall) -> None:
+		"""
+		Called when a helper function starts.
+
+		:param call:
+		"""
+
+	def helper_finished(self, call: HelperCall, error: Optional[BaseException]) -> None:
+		"""
+		Called when a helper function returns or raises, or when a generator helper is exhausted or closed.
+
+		:param call:
+		:param error: The exception raised by the helper, if any.
+		"""
+
+
+_current_call: ContextVar[Optional[HelperCall]] = ContextVar("github3_utils_helper", default=None)
+_listeners: Tuple[HelperListener, ...] = ()
+
+
+def add_listener(listener: HelperListener) -> None:
+	"""
+	Register an object to be notified when helper functions start and finish.
+
+	:param listener:
+	"""
+
+	global _listeners
+
+	if listener not in _listeners:
+		_listeners = (*_listeners, listener)
+
+
+def remove_listener(listener: HelperListener) -> None:
+	"""
+	Stop notifying the given object when helper functions start and finish.
+
+	:param listener:
+	"""
+
+	global _listeners
+
+	_listeners = tuple(existing for existing in _listeners if existing is not listener)
+
+
+def current_call() -> Optional[HelperCall]:
+	"""
+	Returns the innermost helper call currently executing,
+	or :py:obj:`None` if requests are being made outside of a helper.
+	"""  # noqa: D400
+
+	return _current_call.get()
+
+
+def current_helper() -> Optional[str]:
+	"""
+	Returns the name of the innermost ``github3_utils`` helper function currently executing,
+	or :py:obj:`None` if requests are being made outside of a helper.
+	"""  # noqa: D400
+
+	call = _current_call.get()
+	return None if call is None else call.name
+
+
+def _start(name: str) -> HelperCall:
+	call = HelperCall(name, _current_call.get())
+
+	for listener in _listeners:
+		listener.helper_started(call)
+
+	return call
+
+
+def _finish(call: HelperCall, error: Optional[BaseException]) -> None:
+	for listener in _listeners:
+		listener.helper_finished(call, error)
+
+
+def instrumented(func: _F) -> _F:
+	"""
+	Decorator to mark a public helper function, so requests made while it executes can be attributed to it.
+
+	For generator functions the helper is only marked as executing while the generator is advanced,
+	not while the caller is processing each item.
+	The call starts when the generator is first advanced, and finishes when it is exhausted or closed.
+
+	:param func:
+	"""
+
+	name = func.__qualname__
+	code = getattr(func, "__code__", None)
+
+	if code is not None and code.co_flags & _CO_GENERATOR:
+
+		@functools.wraps(func)
+		def generator_wrapper(*args, **kwargs) -> Iterator[Any]:
+			gen = func(*args, **kwargs)
+			call = _start(name)
+			error: Optional[BaseException] = None
+
+			try:
+				while True:
+					token = _current_call.set(call)
+					try:
+						item = next(gen)
+					except StopIteration:
+						return
+					finally:
+						_current_call.reset(token)
+
+					yield item
+
+			except GeneratorExit:
+				raise
+
+			except BaseException as e:
+				error = e
+				raise
+
+			finally:
+				gen.close()
+				_finish(call, error)
+
+		return generator_wrapper  # type: ignore[return-value]
+
+	@functools.wraps(func)
+	def wrapper(*args, **kwargs) -> Any:
+		call = _start(name)
+		token = _current_call.set(call)
+		error: Optional[BaseException] = None
+
+		try:
+			return func(*args, **kwargs)
+		except BaseException as e:
+			error = e
+			raise
+		finally:
+			_current_call.reset(token)
+			_finish(call, error)
+
+	return wrapper  # type: ignore[return-value]
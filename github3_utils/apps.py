@@ -28,18 +28,26 @@ Functions and classes for GitHub apps.
 
 # stdlib
 import datetime
-from typing import Dict, Iterator, Optional
+import threading
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Dict, Iterator, Optional, Union
 
 # 3rd party
 import attr
-from domdf_python_tools.dates import calc_easter
-from domdf_python_tools.stringlist import DelimitedList
-from github3 import GitHub
-from github3.apps import Installation
 from typing_extensions import Literal
 
 # this package
+from github3_utils._instrumentation import instrumented
 from github3_utils.headers import MACHINE_MAN
+from github3_utils.pagination import Paginator
+
+if TYPE_CHECKING:
+	# 3rd party
+	from github3 import GitHub
+	from github3.apps import Installation
+
+	# this package
+	from github3_utils.sharding import Coordinator
 
 __all__ = ("ContextSwitcher", "iter_installed_repos", "make_footer_links")
 
@@ -51,7 +59,7 @@ class ContextSwitcher:
 	"""
 
 	#:
-	client: GitHub = attr.ib()
+	client: "GitHub" = attr.ib()
 
 	#: The bytes of the private key for this GitHub App.
 	private_key_pem: bytes = attr.ib()
@@ -59,6 +67,27 @@ class ContextSwitcher:
 	#: The integer identifier for this GitHub App.
 	app_id: int = attr.ib()
 
+	#: The maximum number of clients :meth:`~.ContextSwitcher.installation_client` keeps.
+	#: The least recently used client is discarded first.
+	#:
+	#: .. versionadded:: 0.9.0
+	max_clients: int = attr.ib(default=32, kw_only=True)
+
+	#: Shares installation access tokens with other processes,
+	#: so :meth:`~.ContextSwitcher.installation_client` only requests a new token when none is shared.
+	#:
+	#: .. versionadded:: 0.9.0
+	token_cache: Optional["Coordinator"] = attr.ib(default=None, kw_only=True, eq=False)
+
+	_installation_clients: "OrderedDict[int, GitHub]" = attr.ib(
+			factory=OrderedDict,
+			init=False,
+			repr=False,
+			eq=False,
+			)
+	_app_client: Optional["GitHub"] = attr.ib(default=None, init=False, repr=False, eq=False)
+	_lock: threading.Lock = attr.ib(factory=threading.Lock, init=False, repr=False, eq=False)
+
 	def login_as_app(self) -> None:
 		"""
 		Login as the GitHub app.
@@ -110,11 +139,98 @@ class ContextSwitcher:
 
 		return installation_id
 
+	def _new_client(self) -> "GitHub":
+		# 3rd party
+		from github3 import GitHub
+
+		github = GitHub()
+		session, shared = github.session, self.client.session
+
+		session.base_url = shared.base_url
+		session.default_connect_timeout = shared.default_connect_timeout
+		session.default_read_timeout = shared.default_read_timeout
+		session.hooks["response"].extend(shared.hooks["response"])
+
+		# Share the connection pools of the original client.
+		for prefix, adapter in shared.adapters.items():
+			session.mount(prefix, adapter)
+
+		return github
+
+	def app_client(self) -> "GitHub":
+		"""
+		Returns a client which is logged in as the GitHub app.
+
+		Unlike :meth:`~.ContextSwitcher.login_as_app` this does not change the authentication of :attr:`~.client`.
+		The client is replaced with a new one shortly before its token expires.
+
+		.. versionadded:: 0.9.0
+		"""
+
+		with self._lock:
+			if self._app_client is None or _expires_soon(self._app_client):
+				self._app_client = self._new_client()
+				self._app_client.login_as_app(self.private_key_pem, str(self.app_id))
+
+			return self._app_client
+
+	def installation_client(self, installation: Union[int, "Installation"]) -> "GitHub":
+		"""
+		Returns a client which is logged in as the given installation of the GitHub app.
+
+		Clients are cached, and share the connection pool of :attr:`~.client` without changing its authentication.
+		This allows several installations to be used at once from different threads.
+		A client is replaced with a new one shortly before its installation token expires.
+
+		.. versionadded:: 0.9.0
 
+		:param installation: The installation, or its integer identifier.
+		"""
+
+		installation_id = installation if isinstance(installation, int) else installation.id
+
+		with self._lock:
+			github = self._installation_clients.get(installation_id)
+			if github is not None and not _expires_soon(github):
+				self._installation_clients.move_to_end(installation_id)
+				return github
+
+		# Fetching the token is done without the lock, so other installations aren't held up.
+		github = self._new_client()
+		token = None if self.token_cache is None else self.token_cache.get_token(installation_id)
+
+		if token is not None:
+			github.session.app_installation_token_auth(token)
+		else:
+			github.login_as_app_installation(self.private_key_pem, self.app_id, installation_id)
+
+			if self.token_cache is not None:
+				auth = github.session.auth
+				self.token_cache.set_token(installation_id, auth.token, auth.expires_at_str)
+
+		with self._lock:
+			self._installation_clients[installation_id] = github
+			self._installation_clients.move_to_end(installation_id)
+
+			while len(self._installation_clients) > self.max_clients:
+				self._installation_clients.popitem(last=False)
+
+		return github
+
+
+def _expires_soon(github: "GitHub") -> bool:
+	expires_at = getattr(github.session.auth, "expires_at", None)
+	if expires_at is None:
+		return False
+
+	return datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(minutes=1) >= expires_at
+
+
+@instrumented
 def iter_installed_repos(
 		*,
 		context_switcher: Optional[ContextSwitcher] = None,
-		client: Optional[GitHub] = None,
+		client: Optional["GitHub"] = None,
 		private_key_pem: Optional[bytes] = None,
 		app_id: Optional[int] = None,
 		) -> Iterator[Dict]:
@@ -146,40 +262,21 @@ def iter_installed_repos(
 	context_switcher.login_as_app()
 	client = context_switcher.client
 
-	installation: Installation
-	for installation in client.app_installations(context_switcher.app_id):
-		# print(installation)
-		# print(installation.account)
-		username = installation.account["login"]
-
-		context_switcher.login_as_app()
-		context_switcher.login_as_user_installation(username)
-
+	installation: "Installation"
+	for installation in client.app_installations():
 		# Get repositories for this user.
+		installation_client = context_switcher.installation_client(installation)
+		yield from _iter_installation_repos(installation_client, installation)
 
-		headers = {**installation.session.headers, **MACHINE_MAN}
-
-		def get_page(page: int = 1) -> Dict:
-			assert context_switcher is not None
 
-			return context_switcher.client.session.get(
-					installation.repositories_url,
-					params={"per_page": 100, "page": page},
-					headers=headers,  # pylint: disable=cell-var-from-loop
-					).json()
+def _iter_installation_repos(client: "GitHub", installation: "Installation") -> Iterator[Dict]:
+	# The client must be logged in as the installation.
 
-		response = get_page()
-		total_repos = response["total_count"]
-		yield from response["repositories"]
+	headers = {**installation.session.headers, **MACHINE_MAN}
+	url = installation.repositories_url
 
-		total_repos -= len(response["repositories"])
-		page = 2
-
-		while total_repos > 0:
-			response = get_page(page)
-			page += 1
-			yield from response["repositories"]
-			total_repos -= len(response["repositories"])
+	# The endpoint doesn't always give a Link header, so the paginator falls back to the total_count.
+	yield from Paginator(client, url, {"page": 1}, items_key="repositories", headers=headers)
 
 
 _FooterType = Literal["marketplace", "app"]
@@ -205,6 +302,10 @@ def make_footer_links(
 	.. versionadded:: 0.3.0
 	"""
 
+	# 3rd party
+	from domdf_python_tools.dates import calc_easter
+	from domdf_python_tools.stringlist import DelimitedList
+
 	if event_date is None:
 		event_date = datetime.date.today()
 	elif isinstance(event_date, datetime.datetime):
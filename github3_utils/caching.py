@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+#
+#  caching.py
+"""
+An in-memory cache for lookups which rarely change, such as users and organizations.
+
+.. versionadded:: 0.9.0
+
+.. code-block:: python
+
+	cache = TTLCache(maxsize=256, ttl=600)
+
+	# Later calls within ten minutes don't look up the authenticated user, or the organization, again.
+	me = get_user(github, cache=cache)
+	repos = list(iter_repos(github, orgs=["sphinx-toolbox"], cache=cache))
+
+Entries are keyed by a hash of the client's credentials, so a cache can be shared between clients
+authenticated as different users without one seeing the other's results. Tokens are never stored in the cache.
+
+Once every check run on a commit has completed, the result of :func:`~.get_checks_for_pr` for it won't change
+(unless a check is re-run), so a :class:`~.ChecksCache` keeps those results until it fills up:
+
+.. code-block:: python
+
+	checks_cache = ChecksCache(maxsize=4096)
+
+	# Only pull requests whose head commit has queued or in-progress check runs are fetched again.
+	for pull in repo.pull_requests(state="open"):
+		label_pr_failures(pull, cache=checks_cache)
+"""
+#
+#  Copyright © 2026 Dominic Davis-Foster <dominic@davis-foster.co.uk>
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+#  EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+#  MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+#  IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+#  DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+#  OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+#  OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+# stdlib
+import hashlib
+import math
+import threading
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Callable, Dict, Hashable, Optional, Tuple
+
+if TYPE_CHECKING:
+	# 3rd party
+	from github3 import GitHub
+	from github3.models import GitHubCore
+
+__all__ = ("ChecksCache", "TTLCache", "credentials_hash")
+
+
+class TTLCache:
+	"""
+	A thread-safe mapping whose entries expire after a fixed time.
+
+	:param maxsize: The maximum number of entries. The least recently used entry is discarded to make room.
+	:param ttl: The time in seconds after which an entry expires.
+	:param timer: The function giving the current time in seconds.
+	"""
+
+	def __init__(self, maxsize: int = 256, ttl: float = 600.0, *, timer: Callable[[], float] = time.monotonic):
+		if maxsize < 1:
+			raise ValueError("'maxsize' must be at least 1.")
+
+		self.maxsize = maxsize
+		self.ttl = ttl
+		self.timer = timer
+
+		self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+		self._lock = threading.Lock()
+
+	def get(self, key: Hashable, default: Any = None) -> Any:
+		"""
+		Returns the value for ``key``, or ``default`` if it is missing or has expired.
+
+		:param key:
+		:param default:
+		"""
+
+		with self._lock:
+			entry = self._entries.get(key)
+
+			if entry is None:
+				return default
+
+			expires, value = entry
+			if expires <= self.timer():
+				del self._entries[key]
+				return default
+
+			self._entries.move_to_end(key)
+			return value
+
+	def set(self, key: Hashable, value: Any) -> None:  # noqa: A003  # pylint: disable=redefined-builtin
+		"""
+		Store ``value`` for ``key``, replacing any existing value.
+
+		:param key:
+		:param value:
+		"""
+
+		with self._lock:
+			self._entries[key] = (self.timer() + self.ttl, value)
+			self._entries.move_to_end(key)
+
+			while len(self._entries) > self.maxsize:
+				self._entries.popitem(last=False)
+
+	def pop(self, key: Hashable, default: Any = None) -> Any:
+		"""
+		Remove ``key`` from the cache, returning its value or ``default`` if it was not present.
+
+		:param key:
+		:param default:
+		"""
+
+		with self._lock:
+			entry = self._entries.pop(key, None)
+
+		return default if entry is None else entry[1]
+
+	def clear(self) -> None:
+		"""
+		Remove all entries from the cache.
+		"""
+
+		with self._lock:
+			self._entries.clear()
+
+	def __len__(self) -> int:
+		with self._lock:
+			return len(self._entries)
+
+	def __contains__(self, key: object) -> bool:
+		return self.get(key, _MISSING) is not _MISSING
+
+
+_MISSING = object()
+
+
+class ChecksCache(TTLCache):
+	"""
+	A thread-safe cache of the results of :func:`~.get_checks_for_pr` for commits whose check runs have all completed.
+
+	Entries are keyed by the commit SHA, the repository and a hash of the client's credentials, and never expire.
+
+	:param maxsize: The maximum number of commits. The least recently used commit is discarded to make room.
+	"""
+
+	def __init__(self, maxsize: int = 1024):
+		super().__init__(maxsize, ttl=math.inf)
+
+
+def credentials_hash(github: "GitHubCore") -> str:
+	"""
+	Returns a hash identifying the API URL and credentials the given client authenticates with.
+
+	:param github:
+	"""
+
+	auth = github.session.auth
+	material = [github.session.base_url]
+
+	if hasattr(auth, "tokens"):
+		# TokenPool
+		material.extend(auth.tokens)
+	elif hasattr(auth, "token"):
+		material.append(auth.token)
+	elif hasattr(auth, "username"):
+		material.extend([auth.username, auth.password])
+
+	return hashlib.sha256('\x00'.join(map(str, material)).encode("UTF-8")).hexdigest()
+
+
+def _cached_json(
+		cache: Optional[TTLCache],
+		github: "GitHub",
+		key: Tuple[str, ...],
+		fetch: Callable[[], Optional[Dict[str, Any]]],
+		) -> Optional[Dict[str, Any]]:
+	# Returns the JSON for a lookup, fetching it if it isn't cached.
+	# The JSON is cached rather than the github3 object, as the object holds a reference to the client's session.
+
+	if cache is None:
+		return fetch()
+
+	full_key = (credentials_hash(github), *key)
+	json = cache.get(full_key)
+
+	if json is None:
+		json = fetch()
+		if json is not None:
+			cache.set(full_key, json)
+
+	return json
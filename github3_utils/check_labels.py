@@ -30,17 +30,26 @@ Helpers for creating labels to mark pull requests with which tests are failing.
 
 # stdlib
 import re
-from typing import Dict, NamedTuple, Set, Union
+from typing import TYPE_CHECKING, Dict, NamedTuple, Optional, Set, Union
 
 # 3rd party
 import attr
-import github3.issues.label
 from domdf_python_tools.doctools import prettify_docstrings
-from github3.checks import CheckRun
-from github3.issues import Issue
-from github3.pulls import PullRequest, ShortPullRequest
-from github3.repos import Repository
-from github3.repos.commit import ShortCommit
+
+# this package
+from github3_utils._instrumentation import instrumented
+from github3_utils.caching import credentials_hash
+from github3_utils.pagination import Paginator
+
+if TYPE_CHECKING:
+	# 3rd party
+	import github3.issues.label
+	from github3.issues import Issue
+	from github3.pulls import PullRequest, ShortPullRequest
+	from github3.repos import Repository
+
+	# this package
+	from github3_utils.caching import ChecksCache
 
 __all__ = ("Label", "check_status_labels", "Checks", "get_checks_for_pr", "label_pr_failures")
 
@@ -75,7 +84,7 @@ class Label:
 				"description": self.description,
 				}
 
-	def create(self, repo: Repository) -> github3.issues.label.Label:
+	def create(self, repo: "Repository") -> "github3.issues.label.Label":
 		"""
 		Create this label on the given repository.
 
@@ -115,14 +124,32 @@ class Checks(NamedTuple):
 	neutral: Set[str]
 
 
-def get_checks_for_pr(pull: Union[PullRequest, ShortPullRequest]) -> Checks:
+@instrumented
+def get_checks_for_pr(
+		pull: Union["PullRequest", "ShortPullRequest"],
+		cache: Optional["ChecksCache"] = None,
+		) -> Checks:
 	"""
 	Returns a :class:`~.Checks` object containing sets of check names grouped by their status.
 
 	:param pull: The pull request to obtain checks for.
+	:param cache: A cache of the checks for head commits whose check runs have all completed.
+		Commits with queued or in-progress check runs, or with no check runs yet, are always fetched.
+
+		.. versionadded:: 0.9.0
 	"""
 
-	head_commit: ShortCommit = list(pull.commits())[-1]
+	# 3rd party
+	from github3.checks import CheckRun
+
+	repository = pull.repository
+	head_sha = pull.head.sha
+
+	if cache is not None:
+		key = (credentials_hash(pull), repository.full_name, head_sha)
+		cached = cache.get(key)
+		if cached is not None:
+			return Checks(*map(set, cached))
 
 	failing = set()
 	running = set()
@@ -130,8 +157,19 @@ def get_checks_for_pr(pull: Union[PullRequest, ShortPullRequest]) -> Checks:
 	skipped = set()
 	neutral = set()
 
-	check_run: CheckRun
-	for check_run in head_commit.check_runs():
+	check_runs = Paginator(
+			pull,
+			pull._build_url("commits", head_sha, "check-runs", base_url=repository._api),
+			cls=CheckRun,
+			items_key="check_runs",
+			headers=CheckRun.CUSTOM_HEADERS,
+			)
+
+	# Runs can also be waiting or requested, so only those whose status is "completed" are final.
+	completed = True
+
+	for check_run in check_runs:
+		completed = completed and check_run.status == "completed"
 
 		# pylint: disable=loop-invariant-statement
 		if check_run.status in {"queued", "running", "in_progress"}:
@@ -152,7 +190,7 @@ def get_checks_for_pr(pull: Union[PullRequest, ShortPullRequest]) -> Checks:
 	skipped = skipped - running - failing - successful
 	neutral = neutral - running - failing - successful
 
-	return Checks(
+	checks = Checks(
 			successful=successful,
 			failing=failing,
 			running=running,
@@ -160,20 +198,34 @@ def get_checks_for_pr(pull: Union[PullRequest, ShortPullRequest]) -> Checks:
 			neutral=neutral,
 			)
 
+	if cache is not None and completed and any(checks):
+		# The sets are copied when read, so callers can't change the cached result.
+		cache.set(key, tuple(map(frozenset, checks)))
+
+	return checks
+
 
 _python_dev_re = re.compile(r".*Python\s*\d+\.\d+.*(dev|alpha|beta|rc).*", flags=re.IGNORECASE)
 
 
-def label_pr_failures(pull: Union[PullRequest, ShortPullRequest]) -> Set[str]:
+@instrumented
+def label_pr_failures(
+		pull: Union["PullRequest", "ShortPullRequest"],
+		cache: Optional["ChecksCache"] = None,
+		) -> Set[str]:
 	"""
 	Labels the given pull request to indicate which checks are failing.
 
 	:param pull:
+	:param cache: A cache of the checks for head commits whose check runs have all completed,
+		as for :func:`~.get_checks_for_pr`.
+
+		.. versionadded:: 0.9.0
 
 	:return: The new labels set for the pull request.
 	"""
 
-	pr_checks = get_checks_for_pr(pull)
+	pr_checks = get_checks_for_pr(pull, cache=cache)
 
 	failure_labels: Set[str] = set()
 	success_labels: Set[str] = set()
@@ -197,7 +249,7 @@ def label_pr_failures(pull: Union[PullRequest, ShortPullRequest]) -> Set[str]:
 	determine_labels(pr_checks.failing, failure_labels)
 	determine_labels(pr_checks.successful, success_labels)
 
-	issue: Issue = pull.issue()
+	issue: "Issue" = pull.issue()
 
 	current_labels = {label.name for label in issue.labels()}
 
@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+#
+#  check_matrix.py
+"""
+A compact table of status check results for many pull requests.
+
+.. versionadded:: 0.9.0
+
+Each check name is stored once and mapped to a column,
+and the status of each check for each pull request is stored as a single byte.
+Queries operate on whole columns at once, rather than looping over Python sets.
+
+.. code-block:: python
+
+	matrix = CheckMatrix.from_checks((pull.number, get_checks_for_pr(pull)) for pull in pulls)
+
+	matrix.failure_rates()
+	matrix.where(failing=["Flake8"], successful=["mypy"])
+"""
+#
+#  Copyright © 2026 Dominic Davis-Foster <dominic@davis-foster.co.uk>
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+#  EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+#  MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+#  IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+#  DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+#  OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+#  OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+# stdlib
+import enum
+from itertools import compress
+from typing import Any, Dict, Hashable, Iterable, List, Mapping, Tuple, Union
+
+# this package
+from github3_utils.check_labels import Checks
+
+__all__ = ("CheckMatrix", "CheckStatus")
+
+
+class CheckStatus(enum.IntEnum):
+	"""
+	The status of a check in a :class:`~.CheckMatrix`.
+
+	The values other than :attr:`~.CheckStatus.MISSING` correspond to the fields of :class:`~.Checks`.
+	"""
+
+	#: The check was not run for the pull request.
+	MISSING = 0
+	SUCCESSFUL = 1
+	FAILING = 2
+	RUNNING = 3
+	SKIPPED = 4
+	NEUTRAL = 5
+
+
+# The order matches the fields of Checks
+_STATUSES = (
+		CheckStatus.SUCCESSFUL,
+		CheckStatus.FAILING,
+		CheckStatus.RUNNING,
+		CheckStatus.SKIPPED,
+		CheckStatus.NEUTRAL,
+		)
+
+# Tables for bytes.translate which map each status to 1 if it matches and 0 otherwise.
+_MASKS = {status: bytes(int(value == status) for value in range(256)) for status in CheckStatus}
+
+
+class CheckMatrix:
+	"""
+	Stores the status of each check for each of a set of pull requests.
+
+	Pull requests are identified by keys, such as their number or a :class:`~.PullRequestKey`.
+	"""
+
+	def __init__(self) -> None:
+		self._keys: List[Hashable] = []
+		self._rows: Dict[Hashable, int] = {}
+		self._columns: Dict[str, int] = {}
+		self._data: List[bytearray] = []
+
+	@classmethod
+	def from_checks(
+			cls,
+			results: Union[Mapping[Any, Checks], Iterable[Tuple[Any, Checks]]],
+			) -> "CheckMatrix":
+		"""
+		Construct a :class:`~.CheckMatrix` from the results of :func:`~.get_checks_for_pr`.
+
+		:param results: A mapping of keys to :class:`~.Checks`, or an iterable of ``(key, checks)`` pairs.
+			The iterable may be a generator, so the results need not all be held in memory at once.
+		"""
+
+		matrix = cls()
+		items = results.items() if isinstance(results, Mapping) else results
+
+		for key, checks in items:
+			matrix.add(key, checks)
+
+		return matrix
+
+	def add(self, key: Hashable, checks: Checks) -> None:
+		"""
+		Add the checks for a pull request, replacing any previous checks for the same key.
+
+		:param key:
+		:param checks:
+		"""
+
+		row = self._rows.get(key)
+
+		if row is None:
+			row = len(self._keys)
+			self._rows[key] = row
+			self._keys.append(key)
+
+			for column in self._data:
+				column.append(CheckStatus.MISSING)
+		else:
+			for column in self._data:
+				column[row] = CheckStatus.MISSING
+
+		for status, names in zip(_STATUSES, checks):
+			for name in names:
+				self._column(name)[row] = status
+
+	def _column(self, name: str) -> bytearray:
+		index = self._columns.get(name)
+
+		if index is None:
+			index = self._columns[name] = len(self._data)
+			self._data.append(bytearray(len(self._keys)))
+
+		return self._data[index]
+
+	def _mask(self, name: str, status: CheckStatus) -> int:
+		# Returns an integer with a 0x01 byte for each matching row, so rows can be combined with & and |
+		index = self._columns.get(name)
+		if index is None:
+			column = bytearray(len(self._keys))
+		else:
+			column = self._data[index]
+
+		return int.from_bytes(column.translate(_MASKS[status]), "big")
+
+	@property
+	def keys(self) -> List[Hashable]:
+		"""
+		The keys of the pull requests in the matrix, in the order they were added.
+		"""
+
+		return list(self._keys)
+
+	@property
+	def checks(self) -> List[str]:
+		"""
+		The names of the checks in the matrix, in the order they were first seen.
+		"""
+
+		return list(self._columns)
+
+	@property
+	def shape(self) -> Tuple[int, int]:
+		"""
+		The number of pull requests and the number of checks.
+		"""
+
+		return len(self._keys), len(self._columns)
+
+	@property
+	def nbytes(self) -> int:
+		"""
+		The number of bytes used to store the statuses.
+		"""
+
+		return sum(len(column) for column in self._data)
+
+	def __len__(self) -> int:
+		return len(self._keys)
+
+	def __contains__(self, key: object) -> bool:
+		return key in self._rows
+
+	def status(self, key: Hashable, check: str) -> CheckStatus:
+		"""
+		Returns the status of a check for a pull request.
+
+		:param key:
+		:param check:
+
+		:raises KeyError: If the pull request is not in the matrix.
+		"""
+
+		row = self._rows[key]
+		index = self._columns.get(check)
+
+		if index is None:
+			return CheckStatus.MISSING
+
+		return CheckStatus(self._data[index][row])
+
+	def checks_for(self, key: Hashable) -> Checks:
+		"""
+		Returns the checks for a pull request, in the form returned by :func:`~.get_checks_for_pr`.
+
+		:param key:
+
+		:raises KeyError: If the pull request is not in the matrix.
+		"""
+
+		row = self._rows[key]
+		groups: Dict[int, set] = {status: set() for status in _STATUSES}
+
+		for name, index in self._columns.items():
+			value = self._data[index][row]
+			if value:
+				groups[value].add(name)
+
+		return Checks(*groups.values())
+
+	def counts(self, status: CheckStatus) -> Dict[str, int]:
+		"""
+		Returns the number of pull requests for which each check has the given status.
+
+		:param status:
+		"""
+
+		return {name: self._data[index].count(status) for name, index in self._columns.items()}
+
+	def failure_rates(self) -> Dict[str, float]:
+		"""
+		Returns the proportion of pull requests for which each check is failing,
+		out of the pull requests the check was run for.
+		"""  # noqa: D400
+
+		rates = {}
+
+		for name, index in self._columns.items():
+			column = self._data[index]
+			ran = len(column) - column.count(CheckStatus.MISSING)
+			rates[name] = column.count(CheckStatus.FAILING) / ran if ran else 0.0
+
+		return rates
+
+	def where(
+			self,
+			*,
+			successful: Iterable[str] = (),
+			failing: Iterable[str] = (),
+			running: Iterable[str] = (),
+			skipped: Iterable[str] = (),
+			neutral: Iterable[str] = (),
+			missing: Iterable[str] = (),
+			) -> List[Hashable]:
+		"""
+		Returns the keys of the pull requests which match all of the given conditions.
+
+		For example, ``matrix.where(failing=["Flake8"], successful=["mypy"])`` returns the pull requests
+		for which ``Flake8`` is failing and ``mypy`` is successful.
+
+		:param successful: Checks which must be successful.
+		:param failing: Checks which must be failing.
+		:param running: Checks which must be running.
+		:param skipped: Checks which must have been skipped.
+		:param neutral: Checks which must be neutral.
+		:param missing: Checks which must not have been run.
+		"""
+
+		conditions = [
+				(CheckStatus.SUCCESSFUL, successful),
+				(CheckStatus.FAILING, failing),
+				(CheckStatus.RUNNING, running),
+				(CheckStatus.SKIPPED, skipped),
+				(CheckStatus.NEUTRAL, neutral),
+				(CheckStatus.MISSING, missing),
+				]
+
+		num_rows = len(self._keys)
+		selected = int.from_bytes(b"\x01" * num_rows, "big")
+
+		for status, names in conditions:
+			for name in names:
+				selected &= self._mask(name, status)
+
+		return list(compress(self._keys, selected.to_bytes(num_rows, "big")))
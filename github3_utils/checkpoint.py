@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+#
+#  checkpoint.py
+"""
+Resume long scans over many repositories after an interruption.
+
+.. versionadded:: 0.9.0
+
+.. code-block:: python
+
+	checkpoint = Checkpoint("scan.json")
+
+	try:
+		for repo in checkpoint.iter_repos(github, orgs=["sphinx-toolbox", "repo-helper"]):
+			process(repo)
+	except RateLimitExceeded as e:
+		# Running the same scan again continues from the last repository processed.
+		...
+
+The position in the scan is saved to the file every ``interval`` repositories,
+when the scan moves on to another owner or installation, and when the scan is interrupted by an exception.
+The file is removed once the scan finishes.
+
+A repository is only treated as processed once the next one has been requested,
+so the repository being processed when the scan was interrupted is yielded again when it resumes.
+If the loop processing the repositories may raise an exception, wrap the iterator in :func:`contextlib.closing`
+so the position is saved straight away, rather than when the iterator is garbage collected.
+Owners and installations which were finished are skipped without making any requests,
+and the listing resumes from the page it had reached.
+"""
+#
+#  Copyright © 2026 Dominic Davis-Foster <dominic@davis-foster.co.uk>
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+#  EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+#  MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+#  IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+#  DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+#  OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+#  OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+# stdlib
+import json
+import os
+from typing import TYPE_CHECKING, Any, Callable, Dict, Generator, Iterable, Iterator, List, Optional, Tuple, Union
+
+# 3rd party
+import attr
+
+# this package
+from github3_utils._instrumentation import instrumented
+from github3_utils.headers import MACHINE_MAN
+from github3_utils.pagination import Paginator
+
+if TYPE_CHECKING:
+	# 3rd party
+	from github3 import GitHub
+	from github3.models import GitHubCore
+	from github3.repos import ShortRepository
+
+	# this package
+	from github3_utils.apps import ContextSwitcher
+
+__all__ = ("Checkpoint", "Cursor")
+
+
+@attr.s(frozen=True, slots=True)
+class Cursor:
+	"""
+	The position reached in a scan.
+	"""
+
+	#: The owner whose repositories were being listed, as ``'users/<login>'`` or ``'orgs/<login>'``.
+	owner: Optional[str] = attr.ib(default=None)
+
+	#: The ID of the installation whose repositories were being listed.
+	installation: Optional[int] = attr.ib(default=None)
+
+	#: The page of results being processed.
+	page: int = attr.ib(default=1)
+
+	#: The number of repositories on the page which have been processed.
+	index: int = attr.ib(default=0)
+
+	def to_dict(self) -> Dict[str, Any]:
+		"""
+		Return the :class:`~.Cursor` as a dictionary.
+		"""
+
+		return attr.asdict(self)
+
+
+class Checkpoint:
+	"""
+	Saves the position reached in a scan to a file, so the scan can be resumed.
+
+	:param filename: The file to save the position to.
+	:param interval: The number of repositories to process between saving the position.
+
+	Each :class:`~.Checkpoint` records one scan at a time.
+	Starting a different scan with the same file raises a :exc:`ValueError`,
+	unless :meth:`~.Checkpoint.clear` is called first.
+	"""
+
+	def __init__(self, filename: Union[str, "os.PathLike[str]"], interval: int = 100):
+		self.filename = os.fspath(filename)
+		self.interval = interval
+
+		self._operation: Optional[Dict[str, Any]] = None
+		self._cursor = Cursor()
+		self._unsaved = 0
+
+	def load(self) -> Optional[Tuple[Dict[str, Any], Cursor]]:
+		"""
+		Returns the scan recorded in the file, and the position reached,
+		or :py:obj:`None` if there is no scan in progress.
+		"""  # noqa: D400
+
+		if not os.path.isfile(self.filename):
+			return None
+
+		with open(self.filename, encoding="UTF-8") as fp:
+			data = json.load(fp)
+
+		return data["operation"], Cursor(**data["cursor"])
+
+	def save(self) -> None:
+		"""
+		Write the current position to the file.
+		"""
+
+		data = {"operation": self._operation, "cursor": self._cursor.to_dict()}
+		temporary_filename = f"{self.filename}.tmp"
+
+		with open(temporary_filename, 'w', encoding="UTF-8") as fp:
+			json.dump(data, fp)
+
+		# Replace the file in one step, so it is never left half written.
+		os.replace(temporary_filename, self.filename)
+		self._unsaved = 0
+
+	def clear(self) -> None:
+		"""
+		Remove the file, so the next scan starts from the beginning.
+		"""
+
+		if os.path.isfile(self.filename):
+			os.unlink(self.filename)
+
+	def _start(self, operation: Dict[str, Any]) -> Cursor:
+		saved = self.load()
+
+		if saved is None:
+			self._cursor = Cursor()
+		elif saved[0] != operation:
+			raise ValueError(f"The checkpoint {self.filename!r} is for a different scan: {saved[0]!r}")
+		else:
+			self._cursor = saved[1]
+
+		self._operation = operation
+		self._unsaved = 0
+		return self._cursor
+
+	def _advance(self, cursor: Cursor) -> None:
+		self._cursor = cursor
+		self._unsaved += 1
+
+		if self._unsaved >= self.interval:
+			self.save()
+
+	def _move_to(self, cursor: Cursor) -> None:
+		self._cursor = cursor
+		self.save()
+
+	def _iter_pages(
+			self,
+			core: "GitHubCore",
+			url: str,
+			params: Dict[str, Any],
+			resume: Cursor,
+			**kwargs: Any,
+			) -> Iterator[Dict[str, Any]]:
+		# Yields the items from the page and index in the cursor onwards, advancing the cursor after each one.
+
+		paginator: Paginator[Dict[str, Any]] = Paginator(core, url, {**params, "page": resume.page}, **kwargs)
+
+		for page, items in enumerate(paginator.pages(), start=resume.page):
+			start = resume.index if page == resume.page else 0
+
+			for index in range(start, len(items)):
+				yield items[index]
+				self._advance(attr.evolve(resume, page=page, index=index + 1))
+
+	@instrumented
+	def iter_repos(
+			self,
+			github: "GitHub",
+			users: Iterable[str] = (),
+			orgs: Iterable[str] = (),
+			) -> Generator["ShortRepository", None, None]:
+		"""
+		Returns an iterator over the repositories belonging to all ``users`` and all ``orgs``,
+		continuing from the position reached by the previous scan of the same users and organizations.
+
+		The repositories are listed in the same way as :func:`iter_repos(..., resolve=False) <.iter_repos>`.
+
+		:param github:
+		:param users: An iterable of usernames to fetch the repositories for.
+		:param orgs: An iterable of organization names to fetch the repositories for.
+		"""  # noqa: D400
+
+		# 3rd party
+		from github3.repos import ShortRepository
+
+		owners = [f"users/{user}" for user in users] + [f"orgs/{org}" for org in orgs]
+		operation = {"scan": "iter_repos", "api": github.session.base_url, "owners": owners}
+
+		def iter_owner(owner: str, resume: Cursor) -> Iterator[Dict[str, Any]]:
+			kind, login = owner.split('/', 1)
+			url = github._build_url(kind, login, "repos")
+			params = {"type": "owner" if kind == "users" else "all", "sort": "full_name"}
+			return self._iter_pages(github, url, params, resume)
+
+		for json in self._run(operation, owners, "owner", iter_owner):
+			yield ShortRepository(json, github)
+
+	@instrumented
+	def iter_installed_repos(self, context_switcher: "ContextSwitcher") -> Generator[Dict, None, None]:
+		"""
+		Returns an iterator over all repositories the app is installed for,
+		continuing from the position reached by the previous scan for the same app.
+
+		:param context_switcher: A :class:`~.ContextSwitcher` used to switch contexts
+			between the app itself and its installations.
+		"""  # noqa: D400
+
+		app_client = context_switcher.app_client()
+		installations = {
+				installation.id: installation
+				for installation in app_client.app_installations()
+				}
+		operation = {
+				"scan": "iter_installed_repos",
+				"api": app_client.session.base_url,
+				"app_id": context_switcher.app_id,
+				}
+
+		def iter_installation(installation_id: int, resume: Cursor) -> Iterator[Dict[str, Any]]:
+			installation = installations[installation_id]
+			client = context_switcher.installation_client(installation)
+			headers = {**installation.session.headers, **MACHINE_MAN}
+			url = installation.repositories_url
+			return self._iter_pages(client, url, {}, resume, items_key="repositories", headers=headers)
+
+		yield from self._run(operation, sorted(installations), "installation", iter_installation)
+
+	def _run(
+			self,
+			operation: Dict[str, Any],
+			targets: List[Any],
+			field: str,
+			iter_target: Callable[[Any, Cursor], Iterator[Dict[str, Any]]],
+			) -> Iterator[Dict[str, Any]]:
+		# Iterates over the repositories for each target, skipping those finished by a previous scan.
+
+		cursor = self._start(operation)
+		position = getattr(cursor, field)
+
+		if position in targets:
+			targets = targets[targets.index(position):]
+		elif position is not None:
+			# The installation has since been removed, so continue with the next one.
+			targets = [target for target in targets if target > position]
+			cursor = Cursor()
+
+		try:
+			for target in targets:
+				if getattr(cursor, field) != target:
+					cursor = Cursor(**{field: target})
+					self._move_to(cursor)
+
+				yield from iter_target(target, cursor)
+				cursor = Cursor()
+
+		except BaseException:
+			self.save()
+			raise
+
+		else:
+			self.clear()
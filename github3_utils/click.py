@@ -29,7 +29,7 @@ Extensions for `click <https://click.palletsprojects.com/en/7.x/>`_.
 #
 
 # stdlib
-from typing import Callable, TypeVar
+from typing import Callable, Tuple, TypeVar
 
 # 3rd party
 import click
@@ -39,17 +39,39 @@ __all__ = ("token_option", )
 _C = TypeVar("_C", bound=click.Command)
 
 
-def token_option(token_var: str = "GITHUB_TOKEN") -> Callable[[_C], _C]:  # nosec: B107
+def token_option(token_var: str = "GITHUB_TOKEN", *, multiple: bool = False) -> Callable[[_C], _C]:  # nosec: B107
 	r"""
 	Creates a ``-t / --token`` option for the GitHub API token.
 
 	.. versionadded:: 0.2.0
 
 	:param token_var:
+	:param multiple: If :py:obj:`True` the option may be given several times,
+		and the environment variable may contain several comma-separated tokens.
+		The command receives a tuple of tokens as the ``tokens`` argument, which can be passed to :class:`~.TokenPool`.
+
+		.. versionadded:: 0.9.0
 
 	:rtype: :data:`~typing.Callable`\[\[:class:`click.Command`\], :class:`click.Command`\]
 	"""
 
+	if multiple:
+		return click.option(
+				"-t",
+				"--token",
+				"tokens",
+				type=click.STRING,
+				help=(
+						"A token to authenticate with the GitHub API. "
+						"May be given multiple times, in which case requests are spread across the tokens. "
+						f"Can also be provided via the '{token_var}' environment variable, separated by commas."
+						),
+				envvar=token_var,
+				required=True,
+				multiple=True,
+				callback=_split_tokens,
+				)
+
 	return click.option(
 			"-t",
 			"--token",
@@ -61,3 +83,8 @@ def token_option(token_var: str = "GITHUB_TOKEN") -> Callable[[_C], _C]:  # nose
 			envvar=token_var,
 			required=True,
 			)
+
+
+def _split_tokens(ctx: click.Context, param: click.Parameter, value: Tuple[str, ...]) -> Tuple[str, ...]:
+	tokens = (token.strip() for group in value for token in group.split(','))
+	return tuple(dict.fromkeys(token for token in tokens if token))
@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+#
+#  distributor.py
+"""
+Run work for many installations of a GitHub App at once, within each installation's rate limit.
+
+.. versionadded:: 0.9.0
+
+.. code-block:: python
+
+	context_switcher = ContextSwitcher(GitHub(), private_key_pem, app_id)
+
+	def sync(client: GitHub, repo: Dict) -> None:
+		...
+
+	with InstallationDistributor(context_switcher) as distributor:
+		for repo, future in distributor.map_installed_repos(sync):
+			future.result()
+
+Each installation has its own rate limit, so each installation has its own :class:`~.Scheduler`,
+which tracks the installation's remaining quota from the ``X-RateLimit-*`` headers of its responses.
+The installations run concurrently, and an installation which has used up its quota is held until its limit resets
+while the others continue. The total throughput therefore grows with the number of installations.
+
+Each installation has its own worker threads, so with many installations ``workers`` should be kept small.
+"""
+#
+#  Copyright © 2026 Dominic Davis-Foster <dominic@davis-foster.co.uk>
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+#  EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+#  MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+#  IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+#  DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+#  OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+#  OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+# stdlib
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from types import TracebackType
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterator, Optional, Tuple, Type, TypeVar, Union
+
+# this package
+from github3_utils._instrumentation import instrumented
+from github3_utils.headers import MACHINE_MAN
+from github3_utils.pagination import Paginator
+from github3_utils.scheduler import NORMAL, Scheduler
+
+if TYPE_CHECKING:
+	# 3rd party
+	from github3 import GitHub
+	from github3.apps import Installation
+
+	# this package
+	from github3_utils.apps import ContextSwitcher
+
+__all__ = ("InstallationDistributor", )
+
+_T = TypeVar("_T")
+
+# The number of repositories requested per page.
+_PER_PAGE = 100
+
+
+class InstallationDistributor:
+	"""
+	Runs jobs for the installations of a GitHub App concurrently,
+	holding the jobs for each installation while that installation is out of quota.
+
+	:param context_switcher: A :class:`~.ContextSwitcher` used to switch contexts
+		between the app itself and its installations.
+	:param workers: The number of jobs to run at once for each installation.
+	:param reserve: The number of requests in each installation's quota
+		which only :data:`~.HIGH` priority jobs may use.
+	:param timer: The function giving the current time in seconds since the epoch.
+	"""  # noqa: D400
+
+	def __init__(
+			self,
+			context_switcher: "ContextSwitcher",
+			*,
+			workers: int = 2,
+			reserve: int = 0,
+			timer: Callable[[], float] = time.time,
+			):
+		self.context_switcher = context_switcher
+		self.workers = workers
+		self.reserve = reserve
+		self.timer = timer
+
+		self._schedulers: Dict[int, Scheduler] = {}
+		self._watched: Dict[int, "GitHub"] = {}
+		self._lock = threading.Lock()
+		self._shutdown = False
+
+	def scheduler(self, installation: Union[int, "Installation"]) -> Scheduler:
+		"""
+		Returns the :class:`~.Scheduler` running the jobs for the given installation.
+
+		:param installation: The installation, or its integer identifier.
+		"""
+
+		installation_id = _installation_id(installation)
+
+		with self._lock:
+			if self._shutdown:
+				raise RuntimeError("Cannot submit jobs after the distributor has been shut down.")
+
+			if installation_id not in self._schedulers:
+				self._schedulers[installation_id] = Scheduler(
+						workers=self.workers,
+						reserve=self.reserve,
+						timer=self.timer,
+						)
+
+			return self._schedulers[installation_id]
+
+	def client(self, installation: Union[int, "Installation"]) -> "GitHub":
+		"""
+		Returns a client which is logged in as the given installation,
+		and whose responses update the installation's remaining quota.
+
+		:param installation: The installation, or its integer identifier.
+		"""  # noqa: D400
+
+		installation_id = _installation_id(installation)
+		scheduler = self.scheduler(installation_id)
+		github = self.context_switcher.installation_client(installation_id)
+
+		with self._lock:
+			# The context switcher replaces the client when its token expires.
+			if self._watched.get(installation_id) is not github:
+				scheduler.watch(github)
+				self._watched[installation_id] = github
+
+		return github
+
+	def remaining(self, installation: Union[int, "Installation"]) -> Optional[int]:
+		"""
+		The number of requests believed to remain for the given installation before its limit resets,
+		or :py:obj:`None` if unknown.
+
+		:param installation: The installation, or its integer identifier.
+		"""  # noqa: D400
+
+		with self._lock:
+			scheduler = self._schedulers.get(_installation_id(installation))
+
+		return None if scheduler is None else scheduler.remaining
+
+	def submit(
+			self,
+			installation: Union[int, "Installation"],
+			func: Callable[..., _T],
+			*args: Any,
+			priority: int = NORMAL,
+			**kwargs: Any,
+			) -> "Future[_T]":
+		"""
+		Queue ``func(client, *args, **kwargs)`` to run once the installation's quota allows,
+		where ``client`` is logged in as the installation.
+
+		:param installation: The installation, or its integer identifier.
+		:param func:
+		:param args:
+		:param priority: The priority of the job. Lower numbers run first.
+		:param kwargs:
+
+		:returns: A future for the result of the job.
+		"""  # noqa: D400
+
+		installation_id = _installation_id(installation)
+
+		def job() -> _T:
+			return func(self.client(installation_id), *args, **kwargs)
+
+		return self.scheduler(installation_id).submit(job, priority=priority)
+
+	@instrumented
+	def map_installed_repos(
+			self,
+			func: Callable[["GitHub", Dict], _T],
+			*,
+			priority: int = NORMAL,
+			) -> Iterator[Tuple[Dict, "Future[_T]"]]:
+		"""
+		Run ``func(client, repo)`` for every repository the app is installed for,
+		where ``client`` is logged in as the repository's installation.
+
+		Returns an iterator over the repositories and the futures for their results,
+		in the order the jobs finish. Each page of an installation's repositories
+		is listed by a job of its own, so listing is held along with the other jobs
+		while the installation is out of quota.
+
+		:param func:
+		:param priority: The priority of the jobs. Lower numbers run first.
+		"""  # noqa: D400
+
+		done: "queue.Queue[Tuple[Optional[Dict], Future]]" = queue.Queue()
+		lock = threading.Lock()
+		pending = 0
+
+		def track(repo: Optional[Dict], future: Future) -> None:
+			nonlocal pending
+
+			with lock:
+				pending += 1
+
+			future.add_done_callback(lambda f: done.put((repo, f)))
+
+		def list_page(client: "GitHub", installation: "Installation", page: int) -> None:
+			headers = {**installation.session.headers, **MACHINE_MAN}
+			paginator: Paginator[Dict[str, Any]] = Paginator(
+					client,
+					installation.repositories_url,
+					{"page": page},
+					items_key="repositories",
+					headers=headers,
+					per_page=_PER_PAGE,
+					read_ahead=0,
+					)
+			items = next(iter(paginator.pages()))
+
+			# The jobs are tracked before this job finishes, so the iterator can't finish early.
+			for repo in items:
+				track(repo, self.submit(installation, func, repo, priority=priority))
+
+			if len(items) == _PER_PAGE:
+				track(None, self.submit(installation, list_page, installation, page + 1, priority=priority))
+
+		app_client = self.context_switcher.app_client()
+		for installation in app_client.app_installations():
+			track(None, self.submit(installation, list_page, installation, 1, priority=priority))
+
+		while True:
+			with lock:
+				if not pending:
+					return
+				pending -= 1
+
+			repo, future = done.get()
+
+			if repo is None:
+				# Raise any error listing the repositories.
+				future.result()
+			else:
+				yield repo, future
+
+	def shutdown(self, wait: bool = True, cancel_pending: bool = False) -> None:
+		"""
+		Stop accepting jobs, and stop the workers once the queued jobs have finished.
+
+		:param wait: Whether to wait for the queued jobs to finish.
+		:param cancel_pending: Whether to cancel the jobs which have not started.
+		"""
+
+		with self._lock:
+			self._shutdown = True
+			schedulers = list(self._schedulers.values())
+
+		# Stop every installation before waiting for any of them.
+		for scheduler in schedulers:
+			scheduler.shutdown(wait=False, cancel_pending=cancel_pending)
+
+		if wait:
+			for scheduler in schedulers:
+				scheduler.shutdown()
+
+	def __enter__(self) -> "InstallationDistributor":
+		return self
+
+	def __exit__(
+			self,
+			exc_type: Optional[Type[BaseException]],
+			exc_val: Optional[BaseException],
+			exc_tb: Optional[TracebackType],
+			) -> None:
+		self.shutdown()
+
+
+def _installation_id(installation: Union[int, "Installation"]) -> int:
+	return installation if isinstance(installation, int) else installation.id
@@ -0,0 +1,418 @@
+#!/usr/bin/env python3
+#
+#  events.py
+"""
+Processing of ``check_run`` and ``check_suite`` webhook events for :func:`~.label_pr_failures`.
+
+.. versionadded:: 0.9.0
+
+A CI run with many jobs sends a burst of events for each push.
+The :class:`~.EventProcessor` coalesces the events for each pull request
+over a short window, so the burst results in a single relabelling.
+
+.. code-block:: python
+
+	processor = EventProcessor(github, window=30)
+
+	with WebhookReceiver(processor, secret=WEBHOOK_SECRET, port=8080):
+		...
+"""
+#
+#  Copyright © 2026 Dominic Davis-Foster <dominic@davis-foster.co.uk>
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+#  EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+#  MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+#  IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+#  DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+#  OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+#  OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+# stdlib
+import hashlib
+import hmac
+import json
+import logging
+import threading
+import time
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import TracebackType
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, NamedTuple, Optional, Type, Union
+
+if TYPE_CHECKING:
+	# 3rd party
+	from github3 import GitHub
+
+__all__ = ("EventProcessor", "PullRequestKey", "WebhookReceiver", "pull_requests_for_event", "verify_signature")
+
+_log = logging.getLogger(__name__)
+
+
+def verify_signature(secret: Union[str, bytes], body: bytes, signature: Optional[str]) -> bool:
+	"""
+	Verify the ``X-Hub-Signature-256`` header of a webhook delivery.
+
+	:param secret: The webhook secret configured on GitHub.
+	:param body: The raw body of the request.
+	:param signature: The value of the ``X-Hub-Signature-256`` header.
+
+	:returns: :py:obj:`True` if the signature is valid, :py:obj:`False` otherwise.
+	"""
+
+	if not signature or not signature.startswith("sha256="):
+		return False
+
+	if isinstance(secret, str):
+		secret = secret.encode("UTF-8")
+
+	expected = hmac.new(secret, body, hashlib.sha256).hexdigest()
+	return hmac.compare_digest(f"sha256={expected}", signature)
+
+
+class PullRequestKey(NamedTuple):
+	"""
+	Identifies a pull request which is awaiting relabelling.
+	"""
+
+	#: The owner of the repository.
+	owner: str
+
+	#: The name of the repository.
+	repository: str
+
+	#: The pull request number.
+	number: int
+
+
+def pull_requests_for_event(event: str, payload: Dict[str, Any]) -> Dict[PullRequestKey, str]:
+	"""
+	Returns a mapping of pull requests affected by a webhook event to their head SHAs.
+
+	``check_run``, ``check_suite`` and ``pull_request`` events are supported.
+	All other events return an empty mapping.
+
+	:param event: The value of the ``X-GitHub-Event`` header.
+	:param payload: The parsed body of the webhook delivery.
+	"""
+
+	if event in {"check_run", "check_suite"}:
+		check = payload[event]
+		pulls = check.get("pull_requests", [])
+		head_sha = check["head_sha"]
+	elif event == "pull_request":
+		pulls = [payload["pull_request"]]
+		head_sha = payload["pull_request"]["head"]["sha"]
+	else:
+		return {}
+
+	owner = payload["repository"]["owner"]["login"]
+	repository = payload["repository"]["name"]
+
+	return {PullRequestKey(owner, repository, pull["number"]): head_sha for pull in pulls}
+
+
+class EventProcessor:
+	"""
+	Coalesces webhook events for each pull request, and relabels the pull request once the events stop arriving.
+
+	:param github: The client used to fetch pull requests for relabelling.
+	:param window: The time in seconds to wait after the last event for a pull request before relabelling it.
+	:param max_delay: The maximum time in seconds a pull request may be held back
+		by a continuous stream of events. Defaults to four times ``window``.
+	:param handler: A function called with the :class:`~.PullRequestKey` and head SHA
+		of each pull request to relabel. Defaults to calling :func:`~.label_pr_failures`.
+
+	Pending pull requests are processed by a background thread,
+	which is started by :meth:`~.EventProcessor.start` or by using the processor as a context manager.
+	"""
+
+	def __init__(
+			self,
+			github: Optional["GitHub"] = None,
+			window: float = 10.0,
+			max_delay: Optional[float] = None,
+			handler: Optional[Callable[[PullRequestKey, str], Any]] = None,
+			):
+
+		if handler is None:
+			if github is None:
+				raise ValueError("Either 'github' or 'handler' must be provided.")
+			handler = _LabelHandler(github)
+
+		self.window = window
+		self.max_delay = window * 4 if max_delay is None else max_delay
+		self.handler = handler
+
+		#: The number of events received by :meth:`~.EventProcessor.submit` which affected a pull request.
+		self.events_received = 0
+
+		#: The number of times ``handler`` has been called.
+		self.runs = 0
+
+		# Mapping of pull request to (head_sha, first_seen, deadline)
+		self._pending: Dict[PullRequestKey, List[Any]] = {}
+		self._condition = threading.Condition()
+		self._thread: Optional[threading.Thread] = None
+		self._stopping = False
+
+	def submit(self, event: str, payload: Dict[str, Any]) -> int:
+		"""
+		Queue the pull requests affected by a webhook event for relabelling.
+
+		:param event: The value of the ``X-GitHub-Event`` header.
+		:param payload: The parsed body of the webhook delivery.
+
+		:returns: The number of pull requests affected by the event.
+		"""
+
+		pulls = pull_requests_for_event(event, payload)
+		if not pulls:
+			return 0
+
+		now = time.monotonic()
+
+		with self._condition:
+			self.events_received += 1
+
+			for key, head_sha in pulls.items():
+				pending = self._pending.get(key)
+				if pending is None or pending[0] != head_sha:
+					# A new push restarts the window.
+					self._pending[key] = [head_sha, now, now + self.window]
+				else:
+					pending[2] = min(now + self.window, pending[1] + self.max_delay)
+
+			self._condition.notify_all()
+
+		return len(pulls)
+
+	@property
+	def pending(self) -> int:
+		"""
+		The number of pull requests awaiting relabelling.
+		"""
+
+		with self._condition:
+			return len(self._pending)
+
+	def flush(self) -> None:
+		"""
+		Relabel all pending pull requests now, in the calling thread.
+		"""
+
+		with self._condition:
+			due = list(self._pending.items())
+			self._pending.clear()
+
+		for key, (head_sha, *_) in due:
+			self._run(key, head_sha)
+
+	def _run(self, key: PullRequestKey, head_sha: str) -> None:
+		# flush() may run at the same time as the worker thread.
+		with self._condition:
+			self.runs += 1
+
+		try:
+			self.handler(key, head_sha)
+		except Exception:
+			_log.exception("Error relabelling %s/%s#%d", *key)
+
+	def _worker(self) -> None:
+		while True:
+			with self._condition:
+				while True:
+					if self._stopping:
+						return
+
+					now = time.monotonic()
+					due = [(key, pending[0]) for key, pending in self._pending.items() if pending[2] <= now]
+
+					if due:
+						for key, _ in due:
+							del self._pending[key]
+						break
+
+					timeout = min((pending[2] for pending in self._pending.values()), default=now + 60) - now
+					self._condition.wait(timeout)
+
+			for key, head_sha in due:
+				self._run(key, head_sha)
+
+	def start(self) -> None:
+		"""
+		Start the background thread which relabels pull requests once their window has elapsed.
+		"""
+
+		if self._thread is not None:
+			return
+
+		self._stopping = False
+		self._thread = threading.Thread(target=self._worker, name="github3-utils-events", daemon=True)
+		self._thread.start()
+
+	def stop(self, flush: bool = True) -> None:
+		"""
+		Stop the background thread.
+
+		:param flush: If :py:obj:`True` any pending pull requests are relabelled before returning.
+		"""
+
+		with self._condition:
+			self._stopping = True
+			self._condition.notify_all()
+
+		if self._thread is not None:
+			self._thread.join()
+			self._thread = None
+
+		if flush:
+			self.flush()
+
+	def __enter__(self) -> "EventProcessor":
+		self.start()
+		return self
+
+	def __exit__(
+			self,
+			exc_type: Optional[Type[BaseException]],
+			exc_val: Optional[BaseException],
+			exc_tb: Optional[TracebackType],
+			) -> None:
+		self.stop()
+
+
+class _LabelHandler:
+
+	def __init__(self, github: "GitHub"):
+		self.github = github
+
+	def __call__(self, key: PullRequestKey, head_sha: str) -> None:
+		# this package
+		from github3_utils.check_labels import label_pr_failures
+
+		pull = self.github.pull_request(key.owner, key.repository, key.number)
+
+		if pull is not None and pull.head.sha == head_sha:
+			label_pr_failures(pull)
+
+
+class WebhookReceiver:
+	"""
+	A minimal HTTP server which verifies webhook deliveries and passes them to an :class:`~.EventProcessor`.
+
+	:param processor:
+	:param secret: The webhook secret configured on GitHub.
+		If :py:obj:`None` signatures are not checked.
+	:param host: The interface to listen on.
+	:param port: The port to listen on. If ``0`` a free port is chosen.
+
+	The server runs in a background thread between calls to :meth:`~.WebhookReceiver.start`
+	and :meth:`~.WebhookReceiver.stop`, or when used as a context manager.
+	The processor is started and stopped along with the server.
+	"""
+
+	def __init__(
+			self,
+			processor: EventProcessor,
+			secret: Union[str, bytes, None],
+			host: str = "127.0.0.1",
+			port: int = 0,
+			):
+		self.processor = processor
+		self.secret = secret
+		self._server = ThreadingHTTPServer((host, port), self._make_handler())
+		self._thread: Optional[threading.Thread] = None
+
+	@property
+	def url(self) -> str:
+		"""
+		The URL the server is listening on.
+		"""
+
+		host, port = self._server.server_address[:2]
+		if isinstance(host, bytes):
+			host = host.decode("UTF-8")
+
+		return f"http://{host}:{port}/"
+
+	def _make_handler(self) -> Type[BaseHTTPRequestHandler]:
+		receiver = self
+
+		class Handler(BaseHTTPRequestHandler):
+
+			def do_POST(self) -> None:
+				body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+
+				if receiver.secret is not None:
+					if not verify_signature(receiver.secret, body, self.headers.get("X-Hub-Signature-256")):
+						self.send_response(HTTPStatus.UNAUTHORIZED)
+						self.end_headers()
+						return
+
+				try:
+					payload = json.loads(body)
+					receiver.processor.submit(self.headers.get("X-GitHub-Event", ''), payload)
+				except (ValueError, KeyError, TypeError):
+					# The body isn't JSON, or doesn't have the shape of the event.
+					self.send_response(HTTPStatus.BAD_REQUEST)
+					self.end_headers()
+					return
+
+				self.send_response(HTTPStatus.ACCEPTED)
+				self.end_headers()
+
+			def log_message(self, format: str, *args: Any) -> None:  # noqa: A002  # pylint: disable=redefined-builtin
+				_log.debug(format, *args)
+
+		return Handler
+
+	def start(self) -> None:
+		"""
+		Start the server and the processor in background threads.
+		"""
+
+		self.processor.start()
+		self._thread = threading.Thread(
+				target=self._server.serve_forever,
+				name="github3-utils-webhooks",
+				daemon=True,
+				)
+		self._thread.start()
+
+	def stop(self) -> None:
+		"""
+		Stop the server, then stop the processor, relabelling any pending pull requests.
+		"""
+
+		if self._thread is not None:
+			# shutdown() waits for serve_forever() to return, so would block if the server was never started.
+			self._server.shutdown()
+			self._thread.join()
+			self._thread = None
+
+		self._server.server_close()
+		self.processor.stop()
+
+	def __enter__(self) -> "WebhookReceiver":
+		self.start()
+		return self
+
+	def __exit__(
+			self,
+			exc_type: Optional[Type[BaseException]],
+			exc_val: Optional[BaseException],
+			exc_tb: Optional[TracebackType],
+			) -> None:
+		self.stop()
@@ -0,0 +1,1545 @@
+#!/usr/bin/env python3
+#
+#  fake_github.py
+"""
+An in-process fake of the GitHub REST API, for exercising ``github3_utils`` at scale without network access.
+
+.. versionadded:: 0.9.0
+
+Unlike the Betamax cassettes used by :mod:`github3_utils.testing`,
+the fake server can be populated with any number of repositories, pull requests and installations,
+handles concurrent requests, and can simulate latency, rate limiting and secondary rate limits.
+
+.. code-block:: python
+
+	with FakeGitHub(latency=0.05, page_size=30) as server:
+		server.add_org("sphinx-toolbox")
+		for idx in range(500):
+			server.add_repo("sphinx-toolbox", f"repo-{idx}")
+
+		github = server.client()
+
+		for repo in iter_repos(github, orgs=["sphinx-toolbox"]):
+			...
+
+Only the endpoints used by ``github3_utils`` are implemented, and responses contain only the fields
+``github3.py`` requires to construct its model objects.
+"""
+#
+#  Copyright © 2026 Dominic Davis-Foster <dominic@davis-foster.co.uk>
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+#  EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+#  MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+#  IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+#  DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+#  OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+#  OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+# stdlib
+import hashlib
+import itertools
+import json
+import logging
+import re
+import threading
+import time
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import TracebackType
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Tuple, Type
+from urllib.parse import parse_qs, unquote, urlencode, urlsplit
+
+# 3rd party
+from github3 import GitHub
+from nacl import encoding, public
+
+__all__ = ("FakeGitHub", "FakeResponse")
+
+_log = logging.getLogger(__name__)
+
+_TIMESTAMP = "2021-01-01T00:00:00Z"
+
+_USER_URLS = (
+		("followers_url", "followers"),
+		("following_url", "following{/other_user}"),
+		("gists_url", "gists{/gist_id}"),
+		("starred_url", "starred{/owner}{/repo}"),
+		("subscriptions_url", "subscriptions"),
+		("organizations_url", "orgs"),
+		("repos_url", "repos"),
+		("events_url", "events{/privacy}"),
+		("received_events_url", "received_events"),
+		)
+
+_REPO_URLS = (
+		("forks_url", "forks"),
+		("keys_url", "keys{/key_id}"),
+		("collaborators_url", "collaborators{/collaborator}"),
+		("teams_url", "teams"),
+		("hooks_url", "hooks"),
+		("issue_events_url", "issues/events{/number}"),
+		("events_url", "events"),
+		("assignees_url", "assignees{/user}"),
+		("branches_url", "branches{/branch}"),
+		("tags_url", "tags"),
+		("blobs_url", "git/blobs{/sha}"),
+		("git_tags_url", "git/tags{/sha}"),
+		("git_refs_url", "git/refs{/sha}"),
+		("trees_url", "git/trees{/sha}"),
+		("statuses_url", "statuses/{sha}"),
+		("languages_url", "languages"),
+		("stargazers_url", "stargazers"),
+		("contributors_url", "contributors"),
+		("subscribers_url", "subscribers"),
+		("subscription_url", "subscription"),
+		("commits_url", "commits{/sha}"),
+		("git_commits_url", "git/commits{/sha}"),
+		("comments_url", "comments{/number}"),
+		("issue_comment_url", "issues/comments{/number}"),
+		("contents_url", "contents/{+path}"),
+		("compare_url", "compare/{base}...{head}"),
+		("merges_url", "merges"),
+		("archive_url", "{archive_format}{/ref}"),
+		("downloads_url", "downloads"),
+		("issues_url", "issues{/number}"),
+		("pulls_url", "pulls{/number}"),
+		("milestones_url", "milestones{/number}"),
+		("notifications_url", "notifications{?since,all,participating}"),
+		("labels_url", "labels{/name}"),
+		("releases_url", "releases{/id}"),
+		("deployments_url", "deployments"),
+		)
+
+# Check run conclusions which are reported with the ``completed`` status.
+_CONCLUSIONS = {"success", "failure", "neutral", "cancelled", "skipped", "timed_out", "action_required"}
+
+
+class FakeResponse(Exception):
+	"""
+	Raised by request handlers to send an error response.
+
+	:param status: The HTTP status code.
+	:param message: The message to include in the JSON body.
+	:param headers: Additional headers to send.
+	"""
+
+	def __init__(self, status: int, message: str, headers: Optional[Mapping[str, str]] = None):
+		super().__init__(message)
+		self.status = int(status)
+		self.message = message
+		self.headers = dict(headers or {})
+
+
+class _RateLimit:
+
+	def __init__(self, limit: int, reset: int):
+		self.limit = limit
+		self.remaining = limit
+		self.reset = reset
+
+
+class FakeGitHub:
+	r"""
+	A fake GitHub REST API server, which runs in a background thread.
+
+	:param latency: The time in seconds to wait before answering each request.
+	:param page_size: The number of items per page when the client does not specify ``per_page``.
+	:param max_page_size: The maximum value of ``per_page`` honoured by the server.
+	:param rate_limit: The number of requests each token may make before ``403 Forbidden`` is returned.
+	:param rate_limit_window: The time in seconds from a token's first request until its rate limit resets.
+	:param secondary_limit_every: If set, every *n*\th request is rejected with a secondary rate limit error.
+	:param max_concurrent_requests: If set, requests arriving while this many are already being answered
+		are rejected with a secondary rate limit error.
+	:param retry_after: The value of the ``Retry-After`` header sent with secondary rate limit errors.
+	:param host: The interface to listen on.
+	:param port: The port to listen on. If ``0`` a free port is chosen.
+
+	The server runs between calls to :meth:`~.FakeGitHub.start` and :meth:`~.FakeGitHub.stop`,
+	or when used as a context manager.
+	"""
+
+	def __init__(
+			self,
+			*,
+			latency: float = 0.0,
+			page_size: int = 30,
+			max_page_size: int = 100,
+			rate_limit: int = 5000,
+			rate_limit_window: int = 3600,
+			secondary_limit_every: Optional[int] = None,
+			max_concurrent_requests: Optional[int] = None,
+			retry_after: int = 60,
+			host: str = "127.0.0.1",
+			port: int = 0,
+			):
+
+		self.latency = latency
+		self.page_size = page_size
+		self.max_page_size = max_page_size
+		self.rate_limit = rate_limit
+		self.rate_limit_window = rate_limit_window
+		self.secondary_limit_every = secondary_limit_every
+		self.max_concurrent_requests = max_concurrent_requests
+		self.retry_after = retry_after
+
+		#: The method and path of each request received, in the order they were received.
+		self.requests: List[Tuple[str, str]] = []
+
+		self._lock = threading.RLock()
+		self._ids = itertools.count(1000)
+		self._in_flight = 0
+		self._limits: Dict[str, _RateLimit] = {}
+		self._tokens: Dict[str, int] = {}
+
+		self._accounts: Dict[str, Dict[str, Any]] = {}
+		self._repos: Dict[Tuple[str, str], Dict[str, Any]] = {}
+		self._installations: Dict[int, Dict[str, Any]] = {}
+
+		self._secrets_key = public.PrivateKey.generate()
+		self._secrets_key_id = hashlib.sha1(bytes(self._secrets_key.public_key)).hexdigest()[:20]  # nosec: B324
+
+		self._server = ThreadingHTTPServer((host, port), self._make_handler())
+		self._server.daemon_threads = True
+		self._thread: Optional[threading.Thread] = None
+
+		self._routes: List[Tuple[str, "re.Pattern[str]", Callable[..., Any]]] = []
+		self._add_routes()
+
+	@property
+	def url(self) -> str:
+		"""
+		The base URL of the API, with a trailing slash.
+		"""
+
+		host, port = self._server.server_address[:2]
+		if isinstance(host, bytes):
+			host = host.decode("UTF-8")
+
+		return f"http://{host}:{port}/"
+
+	@property
+	def api(self) -> str:
+		"""
+		The base URL of the API, without a trailing slash.
+		"""
+
+		return self.url.rstrip('/')
+
+	def client(self, token: Optional[str] = "FAKE_TOKEN") -> GitHub:
+		"""
+		Returns a :class:`github3.github.GitHub` client which makes requests to this server.
+
+		:param token: The token to authenticate with. Each token has its own rate limit.
+		"""
+
+		github = GitHub(token=token or '')
+		github.session.base_url = self.api
+		return github
+
+	def start(self) -> None:
+		"""
+		Start the server in a background thread.
+		"""
+
+		self._thread = threading.Thread(
+				target=self._server.serve_forever,
+				kwargs={"poll_interval": 0.05},
+				name="github3-utils-fake-github",
+				daemon=True,
+				)
+		self._thread.start()
+
+	def stop(self) -> None:
+		"""
+		Stop the server.
+		"""
+
+		self._server.shutdown()
+		self._server.server_close()
+
+		if self._thread is not None:
+			self._thread.join()
+			self._thread = None
+
+	def __enter__(self) -> "FakeGitHub":
+		self.start()
+		return self
+
+	def __exit__(
+			self,
+			exc_type: Optional[Type[BaseException]],
+			exc_val: Optional[BaseException],
+			exc_tb: Optional[TracebackType],
+			) -> None:
+		self.stop()
+
+	# Populating the server
+
+	def add_user(self, login: str, **fields: Any) -> Dict[str, Any]:
+		"""
+		Add a user account, returning its JSON representation.
+
+		:param login:
+		:param fields: Additional fields for the JSON representation, e.g. ``name`` or ``email``.
+		"""
+
+		return self._add_account(login, "User", fields)
+
+	def add_org(self, login: str, **fields: Any) -> Dict[str, Any]:
+		"""
+		Add an organization account, returning its JSON representation.
+
+		:param login:
+		:param fields: Additional fields for the JSON representation, e.g. ``description``.
+		"""
+
+		return self._add_account(login, "Organization", fields)
+
+	def _add_account(self, login: str, type_: str, fields: Dict[str, Any]) -> Dict[str, Any]:
+		with self._lock:
+			account = self._user_json(login, next(self._ids), type_)
+			account.update(fields)
+			self._accounts[login.lower()] = account
+			return account
+
+	def add_repo(
+			self,
+			owner: str,
+			name: str,
+			*,
+			private: bool = False,
+			fork: bool = False,
+			archived: bool = False,
+			language: Optional[str] = "Python",
+			topics: Iterable[str] = (),
+			default_branch: str = "master",
+			created_at: str = _TIMESTAMP,
+			updated_at: str = _TIMESTAMP,
+			pushed_at: str = _TIMESTAMP,
+			**fields: Any,
+			) -> Dict[str, Any]:
+		"""
+		Add a repository, returning its JSON representation.
+
+		The owner is created as a user if it does not already exist.
+		The repository's default branch is created without protection.
+
+		:param owner:
+		:param name:
+		:param private:
+		:param fork:
+		:param archived:
+		:param language:
+		:param topics:
+		:param default_branch:
+		:param created_at:
+		:param updated_at:
+		:param pushed_at:
+		:param fields: Additional fields for the JSON representation.
+		"""
+
+		with self._lock:
+			if owner.lower() not in self._accounts:
+				self.add_user(owner)
+
+			account = self._accounts[owner.lower()]
+			full_name = f"{account['login']}/{name}"
+			url = f"{self.api}/repos/{full_name}"
+			api_urls = {key: f"{url}/{suffix}" for key, suffix in _REPO_URLS}
+
+			repo: Dict[str, Any] = {
+					"id": next(self._ids),
+					"node_id": '',
+					"name": name,
+					"full_name": full_name,
+					"owner": account,
+					"private": private,
+					"visibility": "private" if private else "public",
+					"fork": fork,
+					"archived": archived,
+					"disabled": False,
+					"description": None,
+					"url": url,
+					"html_url": f"https://github.com/{full_name}",
+					**api_urls,
+					"git_url": f"git://github.com/{full_name}.git",
+					"ssh_url": f"git@github.com:{full_name}.git",
+					"clone_url": f"https://github.com/{full_name}.git",
+					"svn_url": f"https://github.com/{full_name}",
+					"mirror_url": None,
+					"homepage": None,
+					"language": language,
+					"topics": list(topics),
+					"default_branch": default_branch,
+					"created_at": created_at,
+					"updated_at": updated_at,
+					"pushed_at": pushed_at,
+					"size": 0,
+					"forks_count": 0,
+					"stargazers_count": 0,
+					"watchers_count": 0,
+					"subscribers_count": 0,
+					"network_count": 0,
+					"open_issues_count": 0,
+					"has_issues": True,
+					"has_projects": True,
+					"has_downloads": True,
+					"has_wiki": True,
+					"has_pages": False,
+					"permissions": {"admin": True, "push": True, "pull": True},
+					}
+			repo.update(fields)
+
+			self._repos[(owner.lower(), name.lower())] = {
+					"json": repo,
+					"labels": {},
+					"secrets": {},
+					"pulls": {},
+					"issue_labels": {},
+					"branches": {
+							default_branch: {"sha": self._sha(full_name, default_branch), "protection": None},
+							},
+					}
+
+			return repo
+
+	def add_pull(
+			self,
+			owner: str,
+			repo: str,
+			number: int,
+			*,
+			check_runs: Optional[Mapping[str, str]] = None,
+			commits: int = 1,
+			labels: Iterable[str] = (),
+			) -> str:
+		"""
+		Add a pull request to a repository, returning the SHA of its head commit.
+
+		:param owner:
+		:param repo:
+		:param number:
+		:param check_runs: Mapping of check names to either a conclusion (e.g. ``'failure'``)
+			or a status (``'queued'`` or ``'in_progress'``) for the head commit.
+		:param commits: The number of commits in the pull request.
+		:param labels: The names of labels to apply to the pull request.
+		"""
+
+		with self._lock:
+			state = self._get_repo(owner, repo)
+			full_name = state["json"]["full_name"]
+			shas = [self._sha(full_name, str(number), str(idx)) for idx in range(commits)]
+
+			runs = []
+			for name, result in (check_runs or {}).items():
+				runs.append({
+						"id": next(self._ids),
+						"name": name,
+						"status": "completed" if result in _CONCLUSIONS else result,
+						"conclusion": result if result in _CONCLUSIONS else None,
+						})
+
+			state["pulls"][number] = {"commits": shas, "check_runs": runs}
+			state["issue_labels"][number] = []
+
+			for label in labels:
+				state["issue_labels"][number].append(self._ensure_label(state, label))
+
+			return shas[-1]
+
+	def set_check_run(self, owner: str, repo: str, number: int, name: str, result: str) -> None:
+		"""
+		Add or update a check run on the head commit of a pull request.
+
+		:param owner:
+		:param repo:
+		:param number:
+		:param name:
+		:param result: Either a conclusion (e.g. ``'failure'``) or a status (``'queued'`` or ``'in_progress'``).
+		"""
+
+		with self._lock:
+			runs = self._get_repo(owner, repo)["pulls"][number]["check_runs"]
+			for run in runs:
+				if run["name"] == name:
+					break
+			else:
+				run = {"id": next(self._ids), "name": name}
+				runs.append(run)
+
+			run["status"] = "completed" if result in _CONCLUSIONS else result
+			run["conclusion"] = result if result in _CONCLUSIONS else None
+
+	def add_installation(
+			self,
+			account: str,
+			repositories: Optional[Iterable[str]] = None,
+			app_id: int = 1,
+			) -> int:
+		"""
+		Install a GitHub App on an account, returning the installation ID.
+
+		:param account: The login of the user or organization.
+		:param repositories: The names of the repositories the installation has access to.
+			If :py:obj:`None` all of the account's repositories, including those added later, are accessible.
+		:param app_id:
+		"""
+
+		with self._lock:
+			if account.lower() not in self._accounts:
+				self.add_user(account)
+
+			installation_id = next(self._ids)
+			self._installations[installation_id] = {
+					"account": self._accounts[account.lower()],
+					"repositories": None if repositories is None else [name.lower() for name in repositories],
+					"app_id": app_id,
+					}
+
+			return installation_id
+
+	def labels(self, owner: str, repo: str, number: int) -> List[str]:
+		"""
+		Returns the names of the labels currently applied to a pull request.
+
+		:param owner:
+		:param repo:
+		:param number:
+		"""
+
+		with self._lock:
+			return [label["name"] for label in self._get_repo(owner, repo)["issue_labels"][number]]
+
+	def secrets(self, owner: str, repo: str) -> Dict[str, str]:
+		"""
+		Returns a mapping of secret names to their decrypted values.
+
+		:param owner:
+		:param repo:
+		"""
+
+		box = public.SealedBox(self._secrets_key)
+
+		with self._lock:
+			encrypted = dict(self._get_repo(owner, repo)["secrets"])
+
+		return {
+				name: box.decrypt(value.encode("UTF-8"), encoder=encoding.Base64Encoder).decode("UTF-8")
+				for name,
+				value in encrypted.items()
+				}
+
+	def protection(self, owner: str, repo: str, branch: str) -> Optional[Dict[str, Any]]:
+		"""
+		Returns the protection settings last sent for a branch, or :py:obj:`None` if it is not protected.
+
+		:param owner:
+		:param repo:
+		:param branch:
+		"""
+
+		with self._lock:
+			return self._get_repo(owner, repo)["branches"][branch]["protection"]
+
+	def set_remaining(self, remaining: int, token: Optional[str] = "FAKE_TOKEN") -> None:
+		"""
+		Set the number of requests remaining in the rate limit of the given token.
+
+		:param remaining:
+		:param token: The token, or :py:obj:`None` for unauthenticated requests.
+		"""
+
+		with self._lock:
+			self._rate_limit_for(f"token {token}" if token else '').remaining = remaining
+
+	@property
+	def request_count(self) -> int:
+		"""
+		The number of requests received.
+		"""
+
+		return len(self.requests)
+
+	# JSON representations
+
+	def _sha(self, *parts: str) -> str:
+		return hashlib.sha1('\x00'.join(parts).encode("UTF-8")).hexdigest()  # nosec: B324
+
+	def _user_json(self, login: str, id_: int, type_: str = "User") -> Dict[str, Any]:
+		url = f"{self.api}/users/{login}"
+		api_urls = {key: f"{url}/{suffix}" for key, suffix in _USER_URLS}
+		user = {
+				"login": login,
+				"id": id_,
+				"node_id": '',
+				"avatar_url": f"https://avatars.githubusercontent.com/u/{id_}?v=4",
+				"gravatar_id": '',
+				"url": url,
+				"html_url": f"https://github.com/{login}",
+				**api_urls,
+				"type": type_,
+				"site_admin": False,
+				"name": login,
+				"company": None,
+				"blog": '',
+				"location": None,
+				"email": None,
+				"hireable": None,
+				"bio": None,
+				"description": None,
+				"public_repos": 0,
+				"public_gists": 0,
+				"followers": 0,
+				"following": 0,
+				"created_at": _TIMESTAMP,
+				"updated_at": _TIMESTAMP,
+				}
+
+		if type_ == "Organization":
+			org_url = f"{self.api}/orgs/{login}"
+			user.update({
+					"url": org_url,
+					"repos_url": f"{org_url}/repos",
+					"events_url": f"{org_url}/events",
+					"hooks_url": f"{org_url}/hooks",
+					"issues_url": f"{org_url}/issues",
+					"members_url": f"{org_url}/members{{/member}}",
+					"public_members_url": f"{org_url}/public_members{{/member}}",
+					})
+
+		return user
+
+	def _public_repos(self, account: Dict[str, Any]) -> int:
+		login = account["login"].lower()
+		return sum(
+				1 for (owner, _), state in self._repos.items() if owner == login and not state["json"]["private"]
+				)
+
+	def _commit_json(self, repo: Dict[str, Any], sha: str, parent: Optional[str]) -> Dict[str, Any]:
+		url = f"{repo['url']}/commits/{sha}"
+		signature = {"name": repo["owner"]["login"], "email": "user@example.com", "date": _TIMESTAMP}
+
+		return {
+				"sha": sha,
+				"node_id": '',
+				"url": url,
+				"html_url": f"{repo['html_url']}/commit/{sha}",
+				"comments_url": f"{url}/comments",
+				"author": repo["owner"],
+				"committer": repo["owner"],
+				"parents": [] if parent is None else [{"sha": parent, "url": f"{repo['url']}/commits/{parent}"}],
+				"commit": {
+						"url": f"{repo['url']}/git/commits/{sha}",
+						"author": signature,
+						"committer": signature,
+						"message": f"Commit {sha[:7]}",
+						"tree": {"sha": sha, "url": f"{repo['url']}/git/trees/{sha}"},
+						"comment_count": 0,
+						},
+				}
+
+	def _check_run_json(self, repo: Dict[str, Any], sha: str, run: Dict[str, Any]) -> Dict[str, Any]:
+		url = f"{repo['url']}/check-runs/{run['id']}"
+		completed = run["status"] == "completed"
+
+		return {
+				"id": run["id"],
+				"node_id": '',
+				"name": run["name"],
+				"head_sha": sha,
+				"external_id": '',
+				"url": url,
+				"html_url": f"{repo['html_url']}/runs/{run['id']}",
+				"details_url": f"{repo['html_url']}/runs/{run['id']}",
+				"status": run["status"],
+				"conclusion": run["conclusion"],
+				"started_at": _TIMESTAMP,
+				"completed_at": _TIMESTAMP if completed else None,
+				"output": {
+						"title": None,
+						"summary": None,
+						"text": None,
+						"annotations_count": 0,
+						"annotations_url": f"{url}/annotations",
+						},
+				"check_suite": {"id": run["id"]},
+				"app": {
+						"id": 15368,
+						"slug": "github-actions",
+						"node_id": '',
+						"owner": self._user_json("github", 9919, "Organization"),
+						"name": "GitHub Actions",
+						"description": '',
+						"external_url": "https://help.github.com/en/actions",
+						"html_url": "https://github.com/apps/github-actions",
+						"created_at": _TIMESTAMP,
+						"updated_at": _TIMESTAMP,
+						},
+				"pull_requests": [],
+				}
+
+	def _label_json(
+			self,
+			repo: Dict[str, Any],
+			name: str,
+			color: str,
+			description: Optional[str],
+			) -> Dict[str, Any]:
+		return {
+				"id": next(self._ids),
+				"node_id": '',
+				"url": f"{repo['url']}/labels/{name}",
+				"name": name,
+				"color": color.lstrip('#'),
+				"default": False,
+				"description": description,
+				}
+
+	def _ensure_label(self, state: Dict[str, Any], name: str) -> Dict[str, Any]:
+		if name not in state["labels"]:
+			state["labels"][name] = self._label_json(state["json"], name, "ededed", None)
+
+		return state["labels"][name]
+
+	def _pull_json(self, state: Dict[str, Any], number: int) -> Dict[str, Any]:
+		repo = state["json"]
+		pull = state["pulls"][number]
+		url = f"{repo['url']}/pulls/{number}"
+		issue_url = f"{repo['url']}/issues/{number}"
+		html_url = f"{repo['html_url']}/pull/{number}"
+		base_sha = state["branches"][repo["default_branch"]]["sha"]
+		head_sha = pull["commits"][-1]
+
+		def link(href: str) -> Dict[str, str]:
+			return {"href": href}
+
+		return {
+				"id": number,
+				"node_id": '',
+				"number": number,
+				"url": url,
+				"html_url": html_url,
+				"diff_url": f"{html_url}.diff",
+				"patch_url": f"{html_url}.patch",
+				"issue_url": issue_url,
+				"commits_url": f"{url}/commits",
+				"review_comments_url": f"{url}/comments",
+				"review_comment_url": f"{repo['url']}/pulls/comments{{/number}}",
+				"comments_url": f"{issue_url}/comments",
+				"statuses_url": f"{repo['url']}/statuses/{head_sha}",
+				"state": "open",
+				"locked": False,
+				"active_lock_reason": None,
+				"title": f"Pull request #{number}",
+				"body": '',
+				"body_html": '',
+				"body_text": '',
+				"user": repo["owner"],
+				"author_association": "OWNER",
+				"labels": state["issue_labels"][number],
+				"milestone": None,
+				"assignee": None,
+				"assignees": [],
+				"requested_reviewers": [],
+				"requested_teams": [],
+				"draft": False,
+				"created_at": _TIMESTAMP,
+				"updated_at": _TIMESTAMP,
+				"closed_at": None,
+				"merged_at": None,
+				"merge_commit_sha": None,
+				"merged": False,
+				"mergeable": True,
+				"mergeable_state": "clean",
+				"merged_by": None,
+				"comments": 0,
+				"review_comments": 0,
+				"commits": len(pull["commits"]),
+				"additions": 0,
+				"deletions": 0,
+				"changed_files": 0,
+				"head": {
+						"label": f"{repo['owner']['login']}:pr-{number}",
+						"ref": f"pr-{number}",
+						"sha": head_sha,
+						"user": repo["owner"],
+						"repo": repo,
+						},
+				"base": {
+						"label": f"{repo['owner']['login']}:{repo['default_branch']}",
+						"ref": repo["default_branch"],
+						"sha": base_sha,
+						"user": repo["owner"],
+						"repo": repo,
+						},
+				"_links": {
+						"self": link(url),
+						"html": link(html_url),
+						"issue": link(issue_url),
+						"comments": link(f"{issue_url}/comments"),
+						"review_comments": link(f"{url}/comments"),
+						"review_comment": link(f"{repo['url']}/pulls/comments{{/number}}"),
+						"commits": link(f"{url}/commits"),
+						"statuses": link(f"{repo['url']}/statuses/{head_sha}"),
+						},
+				}
+
+	def _issue_json(self, state: Dict[str, Any], number: int) -> Dict[str, Any]:
+		repo = state["json"]
+		url = f"{repo['url']}/issues/{number}"
+
+		return {
+				"id": number,
+				"node_id": '',
+				"number": number,
+				"url": url,
+				"html_url": f"{repo['html_url']}/pull/{number}",
+				"repository_url": repo["url"],
+				"labels_url": f"{url}/labels{{/name}}",
+				"comments_url": f"{url}/comments",
+				"events_url": f"{url}/events",
+				"title": f"Pull request #{number}",
+				"body": '',
+				"body_html": '',
+				"body_text": '',
+				"user": repo["owner"],
+				"labels": state["issue_labels"][number],
+				"state": "open",
+				"locked": False,
+				"assignee": None,
+				"assignees": [],
+				"milestone": None,
+				"comments": 0,
+				"created_at": _TIMESTAMP,
+				"updated_at": _TIMESTAMP,
+				"closed_at": None,
+				"closed_by": None,
+				"author_association": "OWNER",
+				"pull_request": {"url": f"{repo['url']}/pulls/{number}"},
+				}
+
+	def _protection_json(self, repo: Dict[str, Any], branch: str, protection: Dict[str, Any]) -> Dict[str, Any]:
+		url = f"{repo['url']}/branches/{branch}/protection"
+		status_checks = protection.get("required_status_checks") or {}
+		reviews = protection.get("required_pull_request_reviews") or {}
+
+		return {
+				"url": url,
+				"required_status_checks": {
+						"url": f"{url}/required_status_checks",
+						"strict": bool(status_checks.get("strict", False)),
+						"contexts": list(status_checks.get("contexts") or []),
+						"contexts_url": f"{url}/required_status_checks/contexts",
+						},
+				"required_pull_request_reviews": {
+						"url": f"{url}/required_pull_request_reviews",
+						"dismiss_stale_reviews": bool(reviews.get("dismiss_stale_reviews", False)),
+						"require_code_owner_reviews": bool(reviews.get("require_code_owner_reviews", False)),
+						"required_approving_review_count": reviews.get("required_approving_review_count", 1),
+						},
+				"enforce_admins": {
+						"url": f"{url}/enforce_admins",
+						"enabled": bool(protection.get("enforce_admins")),
+						},
+				"required_linear_history": {"enabled": False},
+				"allow_force_pushes": {"enabled": False},
+				"allow_deletions": {"enabled": False},
+				}
+
+	def _branch_json(self, state: Dict[str, Any], name: str) -> Dict[str, Any]:
+		repo = state["json"]
+		branch = state["branches"][name]
+		url = f"{repo['url']}/branches/{name}"
+
+		return {
+				"name": name,
+				"commit": self._commit_json(repo, branch["sha"], None),
+				"_links": {"self": url, "html": f"{repo['html_url']}/tree/{name}"},
+				"protected": branch["protection"] is not None,
+				"protection": {"enabled": branch["protection"] is not None, "required_status_checks": {}},
+				"protection_url": f"{url}/protection",
+				}
+
+	def _installation_json(self, installation_id: int) -> Dict[str, Any]:
+		installation = self._installations[installation_id]
+		account = installation["account"]
+
+		return {
+				"id": installation_id,
+				"account": account,
+				"repository_selection": "all" if installation["repositories"] is None else "selected",
+				"access_tokens_url": f"{self.api}/app/installations/{installation_id}/access_tokens",
+				"repositories_url": f"{self.api}/installation/repositories",
+				"html_url": f"https://github.com/settings/installations/{installation_id}",
+				"app_id": installation["app_id"],
+				"app_slug": "fake-app",
+				"target_id": account["id"],
+				"target_type": account["type"],
+				"permissions": {"checks": "write", "issues": "write", "metadata": "read", "secrets": "write"},
+				"events": ["check_run", "check_suite", "pull_request"],
+				"created_at": _TIMESTAMP,
+				"updated_at": _TIMESTAMP,
+				"single_file_name": None,
+				}
+
+	def _installation_repos(self, installation_id: int) -> List[Dict[str, Any]]:
+		installation = self._installations[installation_id]
+		login = installation["account"]["login"].lower()
+		names = installation["repositories"]
+
+		return [
+				state["json"] for (owner, name),
+				state in sorted(self._repos.items()) if owner == login and (names is None or name in names)
+				]
+
+	# Request handling
+
+	def _get_repo(self, owner: str, repo: str) -> Dict[str, Any]:
+		state = self._repos.get((owner.lower(), repo.lower()))
+		if state is None:
+			raise FakeResponse(HTTPStatus.NOT_FOUND, "Not Found")
+		return state
+
+	def _get_account(self, login: str, type_: Optional[str] = None) -> Dict[str, Any]:
+		account = self._accounts.get(login.lower())
+		if account is None or (type_ is not None and account["type"] != type_):
+			raise FakeResponse(HTTPStatus.NOT_FOUND, "Not Found")
+
+		return {**account, "public_repos": self._public_repos(account)}
+
+	def _rate_limit_for(self, authorization: str) -> _RateLimit:
+		now = int(time.time())
+
+		if authorization not in self._limits or self._limits[authorization].reset <= now:
+			limit = self.rate_limit if authorization else min(60, self.rate_limit)
+			self._limits[authorization] = _RateLimit(limit, now + self.rate_limit_window)
+
+		return self._limits[authorization]
+
+	def _paginate(
+			self,
+			items: List[Any],
+			path: str,
+			query: Dict[str, str],
+			) -> Tuple[List[Any], Dict[str, str]]:
+
+		per_page = min(int(query.get("per_page", self.page_size)), self.max_page_size)
+		page = max(int(query.get("page", 1)), 1)
+		last = max((len(items) + per_page - 1) // per_page, 1)
+
+		def page_url(number: int) -> str:
+			return f"{self.api}{path}?{urlencode({**query, 'page': number})}"
+
+		links = []
+		if page < last:
+			links.append(f'<{page_url(page + 1)}>; rel="next"')
+			links.append(f'<{page_url(last)}>; rel="last"')
+		if page > 1:
+			links.append(f'<{page_url(1)}>; rel="first"')
+			links.append(f'<{page_url(page - 1)}>; rel="prev"')
+
+		headers = {"Link": ", ".join(links)} if links else {}
+		return items[(page - 1) * per_page:page * per_page], headers
+
+	def _add_routes(self) -> None:
+		owner_repo = r"/repos/(?P<owner>[^/]+)/(?P<repo>[^/]+)"
+
+		routes: List[Tuple[str, str, Callable[..., Any]]] = [
+				("GET", r"/rate_limit", self._handle_rate_limit),
+				("GET", r"/user", self._handle_authenticated_user),
+				("GET", r"/users/(?P<login>[^/]+)", self._handle_user),
+				("GET", r"/orgs/(?P<login>[^/]+)", self._handle_org),
+				("GET", r"/users/(?P<login>[^/]+)/repos", self._handle_list_repos),
+				("GET", r"/orgs/(?P<login>[^/]+)/repos", self._handle_list_repos),
+				("GET", r"/user/(?P<account_id>\d+)/repos", self._handle_list_repos),
+				("GET", r"/app/installations", self._handle_list_installations),
+				("GET", r"/users/(?P<login>[^/]+)/installation", self._handle_account_installation),
+				("GET", r"/orgs/(?P<login>[^/]+)/installation", self._handle_account_installation),
+				("GET", owner_repo + r"/installation", self._handle_repo_installation),
+				("POST", r"/app/installations/(?P<installation_id>\d+)/access_tokens", self._handle_access_token),
+				("GET", r"/installation/repositories", self._handle_installation_repos),
+				("GET", owner_repo, self._handle_repo),
+				("GET", owner_repo + r"/pulls", self._handle_list_pulls),
+				("GET", owner_repo + r"/pulls/(?P<number>\d+)", self._handle_pull),
+				("GET", owner_repo + r"/pulls/(?P<number>\d+)/commits", self._handle_pull_commits),
+				("GET", owner_repo + r"/commits/(?P<sha>[^/]+)/check-runs", self._handle_check_runs),
+				("GET", owner_repo + r"/issues/(?P<number>\d+)", self._handle_issue),
+				("GET", owner_repo + r"/issues/(?P<number>\d+)/labels", self._handle_issue_labels),
+				("POST", owner_repo + r"/issues/(?P<number>\d+)/labels", self._handle_add_issue_labels),
+				("PUT", owner_repo + r"/issues/(?P<number>\d+)/labels", self._handle_replace_issue_labels),
+				(
+						"DELETE",
+						owner_repo + r"/issues/(?P<number>\d+)/labels/(?P<name>[^/]+)",
+						self._handle_remove_label,
+						),
+				("GET", owner_repo + r"/labels", self._handle_labels),
+				("POST", owner_repo + r"/labels", self._handle_create_label),
+				("PATCH", owner_repo + r"/labels/(?P<name>[^/]+)", self._handle_update_label),
+				("GET", owner_repo + r"/actions/secrets", self._handle_secrets),
+				("GET", owner_repo + r"/actions/secrets/public-key", self._handle_public_key),
+				("PUT", owner_repo + r"/actions/secrets/(?P<name>[^/]+)", self._handle_set_secret),
+				("GET", owner_repo + r"/branches/(?P<branch>[^/]+)", self._handle_branch),
+				("GET", owner_repo + r"/branches/(?P<branch>[^/]+)/protection", self._handle_protection),
+				("PUT", owner_repo + r"/branches/(?P<branch>[^/]+)/protection", self._handle_set_protection),
+				]
+
+		self._routes = [(method, re.compile(f"^{pattern}$"), handler) for method, pattern, handler in routes]
+
+	def _dispatch(
+			self,
+			method: str,
+			raw_path: str,
+			authorization: str,
+			body: bytes,
+			) -> Tuple[int, Any, Dict[str, str]]:
+
+		split = urlsplit(raw_path)
+		path = split.path.rstrip('/') or '/'
+		query = {key: values[-1] for key, values in parse_qs(split.query).items()}
+
+		with self._lock:
+			self.requests.append((method, path))
+			count = len(self.requests)
+			self._in_flight += 1
+			in_flight = self._in_flight
+
+		try:
+			if self.latency:
+				time.sleep(self.latency)
+
+			with self._lock:
+				limit = self._rate_limit_for(authorization)
+				rate_headers = {
+						"X-RateLimit-Limit": str(limit.limit),
+						"X-RateLimit-Reset": str(limit.reset),
+						"X-RateLimit-Resource": "core",
+						}
+
+				if path != "/rate_limit":
+					if self.max_concurrent_requests is not None and in_flight > self.max_concurrent_requests:
+						raise self._secondary_limit(limit)
+					if self.secondary_limit_every and count % self.secondary_limit_every == 0:
+						raise self._secondary_limit(limit)
+
+					if limit.remaining <= 0:
+						raise FakeResponse(
+								HTTPStatus.FORBIDDEN,
+								"API rate limit exceeded.",
+								{
+										**rate_headers,
+										"X-RateLimit-Remaining": '0',
+										"X-RateLimit-Used": str(limit.limit),
+										},
+								)
+
+					limit.remaining -= 1
+
+				rate_headers["X-RateLimit-Remaining"] = str(limit.remaining)
+				rate_headers["X-RateLimit-Used"] = str(limit.limit - limit.remaining)
+
+			for route_method, pattern, handler in self._routes:
+				match = pattern.match(path)
+				if match and route_method == method:
+					break
+			else:
+				raise FakeResponse(HTTPStatus.NOT_FOUND, "Not Found", rate_headers)
+
+			kwargs = {key: unquote(value) for key, value in match.groupdict().items()}
+
+			try:
+				payload = json.loads(body) if body else None
+			except ValueError as e:
+				raise FakeResponse(HTTPStatus.BAD_REQUEST, "Problems parsing JSON", rate_headers) from e
+
+			try:
+				with self._lock:
+					status, data, extra_headers = handler(
+						path=path,
+						query=query,
+						authorization=authorization,
+						payload=payload,
+						**kwargs,
+					)
+			except FakeResponse as e:
+				e.headers = {**rate_headers, **e.headers}
+				raise
+			except Exception as e:
+				_log.exception("Error handling %s %s", method, raw_path)
+				raise FakeResponse(HTTPStatus.INTERNAL_SERVER_ERROR, f"Server Error: {e}", rate_headers) from e
+
+			return status, data, {**rate_headers, **extra_headers}
+
+		finally:
+			with self._lock:
+				self._in_flight -= 1
+
+	def _secondary_limit(self, limit: _RateLimit) -> FakeResponse:
+		return FakeResponse(
+				HTTPStatus.FORBIDDEN,
+				"You have exceeded a secondary rate limit. Please wait a few minutes before you try again.",
+				{
+						"Retry-After": str(self.retry_after),
+						"X-RateLimit-Limit": str(limit.limit),
+						"X-RateLimit-Remaining": str(limit.remaining),
+						"X-RateLimit-Reset": str(limit.reset),
+						},
+				)
+
+	def _make_handler(self) -> Type[BaseHTTPRequestHandler]:
+		server = self
+
+		class Handler(BaseHTTPRequestHandler):
+			protocol_version = "HTTP/1.1"
+			disable_nagle_algorithm = True
+
+			def _handle(self) -> None:
+				body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+
+				try:
+					status, data, headers = server._dispatch(
+						self.command,
+						self.path,
+						self.headers.get("Authorization", ''),
+						body,
+					)
+				except FakeResponse as e:
+					status, headers = e.status, e.headers
+					data = {"message": e.message, "documentation_url": "https://docs.github.com/rest"}
+				except Exception as e:
+					_log.exception("Error handling %s %s", self.command, self.path)
+					status, headers = HTTPStatus.INTERNAL_SERVER_ERROR, {}
+					data = {"message": f"Server Error: {e}", "documentation_url": "https://docs.github.com/rest"}
+
+				content = b'' if data is None else json.dumps(data).encode("UTF-8")
+
+				self.send_response(status)
+				for name, value in headers.items():
+					self.send_header(name, value)
+				self.send_header("Content-Type", "application/json; charset=utf-8")
+				self.send_header("Content-Length", str(len(content)))
+				self.end_headers()
+				self.wfile.write(content)
+
+			do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = _handle
+
+			def log_message(self, format: str, *args: Any) -> None:  # noqa: A002  # pylint: disable=redefined-builtin
+				_log.debug(format, *args)
+
+		return Handler
+
+	# Endpoints
+
+	def _handle_rate_limit(self, authorization: str, **kwargs: Any) -> Tuple[int, Any, Dict[str, str]]:
+		limit = self._rate_limit_for(authorization)
+		rate = {
+				"limit": limit.limit,
+				"remaining": limit.remaining,
+				"reset": limit.reset,
+				"used": limit.limit - limit.remaining,
+				}
+		return 200, {"resources": {"core": rate}, "rate": rate}, {}
+
+	def _handle_authenticated_user(self, authorization: str, **kwargs: Any) -> Tuple[int, Any, Dict[str, str]]:
+		if not authorization.startswith("token "):
+			raise FakeResponse(HTTPStatus.UNAUTHORIZED, "Requires authentication")
+
+		login = authorization[6:].lower()
+		if login not in self._accounts:
+			# Tokens which don't match an account authenticate as the first user added.
+			users = [account["login"] for account in self._accounts.values() if account["type"] == "User"]
+			if not users:
+				raise FakeResponse(HTTPStatus.UNAUTHORIZED, "Bad credentials")
+			login = users[0]
+
+		return 200, self._get_account(login, "User"), {}
+
+	def _handle_user(self, login: str, **kwargs: Any) -> Tuple[int, Any, Dict[str, str]]:
+		return 200, self._get_account(login), {}
+
+	def _handle_org(self, login: str, **kwargs: Any) -> Tuple[int, Any, Dict[str, str]]:
+		return 200, self._get_account(login, "Organization"), {}
+
+	def _handle_list_repos(
+			self,
+			path: str,
+			query: Dict[str, str],
+			login: Optional[str] = None,
+			account_id: Optional[str] = None,
+			**kwargs: Any,
+			) -> Tuple[int, Any, Dict[str, str]]:
+
+		if account_id is not None:
+			for account in self._accounts.values():
+				if str(account["id"]) == account_id:
+					login = account["login"]
+					break
+			else:
+				raise FakeResponse(HTTPStatus.NOT_FOUND, "Not Found")
+
+		assert login is not None
+		account = self._get_account(login)
+
+		repos = [state["json"] for (owner, _), state in self._repos.items() if owner == account["login"].lower()]
+
+		repo_type = query.get("type", "all")
+		if repo_type in {"public", "private"}:
+			repos = [repo for repo in repos if repo["visibility"] == repo_type]
+		elif repo_type == "forks":
+			repos = [repo for repo in repos if repo["fork"]]
+		elif repo_type == "sources":
+			repos = [repo for repo in repos if not repo["fork"]]
+
+		sort = query.get("sort", "full_name" if account["type"] == "User" else "created")
+		key = "full_name" if sort not in {"created", "updated", "pushed"} else f"{sort}_at"
+		reverse = query.get("direction", "asc" if key == "full_name" else "desc") == "desc"
+		repos.sort(key=lambda repo: (repo[key], repo["id"]), reverse=reverse)
+
+		page, headers = self._paginate(repos, path, query)
+		return 200, page, headers
+
+	def _handle_list_installations(
+			self,
+			path: str,
+			query: Dict[str, str],
+			**kwargs: Any,
+			) -> Tuple[int, Any, Dict[str, str]]:
+		installations = [
+				self._installation_json(installation_id) for installation_id in sorted(self._installations)
+				]
+		page, headers = self._paginate(installations, path, query)
+		return 200, page, headers
+
+	def _handle_account_installation(self, login: str, **kwargs: Any) -> Tuple[int, Any, Dict[str, str]]:
+		for installation_id, installation in self._installations.items():
+			if installation["account"]["login"].lower() == login.lower():
+				return 200, self._installation_json(installation_id), {}
+
+		raise FakeResponse(HTTPStatus.NOT_FOUND, "Not Found")
+
+	def _handle_repo_installation(self, owner: str, repo: str, **kwargs: Any) -> Tuple[int, Any, Dict[str, str]]:
+		self._get_repo(owner, repo)
+
+		for installation_id in self._installations:
+			if repo.lower() in {r["name"].lower() for r in self._installation_repos(installation_id)}:
+				if self._installations[installation_id]["account"]["login"].lower() == owner.lower():
+					return 200, self._installation_json(installation_id), {}
+
+		raise FakeResponse(HTTPStatus.NOT_FOUND, "Not Found")
+
+	def _handle_access_token(self, installation_id: str, **kwargs: Any) -> Tuple[int, Any, Dict[str, str]]:
+		if int(installation_id) not in self._installations:
+			raise FakeResponse(HTTPStatus.NOT_FOUND, "Not Found")
+
+		token = f"ghs_{self._sha(installation_id, str(next(self._ids)))[:36]}"
+		self._tokens[token] = int(installation_id)
+		expires_at = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(time.time() + 3600))
+
+		return 201, {"token": token, "expires_at": expires_at, "permissions": {}}, {}
+
+	def _handle_installation_repos(
+			self,
+			path: str,
+			query: Dict[str, str],
+			authorization: str,
+			**kwargs: Any,
+			) -> Tuple[int, Any, Dict[str, str]]:
+
+		installation_id = self._tokens.get(authorization[6:])
+		if installation_id is None:
+			raise FakeResponse(HTTPStatus.FORBIDDEN, "Requires an installation access token")
+
+		repos = self._installation_repos(installation_id)
+		page, headers = self._paginate(repos, path, query)
+		return 200, {"total_count": len(repos), "repositories": page}, headers
+
+	def _handle_repo(self, owner: str, repo: str, **kwargs: Any) -> Tuple[int, Any, Dict[str, str]]:
+		return 200, self._get_repo(owner, repo)["json"], {}
+
+	def _get_pull(self, owner: str, repo: str, number: str) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+		state = self._get_repo(owner, repo)
+		pull = state["pulls"].get(int(number))
+		if pull is None:
+			raise FakeResponse(HTTPStatus.NOT_FOUND, "Not Found")
+		return state, pull
+
+	def _handle_list_pulls(
+			self,
+			owner: str,
+			repo: str,
+			path: str,
+			query: Dict[str, str],
+			**kwargs: Any,
+			) -> Tuple[int, Any, Dict[str, str]]:
+
+		state = self._get_repo(owner, repo)
+		pulls = [self._pull_json(state, number) for number in sorted(state["pulls"])]
+
+		if query.get("state", "open") not in {"open", "all"}:
+			pulls = []
+
+		page, headers = self._paginate(pulls, path, query)
+		return 200, page, headers
+
+	def _handle_pull(self, owner: str, repo: str, number: str, **kwargs: Any) -> Tuple[int, Any, Dict[str, str]]:
+		state, _ = self._get_pull(owner, repo, number)
+		return 200, self._pull_json(state, int(number)), {}
+
+	def _handle_pull_commits(
+			self,
+			owner: str,
+			repo: str,
+			number: str,
+			path: str,
+			query: Dict[str, str],
+			**kwargs: Any,
+			) -> Tuple[int, Any, Dict[str, str]]:
+
+		state, pull = self._get_pull(owner, repo, number)
+		shas = pull["commits"]
+		commits = [
+				self._commit_json(state["json"], sha, shas[idx - 1] if idx else None) for idx,
+				sha in enumerate(shas)
+				]
+
+		page, headers = self._paginate(commits, path, query)
+		return 200, page, headers
+
+	def _handle_check_runs(
+			self,
+			owner: str,
+			repo: str,
+			sha: str,
+			path: str,
+			query: Dict[str, str],
+			**kwargs: Any,
+			) -> Tuple[int, Any, Dict[str, str]]:
+
+		state = self._get_repo(owner, repo)
+		runs: List[Dict[str, Any]] = []
+
+		for pull in state["pulls"].values():
+			if pull["commits"][-1] == sha:
+				runs = [self._check_run_json(state["json"], sha, run) for run in pull["check_runs"]]
+				break
+
+		page, headers = self._paginate(runs, path, query)
+		return 200, {"total_count": len(runs), "check_runs": page}, headers
+
+	def _handle_issue(self, owner: str, repo: str, number: str, **kwargs: Any) -> Tuple[int, Any, Dict[str, str]]:
+		state, _ = self._get_pull(owner, repo, number)
+		return 200, self._issue_json(state, int(number)), {}
+
+	def _handle_issue_labels(
+			self,
+			owner: str,
+			repo: str,
+			number: str,
+			path: str,
+			query: Dict[str, str],
+			**kwargs: Any,
+			) -> Tuple[int, Any, Dict[str, str]]:
+
+		state, _ = self._get_pull(owner, repo, number)
+		page, headers = self._paginate(state["issue_labels"][int(number)], path, query)
+		return 200, page, headers
+
+	def _label_names(self, payload: Any) -> List[str]:
+		if isinstance(payload, dict):
+			payload = payload.get("labels", [])
+
+		return [label["name"] if isinstance(label, dict) else str(label) for label in payload or []]
+
+	def _handle_add_issue_labels(
+			self,
+			owner: str,
+			repo: str,
+			number: str,
+			payload: Any,
+			**kwargs: Any,
+			) -> Tuple[int, Any, Dict[str, str]]:
+
+		state, _ = self._get_pull(owner, repo, number)
+		labels = state["issue_labels"][int(number)]
+
+		for name in self._label_names(payload):
+			if name not in {label["name"] for label in labels}:
+				labels.append(self._ensure_label(state, name))
+
+		return 200, labels, {}
+
+	def _handle_replace_issue_labels(
+			self,
+			owner: str,
+			repo: str,
+			number: str,
+			payload: Any,
+			**kwargs: Any,
+			) -> Tuple[int, Any, Dict[str, str]]:
+
+		state, _ = self._get_pull(owner, repo, number)
+		labels = [self._ensure_label(state, name) for name in dict.fromkeys(self._label_names(payload))]
+		state["issue_labels"][int(number)] = labels
+
+		return 200, labels, {}
+
+	def _handle_remove_label(
+			self,
+			owner: str,
+			repo: str,
+			number: str,
+			name: str,
+			**kwargs: Any,
+			) -> Tuple[int, Any, Dict[str, str]]:
+
+		state, _ = self._get_pull(owner, repo, number)
+		labels = state["issue_labels"][int(number)]
+		remaining = [label for label in labels if label["name"] != name]
+
+		if len(remaining) == len(labels):
+			raise FakeResponse(HTTPStatus.NOT_FOUND, "Label does not exist")
+
+		state["issue_labels"][int(number)] = remaining
+		return 200, remaining, {}
+
+	def _handle_labels(
+			self,
+			owner: str,
+			repo: str,
+			path: str,
+			query: Dict[str, str],
+			**kwargs: Any,
+			) -> Tuple[int, Any, Dict[str, str]]:
+
+		state = self._get_repo(owner, repo)
+		page, headers = self._paginate(list(state["labels"].values()), path, query)
+		return 200, page, headers
+
+	def _handle_create_label(
+			self,
+			owner: str,
+			repo: str,
+			payload: Any,
+			**kwargs: Any,
+			) -> Tuple[int, Any, Dict[str, str]]:
+
+		state = self._get_repo(owner, repo)
+		name = payload["name"]
+
+		if name in state["labels"]:
+			raise FakeResponse(HTTPStatus.UNPROCESSABLE_ENTITY, "Validation Failed")
+
+		label = self._label_json(state["json"], name, payload.get("color", "ededed"), payload.get("description"))
+		state["labels"][name] = label
+		return 201, label, {}
+
+	def _handle_update_label(
+			self,
+			owner: str,
+			repo: str,
+			name: str,
+			payload: Any,
+			**kwargs: Any,
+			) -> Tuple[int, Any, Dict[str, str]]:
+
+		state = self._get_repo(owner, repo)
+
+		if name not in state["labels"]:
+			raise FakeResponse(HTTPStatus.NOT_FOUND, "Not Found")
+
+		label = state["labels"].pop(name)
+		label = self._label_json(
+				state["json"],
+				payload.get("new_name", name),
+				payload.get("color", label["color"]),
+				payload.get("description", label["description"]),
+				)
+		state["labels"][label["name"]] = label
+		return 200, label, {}
+
+	def _handle_secrets(
+			self,
+			owner: str,
+			repo: str,
+			path: str,
+			query: Dict[str, str],
+			**kwargs: Any,
+			) -> Tuple[int, Any, Dict[str, str]]:
+
+		state = self._get_repo(owner, repo)
+		secrets = [{"name": name, "created_at": _TIMESTAMP, "updated_at": _TIMESTAMP} for name in state["secrets"]]
+		page, headers = self._paginate(secrets, path, query)
+		return 200, {"total_count": len(secrets), "secrets": page}, headers
+
+	def _handle_public_key(self, owner: str, repo: str, **kwargs: Any) -> Tuple[int, Any, Dict[str, str]]:
+		self._get_repo(owner, repo)
+		key = self._secrets_key.public_key.encode(encoding.Base64Encoder).decode("UTF-8")
+		return 200, {"key_id": self._secrets_key_id, "key": key}, {}
+
+	def _handle_set_secret(
+			self,
+			owner: str,
+			repo: str,
+			name: str,
+			payload: Any,
+			**kwargs: Any,
+			) -> Tuple[int, Any, Dict[str, str]]:
+
+		state = self._get_repo(owner, repo)
+
+		if not payload or payload.get("key_id") != self._secrets_key_id:
+			raise FakeResponse(HTTPStatus.UNPROCESSABLE_ENTITY, "Bad key_id")
+
+		status = 204 if name in state["secrets"] else 201
+		state["secrets"][name] = payload["encrypted_value"]
+		return status, None, {}
+
+	def _get_branch(self, owner: str, repo: str, branch: str) -> Dict[str, Any]:
+		state = self._get_repo(owner, repo)
+		if branch not in state["branches"]:
+			raise FakeResponse(HTTPStatus.NOT_FOUND, "Branch not found")
+		return state
+
+	def _handle_branch(self, owner: str, repo: str, branch: str, **kwargs: Any) -> Tuple[int, Any, Dict[str, str]]:
+		state = self._get_branch(owner, repo, branch)
+		return 200, self._branch_json(state, branch), {}
+
+	def _handle_protection(
+			self,
+			owner: str,
+			repo: str,
+			branch: str,
+			**kwargs: Any,
+			) -> Tuple[int, Any, Dict[str, str]]:
+
+		state = self._get_branch(owner, repo, branch)
+		protection = state["branches"][branch]["protection"]
+
+		if protection is None:
+			raise FakeResponse(HTTPStatus.NOT_FOUND, "Branch not protected")
+
+		return 200, self._protection_json(state["json"], branch, protection), {}
+
+	def _handle_set_protection(
+			self,
+			owner: str,
+			repo: str,
+			branch: str,
+			payload: Any,
+			**kwargs: Any,
+			) -> Tuple[int, Any, Dict[str, str]]:
+
+		state = self._get_branch(owner, repo, branch)
+		state["branches"][branch]["protection"] = payload or {}
+		return 200, self._protection_json(state["json"], branch, payload or {}), {}
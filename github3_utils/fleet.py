@@ -0,0 +1,530 @@
+#!/usr/bin/env python3
+#
+#  fleet.py
+"""
+Plan changes to many repositories offline, then apply them in one concurrent batch.
+
+.. versionadded:: 0.9.0
+
+.. code-block:: python
+
+	# Read the current state once.
+	snapshot = take_snapshot(github, orgs=["sphinx-toolbox", "repo-helper"])
+	snapshot.save("fleet.json")
+
+	# Planning makes no requests, so can be repeated and reviewed freely.
+	plan = make_plan(
+			Snapshot.load("fleet.json"),
+			status_checks=["Flake8", "mypy"],
+			labels=check_status_labels.values(),
+			secrets=["PYPI_TOKEN"],
+			)
+	print(plan.describe())
+
+	# Only the differences are written.
+	for change, error in apply_plan(github, plan, secrets={"PYPI_TOKEN": os.environ["PYPI_TOKEN"]}):
+		...
+
+A :class:`~.Snapshot` records, for each repository, the required status checks on its default branch,
+its labels, and the names of its Actions secrets. The repositories are listed a page at a time,
+and each repository is read as soon as its page arrives, concurrently with the rest of the listing.
+Archived repositories are read-only, so only their listing is recorded.
+Repositories which can't be read (for example, when the token may not view their branch protection)
+are recorded with the error, and are left out of any :class:`~.Plan`.
+
+A :class:`~.Plan` can also be saved and reviewed before it is applied.
+It contains the names of the secrets to set but never their values, which are only given to :func:`~.apply_plan`.
+The secret values themselves can't be read back, so only missing secrets are planned
+unless ``overwrite_secrets`` is :py:obj:`True`.
+"""
+#
+#  Copyright © 2026 Dominic Davis-Foster <dominic@davis-foster.co.uk>
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+#  EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+#  MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+#  IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+#  DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+#  OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+#  OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+# stdlib
+import datetime
+import json
+import os
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple, Union
+from urllib.parse import quote
+
+# 3rd party
+import attr
+
+# this package
+from github3_utils import _protection_edit, iter_owner_repos
+from github3_utils._instrumentation import instrumented
+from github3_utils.headers import LUKE_CAGE
+from github3_utils.pagination import Paginator
+from github3_utils.secrets import encrypt_secret
+
+if TYPE_CHECKING:
+	# 3rd party
+	from github3 import GitHub
+
+	# this package
+	from github3_utils.check_labels import Label
+
+__all__ = (
+		"Change",
+		"Plan",
+		"RepositoryState",
+		"Snapshot",
+		"apply_plan",
+		"make_plan",
+		"take_snapshot",
+		)
+
+
+def _normalise_color(color: str) -> str:
+	return color.lstrip('#').lower()
+
+
+@attr.s(frozen=True, slots=True)
+class RepositoryState:
+	"""
+	The state of a repository recorded in a :class:`~.Snapshot`.
+	"""
+
+	#: The full name of the repository, as ``'<owner>/<name>'``.
+	full_name: str = attr.ib()
+
+	#: The repository's default branch.
+	default_branch: str = attr.ib()
+
+	#: Whether the repository is archived.
+	archived: bool = attr.ib(default=False)
+
+	#: The status checks required on the default branch, or :py:obj:`None` if the branch isn't protected.
+	required_checks: Optional[List[str]] = attr.ib(default=None)
+
+	#: The repository's labels, as a mapping of names to dictionaries with the keys ``'color'`` and ``'description'``.
+	labels: Dict[str, Dict[str, Optional[str]]] = attr.ib(factory=dict)
+
+	#: The names of the repository's Actions secrets.
+	secrets: List[str] = attr.ib(factory=list)
+
+	#: The error raised when reading the repository, or :py:obj:`None` if it was read successfully.
+	error: Optional[str] = attr.ib(default=None)
+
+	def to_dict(self) -> Dict[str, Any]:
+		"""
+		Return the :class:`~.RepositoryState` as a dictionary.
+		"""
+
+		return attr.asdict(self)
+
+
+@attr.s(slots=True)
+class Snapshot:
+	"""
+	The state of a set of repositories at a point in time.
+	"""
+
+	#: The state of each repository, by full name.
+	repositories: Dict[str, RepositoryState] = attr.ib(factory=dict)
+
+	#: When the snapshot was taken, in ISO 8601 format.
+	taken_at: str = attr.ib(factory=lambda: datetime.datetime.now(datetime.timezone.utc).isoformat())
+
+	def to_dict(self) -> Dict[str, Any]:
+		"""
+		Return the :class:`~.Snapshot` as a dictionary.
+		"""
+
+		return {
+				"taken_at": self.taken_at,
+				"repositories": [state.to_dict() for state in self.repositories.values()],
+				}
+
+	@classmethod
+	def from_dict(cls, data: Mapping[str, Any]) -> "Snapshot":
+		"""
+		Construct a :class:`~.Snapshot` from a dictionary created by :meth:`~.Snapshot.to_dict`.
+
+		:param data:
+		"""
+
+		states = [RepositoryState(**state) for state in data["repositories"]]
+		return cls({state.full_name: state for state in states}, data["taken_at"])
+
+	def save(self, filename: Union[str, "os.PathLike[str]"]) -> None:
+		"""
+		Write the snapshot to the given JSON file.
+
+		:param filename:
+		"""
+
+		_dump(self.to_dict(), filename)
+
+	@classmethod
+	def load(cls, filename: Union[str, "os.PathLike[str]"]) -> "Snapshot":
+		"""
+		Read a snapshot written by :meth:`~.Snapshot.save`.
+
+		:param filename:
+		"""
+
+		with open(filename, encoding="UTF-8") as fp:
+			return cls.from_dict(json.load(fp))
+
+
+@attr.s(frozen=True, slots=True)
+class Change:
+	"""
+	A single change to a repository in a :class:`~.Plan`.
+	"""
+
+	#: The full name of the repository, as ``'<owner>/<name>'``.
+	repository: str = attr.ib()
+
+	#: One of ``'protect_branch'``, ``'create_label'``, ``'update_label'`` or ``'set_secret'``.
+	action: str = attr.ib()
+
+	#: The name of the branch, label or secret being changed.
+	target: str = attr.ib()
+
+	#: The current value, if known.
+	before: Any = attr.ib(default=None)
+
+	#: The new value. Secret values are not included.
+	after: Any = attr.ib(default=None)
+
+	def __str__(self) -> str:
+		description = f"{self.repository}: {self.action.replace('_', ' ')} {self.target!r}"
+
+		if self.action == "set_secret":
+			return description
+
+		return f"{description} ({self.before!r} -> {self.after!r})"
+
+	def to_dict(self) -> Dict[str, Any]:
+		"""
+		Return the :class:`~.Change` as a dictionary.
+		"""
+
+		return attr.asdict(self)
+
+
+@attr.s(slots=True)
+class Plan:
+	"""
+	The changes needed to bring a set of repositories to the desired state.
+	"""
+
+	#: The changes, grouped by repository.
+	changes: List[Change] = attr.ib(factory=list)
+
+	#: When the snapshot the plan was made from was taken.
+	snapshot_taken_at: Optional[str] = attr.ib(default=None)
+
+	def __len__(self) -> int:
+		return len(self.changes)
+
+	def __iter__(self) -> Iterator[Change]:
+		return iter(self.changes)
+
+	def describe(self) -> str:
+		"""
+		Returns a description of the plan, with one change per line.
+		"""
+
+		if not self.changes:
+			return "No changes."
+
+		return '\n'.join(map(str, self.changes))
+
+	def to_dict(self) -> Dict[str, Any]:
+		"""
+		Return the :class:`~.Plan` as a dictionary.
+		"""
+
+		return {
+				"snapshot_taken_at": self.snapshot_taken_at,
+				"changes": [change.to_dict() for change in self.changes],
+				}
+
+	@classmethod
+	def from_dict(cls, data: Mapping[str, Any]) -> "Plan":
+		"""
+		Construct a :class:`~.Plan` from a dictionary created by :meth:`~.Plan.to_dict`.
+
+		:param data:
+		"""
+
+		return cls([Change(**change) for change in data["changes"]], data["snapshot_taken_at"])
+
+	def save(self, filename: Union[str, "os.PathLike[str]"]) -> None:
+		"""
+		Write the plan to the given JSON file.
+
+		:param filename:
+		"""
+
+		_dump(self.to_dict(), filename)
+
+	@classmethod
+	def load(cls, filename: Union[str, "os.PathLike[str]"]) -> "Plan":
+		"""
+		Read a plan written by :meth:`~.Plan.save`.
+
+		:param filename:
+		"""
+
+		with open(filename, encoding="UTF-8") as fp:
+			return cls.from_dict(json.load(fp))
+
+
+def _dump(data: Dict[str, Any], filename: Union[str, "os.PathLike[str]"]) -> None:
+	temporary_filename = f"{os.fspath(filename)}.tmp"
+
+	with open(temporary_filename, 'w', encoding="UTF-8") as fp:
+		json.dump(data, fp, indent=2)
+
+	# Replace the file in one step, so it is never left half written.
+	os.replace(temporary_filename, filename)
+
+
+def _repo_url(github: "GitHub", full_name: str, *parts: str) -> str:
+	owner, name = full_name.split('/', 1)
+	return github._build_url("repos", owner, name, *(quote(part, safe='') for part in parts))
+
+
+def _read_state(github: "GitHub", repo: Dict[str, Any]) -> RepositoryState:
+	full_name, default_branch = repo["full_name"], repo["default_branch"]
+
+	if repo.get("archived"):
+		return RepositoryState(full_name, default_branch, archived=True)
+
+	response = github._get(
+			_repo_url(github, full_name, "branches", default_branch, "protection"),
+			headers=LUKE_CAGE,
+			)
+
+	if response.status_code == 404:
+		required_checks = None
+	else:
+		protection = github._json(response, 200)
+		required_checks = list((protection.get("required_status_checks") or {}).get("contexts") or [])
+
+	labels = {
+			label["name"]: {"color": label["color"], "description": label.get("description")}
+			for label in Paginator(github, _repo_url(github, full_name, "labels"), read_ahead=0)
+			}
+
+	secrets_url = _repo_url(github, full_name, "actions", "secrets")
+	secrets = [secret["name"] for secret in Paginator(github, secrets_url, items_key="secrets", read_ahead=0)]
+
+	return RepositoryState(full_name, default_branch, False, required_checks, labels, secrets)
+
+
+def _try_read_state(github: "GitHub", repo: Dict[str, Any]) -> RepositoryState:
+	try:
+		return _read_state(github, repo)
+	except Exception as e:  # pylint: disable=broad-except
+		return RepositoryState(repo["full_name"], repo["default_branch"], bool(repo.get("archived")), error=str(e))
+
+
+@instrumented
+def take_snapshot(
+		github: "GitHub",
+		users: Iterable[str] = (),
+		orgs: Iterable[str] = (),
+		*,
+		jobs: int = 8,
+		) -> Snapshot:
+	"""
+	Record the current state of the repositories belonging to all ``users`` and all ``orgs``.
+
+	:param github:
+	:param users: An iterable of usernames to fetch the repositories for.
+	:param orgs: An iterable of organization names to fetch the repositories for.
+	:param jobs: The number of repositories to read at once.
+
+	Errors raised while reading a repository are recorded in its :attr:`~.RepositoryState.error`
+	rather than raised, but errors raised while listing the repositories are not caught.
+	"""
+
+	owners = [(user, False) for user in users] + [(org, True) for org in orgs]
+
+	with ThreadPoolExecutor(max_workers=jobs) as pool:
+		futures = []
+		for owner, org in owners:
+			for repo in iter_owner_repos(github, owner, org=org):
+				futures.append(pool.submit(_try_read_state, github, repo.as_dict()))
+
+		states = [future.result() for future in futures]
+
+	return Snapshot({state.full_name: state for state in states})
+
+
+def make_plan(
+		snapshot: Snapshot,
+		*,
+		status_checks: Optional[Sequence[str]] = None,
+		labels: Iterable["Label"] = (),
+		secrets: Iterable[str] = (),
+		overwrite_secrets: bool = False,
+		) -> Plan:
+	"""
+	Work out the changes needed to bring the repositories in the snapshot to the desired state.
+
+	No requests are made. Archived repositories, and those which couldn't be read, are left unchanged.
+
+	:param snapshot:
+	:param status_checks: The status checks which must pass before merging to each default branch,
+		as for :func:`~.protect_branch`. If :py:obj:`None` branch protection is left unchanged.
+	:param labels: Labels which each repository must have.
+		Labels with a different colour or description are updated, and other labels are left alone.
+	:param secrets: The names of secrets which each repository must have.
+	:param overwrite_secrets: Whether to set the secrets even when they already exist.
+	"""
+
+	labels = list(labels)
+	secrets = list(secrets)
+	changes = []
+
+	for state in snapshot.repositories.values():
+		if state.archived or state.error is not None:
+			continue
+
+		if status_checks is not None and (
+				state.required_checks is None or sorted(state.required_checks) != sorted(status_checks)
+				):
+			changes.append(
+					Change(
+							state.full_name,
+							"protect_branch",
+							state.default_branch,
+							state.required_checks,
+							list(status_checks),
+							),
+					)
+
+		for label in labels:
+			desired = {"color": _normalise_color(label.color), "description": label.description}
+			current = state.labels.get(label.name)
+
+			if current is None:
+				changes.append(Change(state.full_name, "create_label", label.name, None, desired))
+			elif {**current, "color": _normalise_color(current["color"] or '')} != desired:
+				changes.append(Change(state.full_name, "update_label", label.name, current, desired))
+
+		for secret in secrets:
+			if overwrite_secrets or secret not in state.secrets:
+				changes.append(Change(state.full_name, "set_secret", secret))
+
+	return Plan(changes, snapshot.taken_at)
+
+
+def _apply_change(
+		github: "GitHub",
+		change: Change,
+		secrets: Mapping[str, str],
+		public_keys: Dict[str, Dict[str, str]],
+		) -> None:
+
+	# 3rd party
+	from github3.exceptions import error_for
+
+	if change.action == "protect_branch":
+		url = _repo_url(github, change.repository, "branches", change.target, "protection")
+		response = github._put(url, json=_protection_edit(change.after), headers=LUKE_CAGE)
+		github._json(response, 200)
+
+	elif change.action == "create_label":
+		url = _repo_url(github, change.repository, "labels")
+		response = github._post(url, data={"name": change.target, **change.after})
+		github._json(response, 201)
+
+	elif change.action == "update_label":
+		url = _repo_url(github, change.repository, "labels", change.target)
+		response = github._patch(url, json=change.after)
+		github._json(response, 200)
+
+	elif change.action == "set_secret":
+		secrets_url = _repo_url(github, change.repository, "actions", "secrets")
+
+		# The public key is only fetched once for each repository.
+		if change.repository not in public_keys:
+			public_keys[change.repository] = github._json(github._get(f"{secrets_url}/public-key"), 200)
+
+		public_key = public_keys[change.repository]
+		secret_json = {
+				"encrypted_value": encrypt_secret(public_key["key"], secrets[change.target]),
+				"key_id": public_key["key_id"],
+				}
+		response = github._put(f"{secrets_url}/{quote(change.target, safe='')}", json=secret_json)
+
+		if response.status_code not in {201, 204}:
+			raise error_for(response)
+
+	else:
+		raise ValueError(f"Unknown action {change.action!r}")
+
+
+@instrumented
+def apply_plan(
+		github: "GitHub",
+		plan: Plan,
+		*,
+		secrets: Mapping[str, str] = {},
+		jobs: int = 8,
+		) -> List[Tuple[Change, Optional[Exception]]]:
+	"""
+	Make the changes in the plan, with the changes for different repositories made concurrently.
+
+	:param github:
+	:param plan:
+	:param secrets: The values of the secrets to set, by name.
+	:param jobs: The number of repositories to change at once.
+
+	:returns: Each change, and the exception raised when making it, or :py:obj:`None` if it succeeded.
+		A failed change doesn't stop the others.
+
+	:raises: :exc:`ValueError` if the value of a secret in the plan is not given.
+	"""
+
+	missing = sorted({change.target for change in plan if change.action == "set_secret"} - set(secrets))
+	if missing:
+		raise ValueError(f"No value was given for the secret(s) {', '.join(missing)}.")
+
+	# Changes are made in order for each repository, and the results returned in the order of the plan.
+	by_repository: Dict[str, List[int]] = defaultdict(list)
+	for idx, change in enumerate(plan):
+		by_repository[change.repository].append(idx)
+
+	results: List[Optional[Exception]] = [None] * len(plan)
+	public_keys: Dict[str, Dict[str, str]] = {}
+
+	def apply_repository(indices: List[int]) -> None:
+		for idx in indices:
+			try:
+				_apply_change(github, plan.changes[idx], secrets, public_keys)
+			except Exception as e:  # pylint: disable=broad-except
+				results[idx] = e
+
+	with ThreadPoolExecutor(max_workers=jobs) as pool:
+		list(pool.map(apply_repository, by_repository.values()))
+
+	return list(zip(plan.changes, results))
@@ -0,0 +1,382 @@
+#!/usr/bin/env python3
+#
+#  index.py
+"""
+A persistent local index of repository metadata, backed by :mod:`sqlite3`.
+
+.. versionadded:: 0.9.0
+
+The index is populated from the GitHub API with :meth:`RepositoryIndex.sync`,
+which only fetches repositories updated since the previous sync,
+and can then be queried locally without making any further requests.
+
+.. code-block:: python
+
+	with RepositoryIndex("repos.db") as index:
+		index.sync(github, orgs=["sphinx-toolbox"])
+
+		for repo in index.repos(topic="sphinx", archived=False):
+			print(repo["full_name"])
+"""
+#
+#  Copyright © 2026 Dominic Davis-Foster <dominic@davis-foster.co.uk>
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+#  EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+#  MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+#  IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+#  DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+#  OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+#  OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+# stdlib
+import json
+import os
+import sqlite3
+import threading
+from types import TracebackType
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Tuple, Type, Union
+
+# this package
+from github3_utils.pagination import Paginator
+
+if TYPE_CHECKING:
+	# 3rd party
+	from github3 import GitHub
+	from github3.repos import ShortRepository
+
+__all__ = ("RepositoryIndex", )
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS repositories (
+	full_name TEXT PRIMARY KEY COLLATE NOCASE,
+	owner TEXT NOT NULL COLLATE NOCASE,
+	name TEXT NOT NULL,
+	language TEXT COLLATE NOCASE,
+	archived INTEGER NOT NULL DEFAULT 0,
+	pushed_at TEXT,
+	updated_at TEXT,
+	data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS topics (
+	full_name TEXT NOT NULL COLLATE NOCASE,
+	topic TEXT NOT NULL COLLATE NOCASE,
+	PRIMARY KEY (full_name, topic)
+);
+CREATE TABLE IF NOT EXISTS sync_state (
+	owner TEXT PRIMARY KEY COLLATE NOCASE,
+	updated_at TEXT
+);
+CREATE INDEX IF NOT EXISTS repositories_owner ON repositories (owner);
+CREATE INDEX IF NOT EXISTS repositories_language ON repositories (language);
+CREATE INDEX IF NOT EXISTS repositories_archived ON repositories (archived);
+CREATE INDEX IF NOT EXISTS topics_topic ON topics (topic);
+"""
+
+
+class RepositoryIndex:
+	"""
+	A local index of repository metadata, stored in an SQLite database.
+
+	:param filename: The database file. Use ``':memory:'`` for a temporary index.
+
+	The index can be used as a context manager, which closes the database on exit.
+	"""
+
+	def __init__(self, filename: Union[str, "os.PathLike[str]"] = ":memory:"):
+		self._lock = threading.RLock()
+		self._db = sqlite3.connect(os.fspath(filename), check_same_thread=False)
+		self._db.row_factory = sqlite3.Row
+		self._db.executescript(_SCHEMA)
+
+	def close(self) -> None:
+		"""
+		Close the underlying database.
+		"""
+
+		self._db.close()
+
+	def __enter__(self) -> "RepositoryIndex":
+		return self
+
+	def __exit__(
+			self,
+			exc_type: Optional[Type[BaseException]],
+			exc_val: Optional[BaseException],
+			exc_tb: Optional[TracebackType],
+			) -> None:
+		self.close()
+
+	def __len__(self) -> int:
+		with self._lock:
+			return self._db.execute("SELECT COUNT(*) FROM repositories").fetchone()[0]
+
+	def __contains__(self, full_name: object) -> bool:
+		with self._lock:
+			row = self._db.execute("SELECT 1 FROM repositories WHERE full_name = ?", (full_name, )).fetchone()
+
+		return row is not None
+
+	def get(self, full_name: str) -> Optional[Dict[str, Any]]:
+		"""
+		Returns the stored metadata for the given repository, or :py:obj:`None` if it is not in the index.
+
+		:param full_name: The full name of the repository, in the form ``<owner>/<name>``.
+		"""
+
+		with self._lock:
+			row = self._db.execute("SELECT data FROM repositories WHERE full_name = ?", (full_name, )).fetchone()
+
+		if row is None:
+			return None
+
+		return json.loads(row["data"])
+
+	def update(self, repos: Iterable[Union["ShortRepository", Dict[str, Any]]]) -> int:
+		"""
+		Add or update repositories in the index.
+
+		Repositories whose ``pushed_at`` and ``updated_at`` values are unchanged are not rewritten.
+
+		:param repos: Either :class:`~github3.repos.repo.ShortRepository` objects,
+			or the dictionaries returned by :func:`~.iter_installed_repos`.
+
+		:returns: The number of repositories which were added or changed.
+		"""
+
+		changed = 0
+
+		with self._lock, self._db:
+			for repo in repos:
+				if self._store(repo):
+					changed += 1
+
+		return changed
+
+	def sync(
+			self,
+			github: "GitHub",
+			users: Iterable[str] = (),
+			orgs: Iterable[str] = (),
+			) -> int:
+		"""
+		Update the index with the repositories belonging to all ``users`` and all ``orgs``.
+
+		Repositories are requested most recently updated first,
+		and listing stops at the first repository last updated before the newest one seen by the previous sync.
+		The first sync for an owner fetches all of their repositories.
+
+		Deleted repositories are not detected by an incremental sync;
+		use :meth:`~.RepositoryIndex.remove_owner` and sync again to rebuild the entries for an owner.
+
+		:param github:
+		:param users: An iterable of usernames to fetch the repositories for.
+		:param orgs: An iterable of organization names to fetch the repositories for.
+
+		:returns: The number of repositories which were added or changed.
+		"""
+
+		changed = 0
+
+		for owner_type, owners in (("users", users), ("orgs", orgs)):
+			for owner in owners:
+				changed += self._sync_owner(github, owner_type, owner)
+
+		return changed
+
+	def _sync_owner(self, github: "GitHub", owner_type: str, owner: str) -> int:
+		url = github._build_url(owner_type, owner, "repos")
+		params = {"type": "owner" if owner_type == "users" else "all", "sort": "updated", "direction": "desc"}
+		high_water_mark = self.last_updated(owner)
+		newest = high_water_mark
+		changed = 0
+
+		finished = False
+
+		# Incremental syncs usually stop within the first page, so don't request pages which won't be needed.
+		for page in Paginator(github, url, params, read_ahead=0).pages():
+			# Each page is fetched before taking the lock, so queries aren't held up by requests.
+			with self._lock, self._db:
+				for data in page:
+					updated_at = data.get("updated_at")
+
+					# Timestamps only have a resolution of one second, so repositories updated in the same second
+					# as the previous sync's newest may have been missed by it.
+					if high_water_mark is not None and updated_at is not None and updated_at < high_water_mark:
+						finished = True
+						break
+
+					if newest is None or (updated_at is not None and updated_at > newest):
+						newest = updated_at
+
+					if self._store(data):
+						changed += 1
+
+			if finished:
+				break
+
+		# The high-water mark is only moved once every page has been stored,
+		# so an interrupted sync is picked up again by the next one.
+		with self._lock, self._db:
+			self._db.execute(
+					"INSERT OR REPLACE INTO sync_state (owner, updated_at) VALUES (?, ?)",
+					(owner, newest),
+					)
+
+		return changed
+
+	def _store(self, repo: Union["ShortRepository", Dict[str, Any]]) -> bool:
+		data: Dict[str, Any] = repo if isinstance(repo, dict) else repo.as_dict()
+
+		full_name = data["full_name"]
+		pushed_at = data.get("pushed_at")
+		updated_at = data.get("updated_at")
+
+		row = self._db.execute(
+				"SELECT pushed_at, updated_at FROM repositories WHERE full_name = ?",
+				(full_name, ),
+				).fetchone()
+
+		if row is not None and (row["pushed_at"], row["updated_at"]) == (pushed_at, updated_at):
+			return False
+
+		self._db.execute(
+				"INSERT OR REPLACE INTO repositories "
+				"(full_name, owner, name, language, archived, pushed_at, updated_at, data) "
+				"VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+				(
+						full_name,
+						data["owner"]["login"],
+						data["name"],
+						data.get("language"),
+						int(bool(data.get("archived", False))),
+						pushed_at,
+						updated_at,
+						json.dumps(data),
+						),
+				)
+		self._db.execute("DELETE FROM topics WHERE full_name = ?", (full_name, ))
+		self._db.executemany(
+				"INSERT OR IGNORE INTO topics (full_name, topic) VALUES (?, ?)",
+				[(full_name, topic) for topic in data.get("topics", None) or ()],
+				)
+
+		return True
+
+	def last_updated(self, owner: str) -> Optional[str]:
+		"""
+		Returns the ``updated_at`` timestamp of the most recently updated repository
+		seen for ``owner`` by :meth:`~.RepositoryIndex.sync`,
+		or :py:obj:`None` if the owner has not been synced.
+
+		:param owner:
+		"""  # noqa: D400
+
+		with self._lock:
+			row = self._db.execute("SELECT updated_at FROM sync_state WHERE owner = ?", (owner, )).fetchone()
+
+		if row is None:
+			return None
+
+		return row["updated_at"]
+
+	def remove_owner(self, owner: str) -> None:
+		"""
+		Remove all repositories belonging to ``owner`` from the index,
+		so the next :meth:`~.RepositoryIndex.sync` fetches them afresh.
+
+		:param owner:
+		"""  # noqa: D400
+
+		with self._lock, self._db:
+			self._db.execute(
+					"DELETE FROM topics WHERE full_name IN (SELECT full_name FROM repositories WHERE owner = ?)",
+					(owner, ),
+					)
+			self._db.execute("DELETE FROM repositories WHERE owner = ?", (owner, ))
+			self._db.execute("DELETE FROM sync_state WHERE owner = ?", (owner, ))
+
+	def repos(
+			self,
+			owner: Optional[str] = None,
+			topic: Optional[str] = None,
+			language: Optional[str] = None,
+			archived: Optional[bool] = None,
+			) -> List[Dict[str, Any]]:
+		"""
+		Returns the stored metadata for repositories matching all of the given criteria,
+		ordered by full name.
+
+		Omit a criterion (or pass :py:obj:`None`) to not filter on it.
+
+		:param owner: The login of the user or organization which owns the repository.
+		:param topic: A topic the repository is tagged with.
+		:param language: The primary language of the repository.
+		:param archived: Whether the repository is archived.
+		"""  # noqa: D400
+
+		return [json.loads(row["data"]) for row in self._query("data", owner, topic, language, archived)]
+
+	def full_names(
+			self,
+			owner: Optional[str] = None,
+			topic: Optional[str] = None,
+			language: Optional[str] = None,
+			archived: Optional[bool] = None,
+			) -> List[str]:
+		"""
+		Returns the full names of repositories matching all of the given criteria,
+		ordered by full name.
+
+		This is faster than :meth:`~.RepositoryIndex.repos` as the stored metadata is not decoded.
+
+		:param owner: The login of the user or organization which owns the repository.
+		:param topic: A topic the repository is tagged with.
+		:param language: The primary language of the repository.
+		:param archived: Whether the repository is archived.
+		"""  # noqa: D400
+
+		return [row["full_name"] for row in self._query("full_name", owner, topic, language, archived)]
+
+	def _query(
+			self,
+			column: str,
+			owner: Optional[str],
+			topic: Optional[str],
+			language: Optional[str],
+			archived: Optional[bool],
+			) -> List[sqlite3.Row]:
+		clauses: List[str] = []
+		args: List[Any] = []
+
+		criteria: Tuple[Tuple[str, Any], ...] = (
+				("owner = ?", owner),
+				("language = ?", language),
+				("archived = ?", None if archived is None else int(archived)),
+				("full_name IN (SELECT full_name FROM topics WHERE topic = ?)", topic),
+				)
+
+		for clause, value in criteria:
+			if value is not None:
+				clauses.append(clause)
+				args.append(value)
+
+		sql = f"SELECT {column} FROM repositories"
+		if clauses:
+			sql += " WHERE " + " AND ".join(clauses)
+		sql += " ORDER BY full_name"
+
+		# Fetch every row while the lock is held, as the cursor shares the connection.
+		with self._lock:
+			return self._db.execute(sql, args).fetchall()
@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+#
+#  metrics.py
+"""
+Per-endpoint request metrics, exported in the Prometheus text format.
+
+.. versionadded:: 0.9.0
+
+.. code-block:: python
+
+	metrics = RequestMetrics()
+	metrics.install(github)
+
+	for repo in iter_repos(github, orgs=["sphinx-toolbox"]):
+		...
+
+	print(metrics.to_prometheus())
+
+Each metric is labelled with the normalised endpoint (e.g. ``/repos/{owner}/{repo}/pulls/{id}``)
+and the name of the ``github3_utils`` function which made the request.
+No work is done unless a :class:`~.RequestMetrics` object is installed on the session.
+"""
+#
+#  Copyright © 2026 Dominic Davis-Foster <dominic@davis-foster.co.uk>
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+#  EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+#  MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+#  IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+#  DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+#  OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+#  OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+# stdlib
+import bisect
+import re
+import threading
+from collections import defaultdict
+from typing import TYPE_CHECKING, Any, DefaultDict, Dict, List, Sequence, Tuple, Union
+from urllib.parse import urlsplit
+
+# this package
+from github3_utils._instrumentation import current_helper
+
+if TYPE_CHECKING:
+	# 3rd party
+	from github3 import GitHub
+	from requests import Response, Session
+
+__all__ = ("DEFAULT_BUCKETS", "RequestMetrics", "normalise_endpoint")
+
+#: The default upper bounds, in seconds, of the request latency histogram buckets.
+DEFAULT_BUCKETS: Tuple[float, ...] = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Segments which are followed by a parameter, and the name to give that parameter.
+_PARAMETERS = {
+		"users": "{username}",
+		"orgs": "{org}",
+		"branches": "{branch}",
+		"commits": "{ref}",
+		"labels": "{name}",
+		"secrets": "{secret_name}",
+		"installations": "{installation_id}",
+		}
+
+# Segments which look like parameters but are actually part of the endpoint.
+_LITERALS = {"public-key"}
+
+_sha_re = re.compile(r"^[0-9a-f]{40}$")
+
+
+def _get_session(github: Union["GitHub", "Session"]) -> "Session":
+	# 3rd party
+	from github3 import GitHub
+
+	return github.session if isinstance(github, GitHub) else github
+
+
+def normalise_endpoint(url: str) -> str:
+	"""
+	Convert a request URL into the template of the endpoint it belongs to.
+
+	For example ``https://api.github.com/repos/domdfcoding/github3-utils/pulls/10``
+	becomes ``/repos/{owner}/{repo}/pulls/{id}``.
+
+	:param url:
+	"""
+
+	path = urlsplit(url).path
+
+	if path.startswith("/api/v3/"):  # GitHub Enterprise
+		path = path[7:]
+
+	segments = [segment for segment in path.split('/') if segment]
+	template: List[str] = []
+
+	if len(segments) >= 3 and segments[0] == "repos":
+		template.extend(("repos", "{owner}", "{repo}"))
+		segments = segments[3:]
+
+	previous = ''
+	for segment in segments:
+		if previous in _PARAMETERS and segment not in _LITERALS:
+			template.append(_PARAMETERS[previous])
+		elif segment.isdigit():
+			template.append("{id}")
+		elif _sha_re.match(segment):
+			template.append("{sha}")
+		else:
+			template.append(segment)
+
+		previous = segment
+
+	return '/' + '/'.join(template)
+
+
+def _escape(value: str) -> str:
+	return value.replace('\\', r"\\").replace('"', r'\"').replace('\n', r"\n")
+
+
+def _format_labels(labels: Sequence[Tuple[str, str]]) -> str:
+	return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in labels) + '}'
+
+
+class _Histogram:
+
+	def __init__(self, buckets: Sequence[float]):
+		self.counts = [0] * (len(buckets) + 1)
+		self.sum = 0.0
+
+	def observe(self, buckets: Sequence[float], value: float) -> None:
+		self.counts[bisect.bisect_left(buckets, value)] += 1
+		self.sum += value
+
+
+class RequestMetrics:
+	"""
+	Records the requests made through one or more :class:`github3.github.GitHub` sessions.
+
+	:param buckets: The upper bounds, in seconds, of the request latency histogram buckets.
+
+	The following metrics are recorded:
+
+	* ``github3_utils_requests_total`` -- the number of requests, by method, endpoint, helper and status code.
+	* ``github3_utils_request_duration_seconds`` -- a histogram of request latency, by method, endpoint and helper.
+	* ``github3_utils_response_bytes_total`` -- the number of bytes received, by endpoint and helper.
+	* ``github3_utils_ratelimit_cost_total`` -- the number of requests counted against the rate limit,
+	  by rate limit resource, endpoint and helper. Conditional requests answered with ``304 Not Modified`` are free.
+	* ``github3_utils_ratelimit_remaining`` -- the number of requests remaining, by rate limit resource,
+	  as of the most recent response.
+	"""
+
+	def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+		self.buckets = tuple(sorted(buckets))
+		self._lock = threading.Lock()
+		self.reset()
+
+	def reset(self) -> None:
+		"""
+		Discard all recorded metrics.
+		"""
+
+		self._requests: DefaultDict[Tuple[str, str, str, str], int] = defaultdict(int)
+		self._durations: Dict[Tuple[str, str, str], _Histogram] = {}
+		self._bytes: DefaultDict[Tuple[str, str], int] = defaultdict(int)
+		self._cost: DefaultDict[Tuple[str, str, str], int] = defaultdict(int)
+		self._remaining: Dict[str, int] = {}
+
+	def install(self, github: Union["GitHub", "Session"]) -> None:
+		"""
+		Start recording requests made through the given client or session.
+
+		:param github:
+		"""
+
+		session = _get_session(github)
+		hooks = session.hooks["response"]
+		if self.record not in hooks:
+			hooks.append(self.record)
+
+	def uninstall(self, github: Union["GitHub", "Session"]) -> None:
+		"""
+		Stop recording requests made through the given client or session.
+
+		:param github:
+		"""
+
+		session = _get_session(github)
+		hooks = session.hooks["response"]
+		if self.record in hooks:
+			hooks.remove(self.record)
+
+	def record(self, response: "Response", *args: Any, **kwargs: Any) -> None:
+		"""
+		Record the given response.
+
+		This is installed as a :mod:`requests` response hook by :meth:`~.RequestMetrics.install`.
+
+		:param response:
+		"""
+
+		request = response.request
+		method = request.method or "GET"
+		endpoint = normalise_endpoint(request.url or response.url)
+		helper = current_helper() or ''
+
+		content_length = response.headers.get("Content-Length")
+		if content_length is not None:
+			size = int(content_length)
+		elif kwargs.get("stream"):
+			size = 0
+		else:
+			size = len(response.content or b'')
+
+		remaining = response.headers.get("X-RateLimit-Remaining")
+		resource = response.headers.get("X-RateLimit-Resource", "core")
+		elapsed = response.elapsed.total_seconds()
+
+		with self._lock:
+			self._requests[(method, endpoint, helper, str(response.status_code))] += 1
+
+			key = (method, endpoint, helper)
+			if key not in self._durations:
+				self._durations[key] = _Histogram(self.buckets)
+			self._durations[key].observe(self.buckets, elapsed)
+
+			self._bytes[(endpoint, helper)] += size
+
+			if remaining is not None:
+				self._remaining[resource] = int(remaining)
+				if response.status_code != 304:
+					self._cost[(resource, endpoint, helper)] += 1
+
+	def to_prometheus(self) -> str:
+		"""
+		Returns the recorded metrics in the Prometheus text exposition format.
+		"""
+
+		lines: List[str] = []
+
+		def header(name: str, type_: str, help_text: str) -> None:
+			lines.append(f"# HELP {name} {help_text}")
+			lines.append(f"# TYPE {name} {type_}")
+
+		with self._lock:
+			header("github3_utils_requests_total", "counter", "Requests made to the GitHub API.")
+			for (method, endpoint, helper, status), count in sorted(self._requests.items()):
+				labels = _format_labels([
+						("method", method),
+						("endpoint", endpoint),
+						("helper", helper),
+						("status", status),
+						])
+				lines.append(f"github3_utils_requests_total{labels} {count}")
+
+			header("github3_utils_request_duration_seconds", "histogram", "Latency of requests to the GitHub API.")
+			for (method, endpoint, helper), histogram in sorted(self._durations.items()):
+				base_labels = [("method", method), ("endpoint", endpoint), ("helper", helper)]
+				cumulative = 0
+
+				for bound, count in zip((*map(repr, self.buckets), "+Inf"), histogram.counts):
+					cumulative += count
+					labels = _format_labels([*base_labels, ("le", bound)])
+					lines.append(f"github3_utils_request_duration_seconds_bucket{labels} {cumulative}")
+
+				labels = _format_labels(base_labels)
+				lines.append(f"github3_utils_request_duration_seconds_sum{labels} {histogram.sum!r}")
+				lines.append(f"github3_utils_request_duration_seconds_count{labels} {cumulative}")
+
+			header("github3_utils_response_bytes_total", "counter", "Bytes received from the GitHub API.")
+			for (endpoint, helper), size in sorted(self._bytes.items()):
+				labels = _format_labels([("endpoint", endpoint), ("helper", helper)])
+				lines.append(f"github3_utils_response_bytes_total{labels} {size}")
+
+			header(
+					"github3_utils_ratelimit_cost_total",
+					"counter",
+					"Requests counted against the GitHub API rate limit.",
+					)
+			for (resource, endpoint, helper), cost in sorted(self._cost.items()):
+				labels = _format_labels([("resource", resource), ("endpoint", endpoint), ("helper", helper)])
+				lines.append(f"github3_utils_ratelimit_cost_total{labels} {cost}")
+
+			header(
+					"github3_utils_ratelimit_remaining",
+					"gauge",
+					"Requests remaining in the current GitHub API rate limit window.",
+					)
+			for resource, remaining in sorted(self._remaining.items()):
+				lines.append(
+						f"github3_utils_ratelimit_remaining{_format_labels([('resource', resource)])} {remaining}",
+						)
+
+		lines.append('')
+		return '\n'.join(lines)
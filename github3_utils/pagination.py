@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+#
+#  pagination.py
+"""
+Iterate over paginated GitHub API endpoints, fetching the next page while the current one is processed.
+
+.. versionadded:: 0.9.0
+
+.. code-block:: python
+
+	url = repo._build_url("actions", "secrets", base_url=repo._api)
+
+	for secret in Paginator(repo, url, items_key="secrets"):
+		...
+
+The URL of the next page is taken from the ``Link`` header of each response or,
+for endpoints which return an object with a ``total_count``, from the page number.
+Up to ``read_ahead`` pages are fetched in a background thread and held until the caller reaches them,
+so the number of pages held in memory at once is bounded.
+"""
+#
+#  Copyright © 2026 Dominic Davis-Foster <dominic@davis-foster.co.uk>
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+#  EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+#  MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+#  IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+#  DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+#  OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+#  OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+# stdlib
+import contextvars
+import queue
+import threading
+from typing import TYPE_CHECKING, Any, Callable, Dict, Generic, Iterator, List, Optional, Tuple, TypeVar, overload
+
+if TYPE_CHECKING:
+	# 3rd party
+	from github3.models import GitHubCore
+
+__all__ = ("DEFAULT_READ_AHEAD", "Paginator")
+
+_T = TypeVar("_T")
+
+#: The default number of pages to fetch ahead of the caller.
+DEFAULT_READ_AHEAD = 1
+
+# Marks the end of the pages on the queue.
+_END = object()
+
+_Page = Tuple[List[Dict[str, Any]], Optional[str], Optional[int]]
+
+
+class Paginator(Generic[_T]):
+	"""
+	Iterates over the items of a paginated endpoint.
+
+	:param core: The :mod:`github3` object (such as a client or repository) used to make requests.
+	:param url: The URL of the first page.
+	:param params: Query parameters for the first page.
+	:param cls: A :class:`github3.models.GitHubCore` subclass (or other callable) to construct each item with,
+		given the item's JSON and ``core``. If omitted the JSON dictionaries are returned.
+	:param items_key: For endpoints which return an object rather than a list,
+		the key of the list of items within the object.
+	:param headers: Additional headers for each request.
+	:param per_page: The number of items to request per page.
+		If :py:obj:`None` the server's default is used.
+	:param read_ahead: The maximum number of pages to fetch ahead of the caller.
+		If ``0`` each page is only requested once the caller has finished with the previous one.
+
+	Each iteration over the :class:`~.Paginator` starts again from the first page.
+	"""
+
+	@overload
+	def __init__(
+			self: "Paginator[Dict[str, Any]]",
+			core: "GitHubCore",
+			url: str,
+			params: Optional[Dict[str, Any]] = ...,
+			cls: None = ...,
+			*,
+			items_key: Optional[str] = ...,
+			headers: Optional[Dict[str, str]] = ...,
+			per_page: Optional[int] = ...,
+			read_ahead: int = ...,
+			) -> None: ...
+
+	@overload
+	def __init__(
+			self,
+			core: "GitHubCore",
+			url: str,
+			params: Optional[Dict[str, Any]] = ...,
+			cls: Callable[[Dict[str, Any], "GitHubCore"], _T] = ...,
+			*,
+			items_key: Optional[str] = ...,
+			headers: Optional[Dict[str, str]] = ...,
+			per_page: Optional[int] = ...,
+			read_ahead: int = ...,
+			) -> None: ...
+
+	def __init__(
+			self,
+			core: "GitHubCore",
+			url: str,
+			params: Optional[Dict[str, Any]] = None,
+			cls: Optional[Callable[[Dict[str, Any], "GitHubCore"], _T]] = None,
+			*,
+			items_key: Optional[str] = None,
+			headers: Optional[Dict[str, str]] = None,
+			per_page: Optional[int] = 100,
+			read_ahead: int = DEFAULT_READ_AHEAD,
+			):
+		self.core = core
+		self.url = url
+		self.params = dict(params or {})
+		self.cls = cls
+		self.items_key = items_key
+		self.headers = headers
+		self.read_ahead = read_ahead
+
+		if per_page is not None:
+			self.params.setdefault("per_page", per_page)
+
+		#: The number of pages fetched so far.
+		self.pages_fetched = 0
+
+	def _fetch(self, url: str, params: Optional[Dict[str, Any]]) -> _Page:
+		response = self.core._get(url, params=params, headers=self.headers)
+		json = self.core._json(response, 200, include_cache_info=False)
+		self.pages_fetched += 1
+
+		if self.items_key is None:
+			return json, response.links.get("next", {}).get("url"), None
+
+		return json[self.items_key], response.links.get("next", {}).get("url"), json.get("total_count")
+
+	def _pages(self) -> Iterator[List[Dict[str, Any]]]:
+		url: Optional[str] = self.url
+		params: Optional[Dict[str, Any]] = self.params
+		page = int(self.params.get("page", 1))
+		seen = 0
+
+		while url:
+			items, next_url, total_count = self._fetch(url, params)
+			seen += len(items)
+			page += 1
+
+			yield items
+
+			if next_url:
+				url, params = next_url, None
+			elif items and total_count is not None and seen < total_count:
+				# Some endpoints only give the total number of items.
+				url, params = self.url, {**self.params, "page": page}
+			else:
+				url = None
+
+	def _fetch_ahead(self, pages: "queue.Queue[Any]", slots: threading.Semaphore, stop: threading.Event) -> None:
+		try:
+			for items in self._pages():
+				pages.put(items)
+
+				# Wait until the caller has taken a page before fetching another.
+				slots.acquire()
+				if stop.is_set():
+					return
+		except BaseException as e:  # pylint: disable=broad-except
+			pages.put(e)
+		else:
+			pages.put(_END)
+
+	def _read_ahead(self) -> Iterator[List[Dict[str, Any]]]:
+		pages: "queue.Queue[Any]" = queue.Queue()
+		slots = threading.Semaphore(self.read_ahead - 1)
+		stop = threading.Event()
+
+		# Run in a copy of the current context, so requests are attributed to the calling helper.
+		context = contextvars.copy_context()
+		thread = threading.Thread(
+				target=context.run,
+				args=(self._fetch_ahead, pages, slots, stop),
+				name="github3-utils-paginator",
+				daemon=True,
+				)
+		thread.start()
+
+		try:
+			while True:
+				page = pages.get()
+
+				if page is _END:
+					return
+				elif isinstance(page, BaseException):
+					raise page
+
+				slots.release()
+				yield page
+
+		finally:
+			# Wake the thread if it is waiting, then wait for any request in progress.
+			stop.set()
+			slots.release()
+			thread.join()
+
+	def pages(self) -> Iterator[List[Dict[str, Any]]]:
+		"""
+		Iterate over the JSON items of each page in turn.
+
+		The first page is the one given by the ``page`` query parameter, if any.
+		"""
+
+		return self._pages() if self.read_ahead < 1 else self._read_ahead()
+
+	def __iter__(self) -> Iterator[_T]:
+		for items in self.pages():
+			if self.cls is None:
+				yield from items  # type: ignore[misc]
+			else:
+				for item in items:
+					yield self.cls(item, self.core)
@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+#
+#  profiling.py
+"""
+Opt-in profiling of ``github3_utils`` helper functions.
+
+.. versionadded:: 0.9.0
+
+.. code-block:: python
+
+	with Profiler(output=sys.stderr, stats_file="sweep.pstats"):
+		for repo in iter_repos(github, orgs=["sphinx-toolbox"]):
+			label_pr_failures(...)
+
+While a :class:`~.Profiler` is running, the time spent in each call to a helper function is split into:
+
+* ``network`` -- sending requests and reading the responses;
+* ``decode`` -- decoding the JSON of the responses;
+* ``construct`` -- creating :mod:`github3` objects (such as :class:`~github3.repos.repo.ShortRepository`
+  and :class:`~github3.checks.CheckRun`) from the JSON;
+* ``other`` -- everything else, including this package's own code.
+
+Time spent in a helper called by another helper is only counted for the inner helper.
+For helpers which return iterators the total also includes the time the caller spends between items,
+which is counted as ``other``. When a :mod:`cProfile` dump is requested only the thread which started
+the profiler is included in it.
+
+Profiling can also be enabled without changing any code by setting the ``GITHUB3_UTILS_PROFILE`` environment variable
+to ``1``. The summary is then written to standard error when the program exits, and if ``GITHUB3_UTILS_PROFILE_STATS``
+is set a :mod:`cProfile` dump is written to the file it names.
+"""
+#
+#  Copyright © 2026 Dominic Davis-Foster <dominic@davis-foster.co.uk>
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+#  EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+#  MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+#  IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+#  DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+#  OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+#  OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+# stdlib
+import atexit
+import functools
+import os
+import sys
+import threading
+import time
+from types import TracebackType
+from typing import IO, Any, Callable, Dict, List, Optional, Type, Union
+
+# 3rd party
+import attr
+from github3.models import GitHubCore
+from requests import Response, Session
+
+# this package
+from github3_utils._instrumentation import HelperCall, add_listener, current_call, remove_listener
+
+__all__ = ("HelperStats", "Profiler")
+
+#: The name the time spent outside of any helper function is recorded under.
+_NO_HELPER = "<no helper>"
+
+_COLUMNS = ("calls", "total", "network", "decode", "construct", "other")
+
+# The profiler currently running, if any. Only one may run at a time, as the timing wrappers are global.
+_active: Optional["Profiler"] = None
+_active_lock = threading.Lock()
+
+# The phase being timed in the current thread, so nested phases (such as an object
+# constructing the objects for its attributes) aren't counted twice.
+_local = threading.local()
+
+
+@attr.s(slots=True)
+class HelperStats:
+	"""
+	The time spent in calls to a helper function, in seconds.
+	"""
+
+	#: The name of the helper function.
+	name: str = attr.ib()
+
+	#: The number of calls.
+	calls: int = attr.ib(default=0)
+
+	#: The total time spent in the calls, including any helpers they called.
+	total: float = attr.ib(default=0.0)
+
+	#: The time spent sending requests and reading the responses.
+	network: float = attr.ib(default=0.0)
+
+	#: The time spent decoding JSON.
+	decode: float = attr.ib(default=0.0)
+
+	#: The time spent creating :mod:`github3` objects.
+	construct: float = attr.ib(default=0.0)
+
+	#: The time spent in other helpers called by this one.
+	children: float = attr.ib(default=0.0)
+
+	@property
+	def other(self) -> float:
+		"""
+		The time not accounted for by the other phases, or by other helpers.
+		"""
+
+		accounted = self.children + self.network + self.decode + self.construct
+		return max(self.total - accounted, 0.0)
+
+
+def _timed(phase: str, func: Callable) -> Callable:
+	# Wraps func to add the time taken to the given phase of the running profiler.
+
+	@functools.wraps(func)
+	def wrapper(*args, **kwargs) -> Any:
+		profiler = _active
+		if profiler is None or getattr(_local, "phase", None) is not None:
+			return func(*args, **kwargs)
+
+		_local.phase = phase
+		start = profiler.timer()
+
+		try:
+			return func(*args, **kwargs)
+		finally:
+			_local.phase = None
+			profiler._record(phase, profiler.timer() - start)
+
+	return wrapper
+
+
+# The methods which are timed, and the phase each is counted as.
+_PATCHES = (
+		(Session, "send", "network"),
+		(Response, "json", "decode"),
+		(GitHubCore, "__init__", "construct"),
+		)
+
+
+class Profiler:
+	"""
+	Times the phases of each call to a ``github3_utils`` helper function.
+
+	:param output: A file to write the summary table to once profiling stops.
+	:param stats_file: A file to write a :mod:`cProfile` dump to once profiling stops,
+		which can be read with :class:`pstats.Stats`.
+	:param timer: The function giving the current time in seconds.
+
+	Calls from every thread are timed.
+	"""
+
+	def __init__(
+			self,
+			*,
+			output: Optional[IO[str]] = None,
+			stats_file: Union[str, "os.PathLike[str]", None] = None,
+			timer: Callable[[], float] = time.perf_counter,
+			):
+		self.output = output
+		self.stats_file = None if stats_file is None else os.fspath(stats_file)
+		self.timer = timer
+
+		#: The statistics for each helper function, by name.
+		self.stats: Dict[str, HelperStats] = {}
+
+		self._lock = threading.Lock()
+		self._originals: List[Any] = []
+		self._profile: Optional[Any] = None
+
+	def start(self) -> None:
+		"""
+		Start profiling.
+
+		:raises: :exc:`RuntimeError` if another profiler is running.
+		"""
+
+		global _active
+
+		with _active_lock:
+			if _active is not None:
+				raise RuntimeError("Another profiler is already running.")
+
+			for cls, name, phase in _PATCHES:
+				original = cls.__dict__[name]
+				self._originals.append(original)
+				setattr(cls, name, _timed(phase, original))
+
+			_active = self
+
+		add_listener(self)
+
+		if self.stats_file is not None:
+			# stdlib
+			import cProfile
+
+			self._profile = cProfile.Profile()
+			self._profile.enable()
+
+	def stop(self) -> None:
+		"""
+		Stop profiling, and write the summary and :mod:`cProfile` dump if requested.
+		"""
+
+		global _active
+
+		if self._profile is not None:
+			self._profile.disable()
+			self._profile.dump_stats(self.stats_file)
+			self._profile = None
+
+		remove_listener(self)
+
+		with _active_lock:
+			if _active is not self:
+				return
+
+			for (cls, name, phase), original in zip(_PATCHES, self._originals):
+				setattr(cls, name, original)
+
+			self._originals.clear()
+			_active = None
+
+		if self.output is not None:
+			self.output.write(self.summary())
+			self.output.flush()
+
+	def _stats_for(self, name: str) -> HelperStats:
+		# The lock must be held.
+
+		if name not in self.stats:
+			self.stats[name] = HelperStats(name)
+		return self.stats[name]
+
+	def _record(self, phase: str, elapsed: float) -> None:
+		call = current_call()
+
+		with self._lock:
+			stats = self._stats_for(_NO_HELPER if call is None else call.name)
+			setattr(stats, phase, getattr(stats, phase) + elapsed)
+
+	def helper_started(self, call: HelperCall) -> None:  # noqa: D102
+		call.data[self] = self.timer()
+
+	def helper_finished(self, call: HelperCall, error: Optional[BaseException]) -> None:  # noqa: D102
+		start: Optional[float] = call.data.pop(self, None)
+		if start is None:
+			return
+
+		elapsed = self.timer() - start
+
+		with self._lock:
+			stats = self._stats_for(call.name)
+			stats.calls += 1
+			stats.total += elapsed
+
+			if call.parent is not None:
+				self._stats_for(call.parent.name).children += elapsed
+
+	def summary(self) -> str:
+		"""
+		Returns a table of the time spent in each helper function, slowest first.
+		"""
+
+		with self._lock:
+			rows = sorted(self.stats.values(), key=lambda stats: stats.total, reverse=True)
+
+		width = max([len("helper"), *(len(stats.name) for stats in rows)])
+		lines = [f"{'helper':<{width}}" + ''.join(f"{column:>11}" for column in _COLUMNS)]
+
+		for stats in rows:
+			times = (stats.total, stats.network, stats.decode, stats.construct, stats.other)
+			lines.append(f"{stats.name:<{width}}{stats.calls:>11}" + ''.join(f"{value:>11.3f}" for value in times))
+
+		return '\n'.join(lines) + '\n'
+
+	def __enter__(self) -> "Profiler":
+		self.start()
+		return self
+
+	def __exit__(
+			self,
+			exc_type: Optional[Type[BaseException]],
+			exc_val: Optional[BaseException],
+			exc_tb: Optional[TracebackType],
+			) -> None:
+		self.stop()
+
+
+def _start_from_environment() -> None:
+	# Called when github3_utils is imported with GITHUB3_UTILS_PROFILE set.
+
+	profiler = Profiler(output=sys.stderr, stats_file=os.environ.get("GITHUB3_UTILS_PROFILE_STATS") or None)
+	profiler.start()
+	atexit.register(profiler.stop)
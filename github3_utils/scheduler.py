@@ -0,0 +1,335 @@
+#!/usr/bin/env python3
+#
+#  scheduler.py
+"""
+Run jobs in priority order within the GitHub API rate limit.
+
+.. versionadded:: 0.9.0
+
+.. code-block:: python
+
+	github = GitHub(token=...)
+
+	with Scheduler(github, reserve=1000) as scheduler:
+		# Nightly sweep: only runs while more than 1000 requests remain.
+		for repo in iter_repos(github, orgs=["sphinx-toolbox"]):
+			scheduler.submit(sync_secrets, repo, priority=LOW)
+
+		# Webhook handler: runs ahead of the sweep, and may use the reserved requests.
+		future = scheduler.submit(label_pr_failures, pull, priority=HIGH)
+
+The remaining quota is read from the ``X-RateLimit-*`` headers of the client's responses.
+Jobs with a priority other than :data:`~.HIGH` are held once the quota falls to ``reserve``,
+and high priority jobs are held once it is used up. Held jobs start automatically once the limit resets.
+A job which fails with :exc:`~.RateLimitExceeded`, or with a :exc:`github3.exceptions.ForbiddenError`
+caused by the rate limit, is queued again to run after the reset.
+
+The quota is checked before each job starts, so each job should only make a few requests:
+for example one job per repository rather than one job for a whole sweep.
+"""
+#
+#  Copyright © 2026 Dominic Davis-Foster <dominic@davis-foster.co.uk>
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+#  EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+#  MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+#  IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+#  DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+#  OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+#  OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+# stdlib
+import contextvars
+import heapq
+import itertools
+import threading
+import time
+from concurrent.futures import Future
+from types import TracebackType
+from typing import TYPE_CHECKING, Any, Callable, List, Optional, Tuple, Type, TypeVar
+
+# 3rd party
+import attr
+from github3.exceptions import ForbiddenError
+
+# this package
+from github3_utils import RateLimitExceeded
+
+if TYPE_CHECKING:
+	# 3rd party
+	from github3 import GitHub
+	from requests import Response
+
+__all__ = ("HIGH", "LOW", "NORMAL", "Scheduler")
+
+_T = TypeVar("_T")
+
+#: The priority of interactive work, such as handling webhooks.
+#: High priority jobs may use the requests reserved by the :class:`~.Scheduler`.
+HIGH = 0
+
+#: The default priority.
+NORMAL = 10
+
+#: The priority of background work, such as nightly sweeps.
+LOW = 20
+
+
+@attr.s(slots=True, eq=False)
+class _Job:
+	func: Callable[[], Any] = attr.ib()
+	future: Future = attr.ib()
+	priority: int = attr.ib()
+
+	# The rate limit error from the last attempt, if the job has been parked.
+	error: Optional[BaseException] = attr.ib(default=None)
+
+
+class Scheduler:
+	"""
+	Runs jobs on a pool of worker threads, highest priority first,
+	keeping requests in reserve for high priority jobs.
+
+	:param github: A client whose responses give the remaining quota.
+		Other clients can be added with :meth:`~.Scheduler.watch`.
+	:param workers: The number of jobs to run at once.
+	:param reserve: The number of requests which only :data:`~.HIGH` priority jobs may use.
+	:param timer: The function giving the current time in seconds since the epoch.
+
+	Lower numbers are higher priorities. Jobs with the same priority run in the order they were submitted.
+	"""  # noqa: D400
+
+	def __init__(
+			self,
+			github: Optional["GitHub"] = None,
+			*,
+			workers: int = 4,
+			reserve: int = 500,
+			timer: Callable[[], float] = time.time,
+			):
+		self.reserve = reserve
+		self.timer = timer
+
+		self._queue: List[Tuple[int, int, _Job]] = []
+		self._counter = itertools.count()
+		self._condition = threading.Condition()
+		self._shutdown = False
+
+		# None until a response has been seen.
+		self._remaining: Optional[int] = None
+		self._reset = 0.0
+
+		if github is not None:
+			self.watch(github)
+
+		self._threads = [
+				threading.Thread(target=self._work, name=f"github3-utils-scheduler-{idx}", daemon=True)
+				for idx in range(workers)
+				]
+		for thread in self._threads:
+			thread.start()
+
+	@property
+	def remaining(self) -> Optional[int]:
+		"""
+		The number of requests believed to remain before the limit resets,
+		or :py:obj:`None` if unknown.
+		"""  # noqa: D400
+
+		with self._condition:
+			if self._remaining is not None and self._reset <= self.timer():
+				return None
+			return self._remaining
+
+	@property
+	def pending(self) -> int:
+		"""
+		The number of jobs waiting to start.
+		"""
+
+		with self._condition:
+			return len(self._queue)
+
+	def watch(self, github: "GitHub") -> None:
+		"""
+		Track the remaining quota from the responses to requests made by the given client.
+
+		:param github:
+		"""
+
+		github.session.hooks["response"].append(self._handle_response)
+
+	def _handle_response(self, response: "Response", **kwargs: Any) -> "Response":
+		remaining = response.headers.get("X-RateLimit-Remaining")
+		reset = response.headers.get("X-RateLimit-Reset")
+
+		# Other resources, such as search, have separate and much smaller limits.
+		if remaining is None or reset is None or response.headers.get("X-RateLimit-Resource", "core") != "core":
+			return response
+
+		self._update(int(remaining), float(reset))
+		return response
+
+	def _update(self, remaining: int, reset: float) -> None:
+		with self._condition:
+			if self._remaining is not None and self._reset == reset:
+				# Responses to concurrent requests can arrive out of order.
+				self._remaining = min(self._remaining, remaining)
+			else:
+				self._remaining, self._reset = remaining, reset
+
+			self._condition.notify_all()
+
+	def submit(self, func: Callable[..., _T], *args: Any, priority: int = NORMAL, **kwargs: Any) -> "Future[_T]":
+		"""
+		Queue ``func(*args, **kwargs)`` to run once a worker is free and the quota allows.
+
+		:param func:
+		:param args:
+		:param priority: The priority of the job. Lower numbers run first.
+		:param kwargs:
+
+		:returns: A future for the result of the job.
+		"""
+
+		with self._condition:
+			if self._shutdown:
+				raise RuntimeError("Cannot submit jobs after the scheduler has been shut down.")
+
+			# Run the job in the caller's context, so its requests are attributed to the caller's helper.
+			context = contextvars.copy_context()
+			job = _Job(lambda: context.run(func, *args, **kwargs), Future(), priority)
+			self._push(job)
+
+		return job.future
+
+	def _push(self, job: _Job) -> None:
+		heapq.heappush(self._queue, (job.priority, next(self._counter), job))
+		self._condition.notify()
+
+	def _allowed(self, priority: int) -> Optional[float]:
+		# Returns None if a job with the given priority may start now,
+		# otherwise the time until the limit resets.
+
+		now = self.timer()
+
+		if self._remaining is None or self._reset <= now:
+			return None
+
+		if self._remaining > (0 if priority <= HIGH else self.reserve):
+			return None
+
+		return self._reset - now
+
+	def _next(self) -> Optional[_Job]:
+		# Waits for the highest priority job which may start. Returns None once shut down and idle.
+
+		with self._condition:
+			while True:
+				if not self._queue:
+					if self._shutdown:
+						return None
+					self._condition.wait()
+					continue
+
+				wait = self._allowed(self._queue[0][0])
+				if wait is None:
+					return heapq.heappop(self._queue)[2]
+
+				# Jobs further down the queue have lower priorities, so are held too.
+				# Check again at least every second in case the clock changes.
+				self._condition.wait(timeout=min(wait, 1.0))
+
+	def _work(self) -> None:
+		while True:
+			job = self._next()
+			if job is None:
+				return
+
+			# Parked jobs are already marked as running.
+			if job.error is None and not job.future.set_running_or_notify_cancel():
+				continue
+
+			try:
+				result = job.func()
+			except RateLimitExceeded as e:
+				self._park(job, e, e.reset_time.timestamp())
+			except ForbiddenError as e:
+				reset = _rate_limit_reset(e)
+				if reset is None:
+					job.future.set_exception(e)
+				else:
+					self._park(job, e, reset)
+			except BaseException as e:  # pylint: disable=broad-except
+				job.future.set_exception(e)
+			else:
+				job.future.set_result(result)
+
+	def _park(self, job: _Job, error: BaseException, reset: float) -> None:
+		# The job hit the rate limit, so run it again once the limit resets.
+
+		with self._condition:
+			self._remaining = 0
+			self._reset = max(self._reset, reset)
+
+			# The future can't go back to pending, so the job is queued again with it still running.
+			job.error = error
+			self._push(job)
+
+	def shutdown(self, wait: bool = True, cancel_pending: bool = False) -> None:
+		"""
+		Stop accepting jobs, and stop the workers once the queued jobs have finished.
+
+		:param wait: Whether to wait for the queued jobs to finish.
+		:param cancel_pending: Whether to cancel the jobs which have not started.
+		"""
+
+		with self._condition:
+			self._shutdown = True
+
+			if cancel_pending:
+				for _, _, job in self._queue:
+					if job.error is None:
+						job.future.cancel()
+					else:
+						# Parked jobs can't be cancelled, so fail with the error they were parked for.
+						job.future.set_exception(job.error)
+				self._queue.clear()
+
+			self._condition.notify_all()
+
+		if wait:
+			for thread in self._threads:
+				thread.join()
+
+	def __enter__(self) -> "Scheduler":
+		return self
+
+	def __exit__(
+			self,
+			exc_type: Optional[Type[BaseException]],
+			exc_val: Optional[BaseException],
+			exc_tb: Optional[TracebackType],
+			) -> None:
+		self.shutdown()
+
+
+def _rate_limit_reset(error: ForbiddenError) -> Optional[float]:
+	# Returns the reset time if the error was caused by the rate limit.
+
+	headers = error.response.headers
+	if headers.get("X-RateLimit-Remaining") != '0' or "X-RateLimit-Reset" not in headers:
+		return None
+
+	return float(headers["X-RateLimit-Reset"])
@@ -28,15 +28,21 @@ Functions for setting and updating GitHub Actions secrets.
 
 # stdlib
 from base64 import b64encode
-from typing import List
+from typing import TYPE_CHECKING, List
 
 # 3rd party
-from apeye_core import URL
-from github3.repos import Repository
-from nacl import encoding, public
-from requests import Response
 from typing_extensions import TypedDict
 
+# this package
+from github3_utils._instrumentation import instrumented
+from github3_utils.pagination import Paginator
+
+if TYPE_CHECKING:
+	# 3rd party
+	from apeye_core import URL
+	from github3.repos import Repository
+	from requests import Response
+
 __all__ = (
 		"build_secrets_url",
 		"encrypt_secret",
@@ -47,7 +53,7 @@ __all__ = (
 		)
 
 
-def build_secrets_url(repo: Repository) -> URL:
+def build_secrets_url(repo: "Repository") -> "URL":
 	"""
 	Returns the URL via which secrets can be checked and set.
 
@@ -58,6 +64,9 @@ def build_secrets_url(repo: Repository) -> URL:
 	.. latex:clearpage::
 	"""
 
+	# 3rd party
+	from apeye_core import URL
+
 	return URL(repo._build_url("actions/secrets", base_url=repo._api))
 
 
@@ -73,7 +82,8 @@ class PublicKey(_PublicKey):
 	key_id: str
 
 
-def get_public_key(repo: Repository) -> "PublicKey":
+@instrumented
+def get_public_key(repo: "Repository") -> "PublicKey":
 	"""
 	Returns the public key used to encrypt secrets for the given repository.
 
@@ -86,7 +96,8 @@ def get_public_key(repo: Repository) -> "PublicKey":
 	return public_key
 
 
-def get_secrets(repo: Repository) -> List[str]:
+@instrumented
+def get_secrets(repo: "Repository") -> List[str]:
 	"""
 	Returns a list of secret names for the given repository.
 
@@ -94,9 +105,9 @@ def get_secrets(repo: Repository) -> List[str]:
 	"""
 
 	secrets_url = build_secrets_url(repo)
-	raw_secrets = repo._json(repo._get(str(secrets_url), headers=repo.PREVIEW_HEADERS), 200)
+	secrets = Paginator(repo, str(secrets_url), items_key="secrets", headers=repo.PREVIEW_HEADERS)
 
-	return [secret["name"] for secret in raw_secrets["secrets"]]
+	return [secret["name"] for secret in secrets]
 
 
 def encrypt_secret(public_key: str, secret_value: str) -> str:
@@ -113,18 +124,22 @@ def encrypt_secret(public_key: str, secret_value: str) -> str:
 		get_secrets(repo)['key']
 	"""
 
+	# 3rd party
+	from nacl import encoding, public
+
 	pubkey = public.PublicKey(public_key.encode("utf-8"), encoding.Base64Encoder())  # type: ignore[arg-type]
 	sealed_box = public.SealedBox(pubkey)
 	encrypted = sealed_box.encrypt(secret_value.encode("utf-8"))
 	return b64encode(encrypted).decode("utf-8")
 
 
+@instrumented
 def set_secret(
-		repo: Repository,
+		repo: "Repository",
 		secret_name: str,
 		value: str,
 		public_key: "PublicKey",
-		) -> Response:
+		) -> "Response":
 	"""
 	Set the value of the given secret.
 
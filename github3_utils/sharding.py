@@ -0,0 +1,497 @@
+#!/usr/bin/env python3
+#
+#  sharding.py
+"""
+Spread the work of a fleet scan across several processes, which share one rate limit budget.
+
+.. versionadded:: 0.9.0
+
+Threads suit waiting on the API, but the work done with each repository (handling the JSON, evaluating rules,
+comparing labels) is limited by the global interpreter lock. A :class:`~.ShardedExecutor` runs that work
+in a pool of processes, each with its own client.
+
+.. code-block:: python
+
+	def make_client() -> GitHub:
+		return GitHub(token=os.environ["GITHUB_TOKEN"])
+
+	def check(github: GitHub, full_name: str) -> List[str]:
+		...
+
+	coordinator = Coordinator("/tmp/fleet-budget.json")
+	repos = [repo.full_name for repo in iter_repos(GitHub(...), orgs=["sphinx-toolbox"], resolve=False)]
+
+	with ShardedExecutor(make_client, coordinator, processes=4) as executor:
+		for full_name, problems in zip(repos, executor.map(check, repos)):
+			...
+
+The processes share their view of the rate limit through the :class:`~.Coordinator`, a JSON file guarded by a lock.
+Each process leases requests from the remaining quota of its credentials in blocks, and each request
+takes one from its process's lease before it is sent, so several processes using the same token
+can't overrun its limit between them. The file is only read and written when a lease runs out or the limit resets.
+Once the quota is used up, requests fail with :exc:`~.RateLimitExceeded` without being sent.
+When the client is a :class:`~.ContextSwitcher` the installation access tokens are also shared,
+so each installation's token is only requested once, rather than once per process.
+
+The client factory, the function and the items must all be picklable,
+so use functions defined at the top level of a module, and pass repositories by name or as JSON dictionaries.
+"""
+#
+#  Copyright © 2026 Dominic Davis-Foster <dominic@davis-foster.co.uk>
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+#  EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+#  MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+#  IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+#  DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+#  OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+#  OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+# stdlib
+import datetime
+import functools
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from contextlib import contextmanager
+from types import TracebackType
+from typing import IO, Any, Callable, Dict, Iterable, Iterator, Optional, Type, TypeVar, Union
+
+# 3rd party
+import attr
+from github3 import GitHub
+from requests import PreparedRequest, Response
+from requests.adapters import BaseAdapter
+
+# this package
+from github3_utils import RateLimitExceeded
+from github3_utils.apps import ContextSwitcher
+
+if sys.platform == "win32":  # pragma: no cover (!Windows)
+	# stdlib
+	import msvcrt
+
+	def _lock(fp: IO) -> None:
+		fp.seek(0)
+		msvcrt.locking(fp.fileno(), msvcrt.LK_LOCK, 1)
+
+	def _unlock(fp: IO) -> None:
+		fp.seek(0)
+		msvcrt.locking(fp.fileno(), msvcrt.LK_UNLCK, 1)
+
+else:  # pragma: no cover (Windows)
+	# stdlib
+	import fcntl
+
+	def _lock(fp: IO) -> None:
+		fcntl.flock(fp.fileno(), fcntl.LOCK_EX)
+
+	def _unlock(fp: IO) -> None:
+		fcntl.flock(fp.fileno(), fcntl.LOCK_UN)
+
+
+__all__ = ("CoordinatedAdapter", "Coordinator", "ShardedExecutor")
+
+_T = TypeVar("_T")
+
+
+def _credentials_key(request: PreparedRequest) -> str:
+	# The budget file doesn't need the tokens themselves.
+	authorization = request.headers.get("Authorization", '')
+	return hashlib.sha256(authorization.encode("UTF-8")).hexdigest()
+
+
+@attr.s(slots=True)
+class _Lease:
+	# Requests taken from the shared quota by this process, and not yet sent.
+	remaining: int = attr.ib()
+	reset: float = attr.ib()
+
+	# The lowest remaining quota reported by responses since the lease was taken, if any.
+	observed: Optional[int] = attr.ib(default=None)
+
+
+class Coordinator:
+	"""
+	Shares the remaining rate limit quota of each set of credentials, and installation access tokens,
+	between processes through a file.
+
+	:param filename: The file to store the shared state in. It is created if it doesn't exist.
+	:param reserve: The number of requests in each quota which are left unused.
+	:param lease_size: The number of requests taken from the shared quota at a time.
+		Each process may leave up to this many requests unused when it finishes.
+	:param timer: The function giving the current time in seconds since the epoch.
+
+	The file contains the installation access tokens, so is only readable by the current user.
+
+	A :class:`~.Coordinator` can be pickled, and the copies share the same state.
+	Each copy takes its own leases.
+	"""  # noqa: D400
+
+	def __init__(
+			self,
+			filename: Union[str, "os.PathLike[str]"],
+			*,
+			reserve: int = 0,
+			lease_size: int = 20,
+			timer: Callable[[], float] = time.time,
+			):
+		if lease_size < 1:
+			raise ValueError("'lease_size' must be at least 1.")
+
+		self.filename = os.fspath(filename)
+		self.reserve = reserve
+		self.lease_size = lease_size
+		self.timer = timer
+
+		self._leases: Dict[str, _Lease] = {}
+		self._lock = threading.Lock()
+
+	def __getstate__(self) -> Dict[str, Any]:
+		# Leases belong to the process which took them.
+		return {
+				"filename": self.filename,
+				"reserve": self.reserve,
+				"lease_size": self.lease_size,
+				"timer": self.timer,
+				}
+
+	def __setstate__(self, state: Dict[str, Any]) -> None:
+		self.__init__(state.pop("filename"), **state)  # type: ignore[misc]
+
+	@contextmanager
+	def _state(self, write: bool = True) -> Iterator[Dict[str, Any]]:
+		# Holds the lock while the state is read, modified and written back.
+
+		with open(f"{self.filename}.lock", "a+", encoding="UTF-8") as lock_fp:
+			_lock(lock_fp)
+
+			try:
+				if os.path.isfile(self.filename):
+					with open(self.filename, encoding="UTF-8") as fp:
+						state = json.load(fp)
+				else:
+					state = {"quotas": {}, "tokens": {}}
+
+				yield state
+
+				if write:
+					self._write(state)
+
+			finally:
+				_unlock(lock_fp)
+
+	def _write(self, state: Dict[str, Any]) -> None:
+		now = self.timer()
+
+		# Forget limits which have reset and tokens which have expired, so the file doesn't grow.
+		state["quotas"] = {key: quota for key, quota in state["quotas"].items() if quota["reset"] > now}
+		state["tokens"] = {key: token for key, token in state["tokens"].items() if token["expires"] > now}
+
+		temporary_filename = f"{self.filename}.tmp"
+		fd = os.open(temporary_filename, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+		with open(fd, 'w', encoding="UTF-8") as fp:
+			json.dump(state, fp)
+
+		# Replace the file in one step, so it is never left half written.
+		os.replace(temporary_filename, self.filename)
+
+	def remaining(self, key: str) -> Optional[int]:
+		"""
+		The number of requests believed to remain for the given credentials before the limit resets,
+		or :py:obj:`None` if unknown.
+
+		:param key: The SHA-256 hash of the ``Authorization`` header sent with the credentials.
+		"""  # noqa: D400
+
+		with self._state(write=False) as state:
+			quota = state["quotas"].get(key)
+
+		if quota is None or quota["reset"] <= self.timer():
+			return None
+
+		return quota["remaining"]
+
+	def acquire(self, key: str) -> None:
+		"""
+		Take one request from the remaining quota of the given credentials.
+
+		Requests are taken from this process's lease, and a new lease is taken from the file when it runs out.
+
+		:param key: The SHA-256 hash of the ``Authorization`` header sent with the credentials.
+
+		:raises: :exc:`~.RateLimitExceeded` if no requests remain before the limit resets.
+		"""
+
+		with self._lock:
+			now = self.timer()
+			lease = self._leases.get(key)
+
+			if lease is not None and lease.reset > now and lease.remaining > 0:
+				lease.remaining -= 1
+				return
+
+			self._leases.pop(key, None)
+
+			with self._state() as state:
+				quota = state["quotas"].get(key)
+
+				if quota is None or quota["reset"] <= now:
+					# Requests are allowed until a response gives the limit.
+					return
+
+				if lease is not None and lease.observed is not None and lease.reset == quota["reset"]:
+					quota["remaining"] = min(quota["remaining"], lease.observed)
+
+				available = quota["remaining"] - self.reserve
+				if available <= 0:
+					raise RateLimitExceeded(datetime.datetime.fromtimestamp(quota["reset"]))
+
+				size = min(self.lease_size, available)
+				quota["remaining"] -= size
+
+			# This request is the first from the new lease.
+			self._leases[key] = _Lease(size - 1, quota["reset"])
+
+	def update(self, key: str, remaining: int, reset: float) -> None:
+		"""
+		Record the remaining quota given by a response.
+
+		While this process holds a lease for the same period the value is only noted,
+		and is written to the file when the next lease is taken.
+
+		:param key: The SHA-256 hash of the ``Authorization`` header sent with the credentials.
+		:param remaining: The value of the ``X-RateLimit-Remaining`` header.
+		:param reset: The value of the ``X-RateLimit-Reset`` header.
+		"""
+
+		with self._lock:
+			lease = self._leases.get(key)
+
+			if lease is not None and lease.reset == reset:
+				lease.observed = remaining if lease.observed is None else min(lease.observed, remaining)
+				return
+
+			# The limit has reset, so any lease is for the previous period.
+			self._leases.pop(key, None)
+
+			with self._state() as state:
+				quota = state["quotas"].get(key)
+
+				if quota is not None and quota["reset"] == reset:
+					# Responses to concurrent requests can arrive out of order,
+					# and the estimate already accounts for requests still in progress.
+					quota["remaining"] = min(quota["remaining"], remaining)
+				else:
+					state["quotas"][key] = {"remaining": remaining, "reset": reset}
+
+	def get_token(self, installation_id: int) -> Optional[Dict[str, str]]:
+		"""
+		Returns the access token for the given installation,
+		or :py:obj:`None` if there is none or it expires within a minute.
+
+		:param installation_id:
+
+		:returns: A dictionary with the keys ``'token'`` and ``'expires_at'``, as returned by the API.
+		"""  # noqa: D400
+
+		with self._state(write=False) as state:
+			token = state["tokens"].get(str(installation_id))
+
+		if token is None or token["expires"] - 60 <= self.timer():
+			return None
+
+		return {"token": token["token"], "expires_at": token["expires_at"]}
+
+	def set_token(self, installation_id: int, token: str, expires_at: str) -> None:
+		"""
+		Store the access token for the given installation.
+
+		:param installation_id:
+		:param token:
+		:param expires_at: The time the token expires, as returned by the API.
+		"""
+
+		expires = datetime.datetime.strptime(expires_at, "%Y-%m-%dT%H:%M:%SZ")
+		expires = expires.replace(tzinfo=datetime.timezone.utc)
+
+		with self._state() as state:
+			state["tokens"][str(installation_id)] = {
+					"token": token,
+					"expires_at": expires_at,
+					"expires": expires.timestamp(),
+					}
+
+	def install(self, github: GitHub) -> None:
+		"""
+		Take the requests made by the given client from the shared quota.
+
+		Clients which share connection pools, such as those created by :class:`~.ContextSwitcher`,
+		also share the quota once this is installed on the original client.
+
+		:param github:
+		"""
+
+		for prefix, adapter in list(github.session.adapters.items()):
+			if not isinstance(adapter, CoordinatedAdapter):
+				github.session.mount(prefix, CoordinatedAdapter(adapter, self))
+
+
+class CoordinatedAdapter(BaseAdapter):
+	"""
+	A :mod:`requests` transport adapter which takes each request from the quota shared through a :class:`~.Coordinator`.
+
+	:param adapter: The adapter which sends the requests.
+	:param coordinator:
+	"""
+
+	def __init__(self, adapter: BaseAdapter, coordinator: Coordinator):
+		super().__init__()
+		self.adapter = adapter
+		self.coordinator = coordinator
+
+	def send(self, request: PreparedRequest, **kwargs: Any) -> Response:  # type: ignore[override]
+		"""
+		Send the request, once there is quota for it.
+
+		:param request:
+		:param kwargs: Passed to the underlying adapter.
+
+		:raises: :exc:`~.RateLimitExceeded` if the quota for the request's credentials is used up.
+		"""
+
+		key = _credentials_key(request)
+		self.coordinator.acquire(key)
+
+		response = self.adapter.send(request, **kwargs)
+
+		remaining = response.headers.get("X-RateLimit-Remaining")
+		reset = response.headers.get("X-RateLimit-Reset")
+
+		# Other resources, such as search, have separate and much smaller limits.
+		if remaining is not None and reset is not None and response.headers.get(
+				"X-RateLimit-Resource",
+				"core",
+				) == "core":
+			self.coordinator.update(key, int(remaining), float(reset))
+
+		# Requests resent from the response's connection (e.g. by TokenPool) also pass through this adapter.
+		response.connection = self  # type: ignore[assignment]
+		return response
+
+	def close(self) -> None:
+		"""
+		Close the underlying adapter.
+		"""
+
+		self.adapter.close()
+
+
+# The client of the current worker process.
+_worker_client: Any = None
+
+
+def _init_worker(factory: Callable[[], Union[GitHub, ContextSwitcher]], coordinator: Coordinator) -> None:
+	global _worker_client
+
+	client = factory()
+
+	if isinstance(client, ContextSwitcher):
+		coordinator.install(client.client)
+		client.token_cache = coordinator
+	else:
+		coordinator.install(client)
+
+	_worker_client = client
+
+
+def _call(func: Callable[[Any, Any], _T], item: Any) -> _T:
+	return func(_worker_client, item)
+
+
+class ShardedExecutor:
+	"""
+	Runs ``func(client, item)`` for many items in a pool of processes, which share one rate limit budget.
+
+	:param factory: Called in each process to create the client passed to the function,
+		either a :class:`github3.github.GitHub` client or a :class:`~.ContextSwitcher`.
+	:param coordinator: Shares the rate limit quota and installation access tokens between the processes.
+	:param processes: The number of processes. Defaults to the number of processors.
+	:param mp_context: The :mod:`multiprocessing` context used to start the processes.
+	"""
+
+	def __init__(
+			self,
+			factory: Callable[[], Union[GitHub, ContextSwitcher]],
+			coordinator: Coordinator,
+			*,
+			processes: Optional[int] = None,
+			mp_context: Optional[Any] = None,
+			):
+		self.coordinator = coordinator
+		self._pool = ProcessPoolExecutor(
+				processes,
+				mp_context=mp_context,
+				initializer=_init_worker,
+				initargs=(factory, coordinator),
+				)
+
+	def submit(self, func: Callable[[Any, Any], _T], item: Any) -> "Future[_T]":
+		"""
+		Queue ``func(client, item)`` to run in one of the processes.
+
+		:param func:
+		:param item:
+
+		:returns: A future for the result.
+		"""
+
+		return self._pool.submit(_call, func, item)
+
+	def map(self, func: Callable[[Any, Any], _T], items: Iterable[Any], chunksize: int = 10) -> Iterator[_T]:
+		"""
+		Run ``func(client, item)`` for each item, with the items split into shards across the processes.
+
+		:param func:
+		:param items:
+		:param chunksize: The number of items sent to a process at once.
+
+		:returns: An iterator over the results, in the same order as the items.
+		"""
+
+		return self._pool.map(functools.partial(_call, func), items, chunksize=chunksize)
+
+	def shutdown(self, wait: bool = True) -> None:
+		"""
+		Stop accepting work, and stop the processes once the queued work has finished.
+
+		:param wait: Whether to wait for the queued work to finish.
+		"""
+
+		self._pool.shutdown(wait=wait)
+
+	def __enter__(self) -> "ShardedExecutor":
+		return self
+
+	def __exit__(
+			self,
+			exc_type: Optional[Type[BaseException]],
+			exc_val: Optional[BaseException],
+			exc_tb: Optional[TracebackType],
+			) -> None:
+		self.shutdown()
@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+#
+#  single_flight.py
+"""
+Share one request between concurrent callers asking for the same resource.
+
+.. versionadded:: 0.9.0
+
+When many workers request the same repository, public key or pull request at the same moment,
+only the first ``GET`` request is sent. The others wait for it and receive a copy of its response.
+
+.. code-block:: python
+
+	github = GitHub(token=...)
+	SingleFlight().install(github)
+
+	with ThreadPoolExecutor(8) as executor:
+		executor.map(label_pr_failures, pulls)
+
+Requests are only shared if they are made with the same credentials and ``Accept`` header.
+Requests authenticated by the same :class:`~.TokenPool` count as having the same credentials,
+whichever of its tokens they were given.
+Nothing is cached: once the response has been received the next request is sent as normal.
+
+Code using :mod:`asyncio` typically calls the helpers in this package via :func:`asyncio.to_thread`
+or :meth:`asyncio.loop.run_in_executor`, and those requests are shared in the same way.
+Coroutines can also be shared directly with :meth:`SingleFlight.do_async`.
+"""
+#
+#  Copyright © 2026 Dominic Davis-Foster <dominic@davis-foster.co.uk>
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+#  EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+#  MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+#  IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+#  DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+#  OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+#  OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+# stdlib
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple, TypeVar, Union
+
+# 3rd party
+from github3 import GitHub
+from requests import PreparedRequest, Response
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+
+# this package
+from github3_utils.token_pool import _pool_for
+
+__all__ = ("SingleFlight", "SingleFlightAdapter")
+
+_T = TypeVar("_T")
+
+
+class _Call:
+	# A call in progress, and its outcome once finished.
+
+	def __init__(self, done: Union[threading.Event, asyncio.Event]):
+		self.done = done
+		self.result: Any = None
+		self.error: Optional[BaseException] = None
+
+	def outcome(self) -> Any:
+		if self.error is not None:
+			raise self.error
+		return self.result
+
+
+class SingleFlight:
+	"""
+	Ensures only one call for a given key is in progress at once.
+
+	Callers which arrive while a call with the same key is in progress wait for it to finish
+	and receive its result, or its exception.
+
+	A :class:`~.SingleFlight` may be shared between threads and between event loops.
+	"""
+
+	def __init__(self) -> None:
+		self._calls: Dict[Hashable, _Call] = {}
+		self._async_calls: Dict[Tuple[int, Hashable], _Call] = {}
+		self._lock = threading.Lock()
+
+		#: The number of callers which received the result of another caller's call.
+		self.shared = 0
+
+	def do(self, key: Hashable, func: Callable[[], _T]) -> Tuple[_T, bool]:
+		"""
+		Call ``func``, unless a call with the same ``key`` is already in progress in another thread.
+
+		:param key:
+		:param func:
+
+		:returns: The result, and whether it came from another thread's call.
+		"""
+
+		with self._lock:
+			call = self._calls.get(key)
+			if call is not None:
+				self.shared += 1
+				leader = False
+			else:
+				call = self._calls[key] = _Call(threading.Event())
+				leader = True
+
+		if not leader:
+			call.done.wait()
+			return call.outcome(), True
+
+		try:
+			call.result = func()
+			return call.result, False
+		except BaseException as e:
+			call.error = e
+			raise
+		finally:
+			with self._lock:
+				del self._calls[key]
+			call.done.set()
+
+	async def do_async(self, key: Hashable, func: Callable[[], Awaitable[_T]]) -> Tuple[_T, bool]:
+		"""
+		Await ``func()``, unless a call with the same ``key`` is already in progress in the running event loop.
+
+		:param key:
+		:param func:
+
+		:returns: The result, and whether it came from another task's call.
+		"""
+
+		# Events belong to a single loop, so calls are only shared within a loop.
+		loop_key = (id(asyncio.get_running_loop()), key)
+
+		with self._lock:
+			call = self._async_calls.get(loop_key)
+			if call is not None:
+				self.shared += 1
+				leader = False
+			else:
+				call = self._async_calls[loop_key] = _Call(asyncio.Event())
+				leader = True
+
+		if not leader:
+			await call.done.wait()  # type: ignore[misc]
+			return call.outcome(), True
+
+		try:
+			call.result = await func()
+			return call.result, False
+		except BaseException as e:
+			call.error = e
+			raise
+		finally:
+			with self._lock:
+				del self._async_calls[loop_key]
+			call.done.set()
+
+	def install(self, github: GitHub) -> None:
+		"""
+		Share identical concurrent ``GET`` requests made by the given client.
+
+		Clients which share connection pools, such as those created by :class:`~.ContextSwitcher`,
+		also share requests once this is installed on the original client.
+
+		:param github:
+		"""
+
+		for prefix, adapter in list(github.session.adapters.items()):
+			if not isinstance(adapter, SingleFlightAdapter):
+				github.session.mount(prefix, SingleFlightAdapter(adapter, self))
+
+
+def _copy_response(response: Response, request: PreparedRequest) -> Response:
+	copy = Response()
+	copy.__setstate__(response.__getstate__())  # type: ignore[attr-defined]
+	copy.headers = CaseInsensitiveDict(response.headers)
+	copy.request = request
+	copy.connection = response.connection
+
+	# TokenPool updates the quota of the token the response was actually received for.
+	copy._sent_request = response.request  # type: ignore[attr-defined]
+	return copy
+
+
+class SingleFlightAdapter(BaseAdapter):
+	"""
+	A :mod:`requests` transport adapter which shares identical concurrent ``GET`` requests.
+
+	:param adapter: The adapter which sends the requests.
+	:param single_flight: The :class:`~.SingleFlight` used to share the requests.
+	"""
+
+	def __init__(self, adapter: BaseAdapter, single_flight: SingleFlight):
+		super().__init__()
+		self.adapter = adapter
+		self.single_flight = single_flight
+
+	def send(  # type: ignore[override]
+			self,
+			request: PreparedRequest,
+			stream: bool = False,
+			**kwargs: Any,
+			) -> Response:
+		"""
+		Send the request, or wait for an identical request already in progress.
+
+		:param request:
+		:param stream: Streamed requests are never shared, as their content can only be read once.
+		:param kwargs: Passed to the underlying adapter.
+		"""
+
+		# Requests resent from the response's connection (e.g. by TokenPool) also pass through this adapter.
+		if request.method != "GET" or request.body is not None or stream:
+			response = self.adapter.send(request, stream=stream, **kwargs)
+			response.connection = self  # type: ignore[assignment]
+			return response
+
+		# A TokenPool gives concurrent requests different tokens, so requests it authenticated
+		# are shared with any others it authenticated rather than only those with the same token.
+		pool = _pool_for(request)
+
+		key = (
+				request.url,
+				request.headers.get("Authorization") if pool is None else pool,
+				request.headers.get("Accept"),
+				)
+
+		def send() -> Response:
+			response = self.adapter.send(request, stream=False, **kwargs)
+			response.content  # pylint: disable=pointless-statement
+			response.connection = self  # type: ignore[assignment]
+			return response
+
+		response, shared = self.single_flight.do(key, send)
+
+		if shared:
+			return _copy_response(response, request)
+
+		return response
+
+	def close(self) -> None:
+		"""
+		Close the underlying adapter.
+		"""
+
+		self.adapter.close()
@@ -19,6 +19,16 @@ To use this module you need to add, at a minimum, the following to your ``confte
 
 	with Betamax.configure() as config:
 		config.cassette_library_dir = "<path to cassettes directory>"
+
+.. versionchanged:: 0.9.0
+
+	Parsed cassettes are cached for the duration of the test session,
+	so tests sharing a cassette (e.g. via :fixture:`module_cassette`) only parse it once.
+	The cache is keyed by each cassette's path, modification time and size, so an edited cassette is parsed again.
+	Betamax still reads each cassette in full when it is first used, and cassettes which aren't used are never read.
+	Cassettes can also be stored in the more compact :mod:`msgpack` format (see :func:`~.convert_to_msgpack`),
+	which requires the ``msgpack`` extra to be installed,
+	and :func:`~.compact_cassette` can be used to shrink existing cassettes.
 """
 #
 #  Copyright © 2020 Dominic Davis-Foster <dominic@davis-foster.co.uk>
@@ -43,15 +53,517 @@ To use this module you need to add, at a minimum, the following to your ``confte
 #
 
 # stdlib
-from typing import Iterator
+import base64
+import fnmatch
+import gzip
+import hashlib
+import io
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple, Union
 
 # 3rd party
 import pytest  # nodep
 from _pytest.fixtures import FixtureRequest  # nodep
 from betamax import Betamax  # type: ignore[import-untyped]  # nodep
+from betamax.serializers import BaseSerializer, JSONSerializer  # type: ignore[import-untyped]  # nodep
 from github3 import GitHub
 
-__all__ = ("cassette", "github_client", "module_cassette")
+# this package
+from github3_utils.fake_github import FakeGitHub
+
+__all__ = (
+		"CASSETTE_CACHE_SIZE",
+		"CachedJSONSerializer",
+		"CompactionResult",
+		"MsgpackSerializer",
+		"cassette",
+		"clear_cassette_cache",
+		"compact_cassette",
+		"convert_to_msgpack",
+		"fake_github",
+		"fake_github_client",
+		"github_client",
+		"module_cassette",
+		)
+
+#: The maximum number of parsed cassettes to keep in memory.
+CASSETTE_CACHE_SIZE = 128
+
+# Used by compacted cassettes to store bodies which occur more than once.
+_BODIES_KEY = "github3_utils_bodies"
+_BODY_REF_KEY = "github3_utils_body"
+
+# Parsed cassettes, keyed by the cassette's path, modification time and size.
+_cassette_cache: "OrderedDict[Tuple[str, int, int], Dict[str, Any]]" = OrderedDict()
+_cassette_cache_lock = threading.Lock()
+
+# Betamax gives serializers the content of a cassette but not its path, so the path is noted
+# when Betamax asks the serializer for it, just before reading the cassette in the same thread.
+_cassette_path = threading.local()
+
+
+def _note_path(path: str) -> str:
+	_cassette_path.value = path
+	return path
+
+
+def clear_cassette_cache() -> None:
+	"""
+	Discard all cached parsed cassettes.
+
+	.. versionadded:: 0.9.0
+	"""
+
+	with _cassette_cache_lock:
+		_cassette_cache.clear()
+
+
+def _resolve_bodies(data: Dict[str, Any]) -> Dict[str, Any]:
+	# Replace references to deduplicated bodies (see compact_cassette) with the bodies themselves.
+	bodies = data.pop(_BODIES_KEY, None)
+	if not bodies:
+		return data
+
+	for interaction in data.get("http_interactions", []):
+		for key in ("request", "response"):
+			body = interaction.get(key, {}).get("body")
+			if isinstance(body, dict) and _BODY_REF_KEY in body:
+				interaction[key]["body"] = bodies[body[_BODY_REF_KEY]]
+
+	return data
+
+
+def _copy_cassette(data: Dict[str, Any]) -> Dict[str, Any]:
+	# Betamax modifies the request and response dictionaries in place (e.g. when applying placeholders),
+	# so each cassette gets its own copy of them. The (potentially large) body strings are shared.
+	interactions = []
+
+	for interaction in data.get("http_interactions", []):
+		copied = dict(interaction)
+
+		for key in ("request", "response"):
+			if key in interaction:
+				section = copied[key] = dict(interaction[key])
+				section["headers"] = dict(section.get("headers", {}))
+				if isinstance(section.get("body"), dict):
+					section["body"] = dict(section["body"])
+
+		interactions.append(copied)
+
+	return {**data, "http_interactions": interactions}
+
+
+def _parse(cassette_data: Union[str, bytes], parser: Any) -> Dict[str, Any]:
+	try:
+		return _resolve_bodies(parser(cassette_data))
+	except ValueError:
+		return {}
+
+
+def _load_cached(cassette_data: Union[str, bytes], parser: Any) -> Dict[str, Any]:
+	path: Optional[str] = getattr(_cassette_path, "value", None)
+	_cassette_path.value = None
+
+	if not cassette_data:
+		return {}
+
+	if path is None:
+		# Not read by Betamax (e.g. by compact_cassette), so not cached.
+		return _parse(cassette_data, parser)
+
+	stat = os.stat(path)
+	key = (os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+
+	with _cassette_cache_lock:
+		data = _cassette_cache.get(key)
+		if data is not None:
+			_cassette_cache.move_to_end(key)
+
+	if data is None:
+		data = _parse(cassette_data, parser)
+
+		with _cassette_cache_lock:
+			_cassette_cache[key] = data
+			while len(_cassette_cache) > CASSETTE_CACHE_SIZE:
+				_cassette_cache.popitem(last=False)
+
+	return _copy_cassette(data)
+
+
+class CachedJSONSerializer(JSONSerializer):
+	"""
+	Betamax serializer for the standard JSON cassette format,
+	which only parses each cassette once per test session.
+
+	.. versionadded:: 0.9.0
+	"""  # noqa: D400
+
+	name = "github3_utils_json"
+
+	@staticmethod
+	def generate_cassette_name(cassette_library_dir: str, cassette_name: str) -> str:  # noqa: D102
+		return _note_path(JSONSerializer.generate_cassette_name(cassette_library_dir, cassette_name))
+
+	def deserialize(self, cassette_data: str) -> Dict[str, Any]:  # noqa: D102
+		return _load_cached(cassette_data, json.loads)
+
+
+def _import_msgpack() -> Any:
+	try:
+		# 3rd party
+		import msgpack  # nodep
+	except ImportError:  # pragma: no cover
+		raise ImportError(
+				"Msgpack cassettes require the 'msgpack' package. "
+				"Install it with 'pip install github3-utils[msgpack]'.",
+				) from None
+
+	return msgpack
+
+
+def _msgpack_filename(cassette_library_dir: str, cassette_name: str) -> str:
+	return os.path.join(cassette_library_dir, f"{cassette_name}.msgpack")
+
+
+class MsgpackSerializer(BaseSerializer):
+	"""
+	Betamax serializer for cassettes stored in the :mod:`msgpack` format, with the ``.msgpack`` extension.
+
+	These are smaller and faster to load than JSON cassettes.
+	Like :class:`~.CachedJSONSerializer` each cassette is only parsed once per test session.
+
+	.. versionadded:: 0.9.0
+	"""
+
+	name = "msgpack"
+	stored_as_binary = True
+
+	@staticmethod
+	def generate_cassette_name(cassette_library_dir: str, cassette_name: str) -> str:  # noqa: D102
+		return _note_path(_msgpack_filename(cassette_library_dir, cassette_name))
+
+	def serialize(self, cassette_data: Dict[str, Any]) -> bytes:  # noqa: D102
+		return _import_msgpack().packb(cassette_data, use_bin_type=True)
+
+	def deserialize(self, cassette_data: bytes) -> Dict[str, Any]:  # noqa: D102
+		return _load_cached(cassette_data, lambda data: _import_msgpack().unpackb(data, raw=False))
+
+
+Betamax.register_serializer(CachedJSONSerializer)
+Betamax.register_serializer(MsgpackSerializer)
+
+
+def convert_to_msgpack(filename: Union[str, "os.PathLike[str]"], remove: bool = False) -> str:
+	"""
+	Convert a JSON cassette to the :mod:`msgpack` format, returning the filename of the new cassette.
+
+	The new cassette is written alongside the original,
+	and is used in preference to it by the :fixture:`cassette` and :fixture:`module_cassette` fixtures.
+
+	.. versionadded:: 0.9.0
+
+	:param filename: The filename of the JSON cassette.
+	:param remove: Whether to remove the JSON cassette afterwards.
+	"""
+
+	filename = os.fspath(filename)
+
+	with open(filename, encoding="UTF-8") as fp:
+		data = json.load(fp)
+
+	root, _ = os.path.splitext(filename)
+	new_filename = f"{root}.msgpack"
+
+	with open(new_filename, "wb") as fp:
+		fp.write(MsgpackSerializer().serialize(data))
+
+	if remove:
+		os.unlink(filename)
+
+	return new_filename
+
+
+# Headers which affect how github3.py and github3_utils handle a response. All others are removed.
+_REPLAY_RESPONSE_HEADERS = frozenset({
+		"content-encoding",
+		"content-type",
+		"etag",
+		"last-modified",
+		"link",
+		"location",
+		"retry-after",
+		"x-ratelimit-limit",
+		"x-ratelimit-remaining",
+		"x-ratelimit-reset",
+		"x-ratelimit-resource",
+		"x-ratelimit-used",
+		})
+
+_REPLAY_REQUEST_HEADERS = frozenset({"accept", "content-type"})
+
+
+class CompactionResult(NamedTuple):
+	"""
+	Represents the outcome of :func:`~.compact_cassette`.
+
+	.. versionadded:: 0.9.0
+	"""
+
+	#: The size of the cassette before compaction, in bytes.
+	original_size: int
+
+	#: The size of the cassette after compaction, in bytes.
+	compacted_size: int
+
+	#: The number of response bodies which were replaced with a reference to an identical body.
+	duplicate_bodies: int
+
+
+def _header(headers: Dict[str, Any], name: str) -> Optional[str]:
+	for key, value in headers.items():
+		if key.lower() == name:
+			return value[0] if isinstance(value, list) and value else value
+	return None
+
+
+def _decode_body(body: Dict[str, Any], headers: Dict[str, Any]) -> bytes:
+	if "base64_string" in body:
+		raw = base64.b64decode(body["base64_string"])
+	else:
+		raw = body.get("string", '').encode(body.get("encoding") or "UTF-8")
+
+	if _header(headers, "content-encoding") == "gzip":
+		raw = gzip.decompress(raw)
+
+	return raw
+
+
+def _gzip_base64(raw: bytes) -> str:
+	buf = io.BytesIO()
+
+	# mtime is fixed so compacting the same cassette twice gives the same output.
+	with gzip.GzipFile(fileobj=buf, mode="wb", mtime=0) as fp:
+		fp.write(raw)
+
+	return base64.b64encode(buf.getvalue()).decode("ASCII")
+
+
+def _drop_keys(obj: Any, patterns: Tuple[str, ...]) -> Any:
+	if isinstance(obj, dict):
+		return {
+				key: _drop_keys(value, patterns)
+				for key,
+				value in obj.items()
+				if not any(fnmatch.fnmatchcase(key, pattern) for pattern in patterns)
+				}
+	elif isinstance(obj, list):
+		return [_drop_keys(value, patterns) for value in obj]
+	else:
+		return obj
+
+
+def _trimmed_json(raw: bytes, patterns: Tuple[str, ...]) -> Optional[Any]:
+	try:
+		return _drop_keys(json.loads(raw), patterns)
+	except ValueError:
+		return None
+
+
+def _replay_view(interaction: Dict[str, Any], patterns: Tuple[str, ...]) -> Tuple[Any, ...]:
+	# The parts of an interaction which are visible to the code replaying it.
+	response = interaction["response"]
+	raw = _decode_body(response["body"], response["headers"])
+	parsed = _trimmed_json(raw, patterns)
+	headers = []
+	for key, value in response["headers"].items():
+		if key.lower() in _REPLAY_RESPONSE_HEADERS - {"content-encoding"}:
+			headers.append((key.lower(), tuple(value) if isinstance(value, list) else (value, )))
+	headers.sort()
+
+	return (
+			interaction["request"]["method"],
+			interaction["request"]["uri"],
+			response["status"],
+			response.get("url"),
+			headers,
+			raw if parsed is None else parsed,
+			)
+
+
+def _compact(data: Dict[str, Any], patterns: Tuple[str, ...]) -> Tuple[Dict[str, Any], int]:
+	interactions = []
+	bodies: Dict[str, Dict[str, Any]] = {}
+	counts: Dict[str, int] = {}
+
+	for interaction in data.get("http_interactions", []):
+		request = dict(interaction["request"])
+		request["headers"] = {
+				key: value
+				for key, value in request["headers"].items()
+				if key.lower() in _REPLAY_REQUEST_HEADERS
+				}
+
+		response = dict(interaction["response"])
+		headers = {
+				key: value
+				for key,
+				value in response["headers"].items()
+				if key.lower() in _REPLAY_RESPONSE_HEADERS
+				}
+		body = response["body"]
+		raw = _decode_body(body, headers)
+
+		if patterns:
+			trimmed = _trimmed_json(raw, patterns)
+			if trimmed is not None:
+				raw = json.dumps(trimmed, separators=(',', ':')).encode("UTF-8")
+
+				if _header(headers, "content-encoding") == "gzip":
+					body = {"encoding": body.get("encoding"), "base64_string": _gzip_base64(raw)}
+				else:
+					body = {"encoding": "utf-8", "string": raw.decode("UTF-8")}
+
+		digest = hashlib.sha256(raw).hexdigest()
+		bodies.setdefault(digest, body)
+		counts[digest] = counts.get(digest, 0) + 1
+
+		response["headers"] = headers
+		response["body"] = {_BODY_REF_KEY: digest}
+		interactions.append({**interaction, "request": request, "response": response})
+
+	# Only bodies which occur more than once are stored separately.
+	for interaction in interactions:
+		digest = interaction["response"]["body"][_BODY_REF_KEY]
+		if counts[digest] == 1:
+			interaction["response"]["body"] = bodies.pop(digest)
+
+	compacted = {**data, "http_interactions": interactions}
+	if bodies:
+		compacted[_BODIES_KEY] = bodies
+
+	return compacted, sum(count - 1 for count in counts.values())
+
+
+def _replay(filename: str, check: Callable[[GitHub], Any]) -> Any:
+	# Betamax's cassette library directory is global, so it is restored afterwards.
+	directory, basename = os.path.split(os.path.abspath(filename))
+	cassette_name, extension = os.path.splitext(basename)
+	serialize_with = MsgpackSerializer.name if extension == ".msgpack" else CachedJSONSerializer.name
+
+	configuration = Betamax.configure()
+	library_dir = configuration.cassette_library_dir
+	github = GitHub(token="FAKE_TOKEN")  # nosec: B106
+
+	try:
+		configuration.cassette_library_dir = directory
+
+		with Betamax(github.session) as vcr:
+			vcr.use_cassette(cassette_name, record="none", serialize_with=serialize_with)
+			return check(github)
+
+	finally:
+		configuration.cassette_library_dir = library_dir
+
+
+def _read_cassette(content: bytes, msgpack: bool) -> Dict[str, Any]:
+	if msgpack:
+		return MsgpackSerializer().deserialize(content)
+	else:
+		return CachedJSONSerializer().deserialize(content.decode("UTF-8"))
+
+
+def compact_cassette(
+		filename: Union[str, "os.PathLike[str]"],
+		*,
+		drop_keys: Iterable[str] = (),
+		check: Optional[Callable[[GitHub], Any]] = None,
+		) -> CompactionResult:
+	"""
+	Rewrite a JSON or msgpack cassette in place to make it smaller and faster to replay.
+
+	.. versionadded:: 0.9.0
+
+	* Request and response headers which are not used when replaying the cassette are removed.
+	* Response bodies which occur more than once are stored once, and referenced by their SHA-256 hash.
+	* If ``drop_keys`` is given, matching keys are removed from JSON response bodies (at any depth).
+
+	Compacted cassettes can only be replayed using :class:`~.CachedJSONSerializer`
+	or :class:`~.MsgpackSerializer`, as used by the :fixture:`cassette` and :fixture:`module_cassette` fixtures.
+
+	:param filename:
+	:param drop_keys: Keys to remove from JSON response bodies, which may contain shell-style wildcards,
+		e.g. ``["node_id", "*_url"]``.
+	:param check: A function which makes requests using the :class:`github3.github.GitHub` client it is given,
+		and returns a value which is compared between the original and compacted cassettes.
+		For example ``lambda github: [repo.full_name for repo in iter_repos(github, ["octocat"])]``.
+
+	:raises ValueError: If replaying the compacted cassette gives different results to the original.
+		The original cassette is left unchanged.
+	"""
+
+	filename = os.fspath(filename)
+	patterns = tuple(drop_keys)
+	msgpack = filename.endswith(".msgpack")
+
+	with open(filename, "rb") as fp:
+		content = fp.read()
+
+	data = _read_cassette(content, msgpack)
+	compacted, duplicates = _compact(data, patterns)
+
+	if msgpack:
+		new_content = MsgpackSerializer().serialize(compacted)
+	else:
+		new_content = json.dumps(compacted, separators=(',', ':')).encode("UTF-8")
+
+	original_views = [_replay_view(interaction, patterns) for interaction in data["http_interactions"]]
+	replayed = _read_cassette(new_content, msgpack)
+	if original_views != [_replay_view(interaction, patterns) for interaction in replayed["http_interactions"]]:
+		raise ValueError(f"The compacted cassette {filename!r} does not match the original.")
+
+	root, extension = os.path.splitext(filename)
+	temporary_filename = f"{root}.compacting{extension}"
+
+	with open(temporary_filename, "wb") as fp:
+		fp.write(new_content)
+
+	try:
+		if check is not None:
+			expected = _replay(filename, check)
+
+			try:
+				actual = _replay(temporary_filename, check)
+			except Exception as e:
+				raise ValueError(f"Replaying the compacted cassette {filename!r} failed: {e}") from e
+
+			if expected != actual:
+				raise ValueError(
+						f"Replaying the compacted cassette {filename!r} gave different results:\n"
+						f"  original:  {expected!r}\n"
+						f"  compacted: {actual!r}",
+						)
+
+		os.replace(temporary_filename, filename)
+
+	finally:
+		if os.path.exists(temporary_filename):
+			os.unlink(temporary_filename)
+
+	return CompactionResult(len(content), len(new_content), duplicates)
+
+
+def _use_cassette(vcr: Betamax, cassette_name: str) -> None:
+	library_dir = vcr.config.cassette_library_dir
+
+	if library_dir and os.path.isfile(_msgpack_filename(library_dir, cassette_name)):
+		serialize_with = MsgpackSerializer.name
+	else:
+		serialize_with = CachedJSONSerializer.name
+
+	vcr.use_cassette(cassette_name, record="none", serialize_with=serialize_with)
 
 
 @pytest.fixture()
@@ -72,7 +584,7 @@ def cassette(request: FixtureRequest, github_client: GitHub) -> Iterator[GitHub]
 	"""  # noqa: D400
 
 	with Betamax(github_client.session) as vcr:
-		vcr.use_cassette(request.node.name, record="none")
+		_use_cassette(vcr, request.node.name)
 
 		yield github_client
 
@@ -88,6 +600,30 @@ def module_cassette(request: FixtureRequest, github_client: GitHub) -> Iterator[
 
 	with Betamax(github_client.session) as vcr:
 		# print(f"Using cassette {cassette_name!r}")
-		vcr.use_cassette(cassette_name, record="none")
+		_use_cassette(vcr, cassette_name)
 
 		yield github_client
+
+
+@pytest.fixture()
+def fake_github() -> Iterator[FakeGitHub]:
+	"""
+	Provides a running :class:`~.FakeGitHub` server, which is empty until populated by the test.
+
+	.. versionadded:: 0.9.0
+	"""
+
+	with FakeGitHub() as server:
+		yield server
+
+
+@pytest.fixture()
+def fake_github_client(fake_github: FakeGitHub) -> GitHub:
+	"""
+	Provides an instance of :class:`github3.github.GitHub` which makes requests to the :fixture:`fake_github` server,
+	using a fake token to authenticate.
+
+	.. versionadded:: 0.9.0
+	"""  # noqa: D400
+
+	return fake_github.client()
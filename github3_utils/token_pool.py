@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+#
+#  token_pool.py
+"""
+Spread requests across several GitHub API tokens.
+
+.. versionadded:: 0.9.0
+
+Each token has its own rate limit, so a pool of tokens allows a long-running job
+to make more requests than a single account permits.
+
+.. code-block:: python
+
+	github = TokenPool(["ghp_first...", "ghp_second..."]).client()
+
+	for repo in iter_repos(github, orgs=["sphinx-toolbox"]):
+		...
+
+Each request is authenticated with the token which has the most remaining quota,
+as reported by the ``X-RateLimit-*`` headers of previous responses.
+If a request is rejected because a token's quota is exhausted it is retried with another token.
+:exc:`~.RateLimitExceeded` is only raised once every token is exhausted.
+"""
+#
+#  Copyright © 2026 Dominic Davis-Foster <dominic@davis-foster.co.uk>
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+#  EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+#  MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+#  IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+#  DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+#  OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+#  OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+# stdlib
+import datetime
+import sys
+import threading
+import time
+import weakref
+from typing import Any, Collection, Dict, Iterable, List, Optional, Tuple
+
+# 3rd party
+import attr
+from github3 import GitHub
+from requests import PreparedRequest, Response
+from requests.auth import AuthBase
+from requests.hooks import dispatch_hook
+from requests.structures import CaseInsensitiveDict
+
+# this package
+from github3_utils import RateLimitExceeded
+
+__all__ = ("TokenPool", )
+
+_TOKEN_PREFIX = "token "
+
+
+@attr.s(slots=True)
+class _Quota:
+	# None until a response for the token has been seen.
+	remaining: Optional[int] = attr.ib(default=None)
+	reset: float = attr.ib(default=0.0)
+
+
+# The pool which authenticated each request, so that SingleFlightAdapter can share requests
+# authenticated with different tokens from the same pool.
+_authenticated_by: "weakref.WeakKeyDictionary[PreparedRequest, TokenPool]" = weakref.WeakKeyDictionary()
+_authenticated_by_lock = threading.Lock()
+
+
+def _pool_for(request: PreparedRequest) -> Optional["TokenPool"]:
+	with _authenticated_by_lock:
+		return _authenticated_by.get(request)
+
+
+def _sent_request(response: Response) -> PreparedRequest:
+	# The request which was actually sent. A response shared by a SingleFlightAdapter
+	# was received for another request, which may have been given a different token.
+	return getattr(response, "_sent_request", response.request)
+
+
+def _is_rate_limited(response: Response) -> bool:
+	return response.status_code in {403, 429} and response.headers.get("X-RateLimit-Remaining") == '0'
+
+
+class TokenPool(AuthBase):
+	"""
+	A :mod:`requests` authentication handler which rotates between several GitHub API tokens.
+
+	:param tokens: The tokens to authenticate with. Duplicates are ignored.
+
+	The pool may be shared between several clients and threads.
+	"""
+
+	def __init__(self, tokens: Iterable[str]):
+		self._quotas: Dict[str, _Quota] = {token: _Quota() for token in tokens if token}
+		if not self._quotas:
+			raise ValueError("At least one token must be provided.")
+
+		self._lock = threading.Lock()
+
+		# The reset time of the quota each request in progress was counted against, if it was counted.
+		self._reservations: "weakref.WeakKeyDictionary[PreparedRequest, Tuple[str, float]]"
+		self._reservations = weakref.WeakKeyDictionary()
+
+	@property
+	def tokens(self) -> List[str]:
+		"""
+		The tokens in the pool.
+		"""
+
+		return list(self._quotas)
+
+	def remaining(self, token: str) -> Optional[int]:
+		"""
+		Returns the number of requests the given token is believed to have remaining,
+		or :py:obj:`None` if no responses have been received for it yet.
+
+		:param token:
+		"""  # noqa: D400
+
+		with self._lock:
+			return self._quotas[token].remaining
+
+	def install(self, github: GitHub) -> None:
+		"""
+		Authenticate requests made by the given client with the tokens in this pool.
+
+		:param github:
+		"""
+
+		github.session.auth = self
+
+	def client(self) -> GitHub:
+		"""
+		Returns a new :class:`github3.github.GitHub` client which authenticates with the tokens in this pool.
+		"""
+
+		github = GitHub()
+		self.install(github)
+		return github
+
+	def _acquire(self, request: PreparedRequest, exclude: Collection[str] = ()) -> str:
+		now = time.time()
+		best: Optional[str] = None
+		best_remaining = 0
+
+		with self._lock:
+			for token, quota in self._quotas.items():
+				if token in exclude:
+					continue
+
+				if quota.remaining is None or quota.reset <= now:
+					# Unknown, or the limit has since been reset.
+					remaining = sys.maxsize
+				else:
+					remaining = quota.remaining
+
+				if remaining > best_remaining:
+					best, best_remaining = token, remaining
+
+			if best is None:
+				reset = min((quota.reset for quota in self._quotas.values() if quota.reset > now), default=now)
+				raise RateLimitExceeded(datetime.datetime.fromtimestamp(reset))
+
+			quota = self._quotas[best]
+			if quota.remaining is not None and quota.reset > now:
+				# Account for this request until its response arrives, so concurrent requests are spread out.
+				quota.remaining -= 1
+				self._reservations[request] = (best, quota.reset)
+
+		with _authenticated_by_lock:
+			_authenticated_by[request] = self
+
+		return best
+
+	def _release(self, request: PreparedRequest) -> None:
+		# Stop counting a request which didn't use up any quota. The lock must be held.
+
+		reservation = self._reservations.pop(request, None)
+		if reservation is None:
+			return
+
+		quota = self._quotas[reservation[0]]
+		if quota.remaining is not None and quota.reset == reservation[1]:
+			quota.remaining += 1
+
+	def _update(self, token: str, request: PreparedRequest, headers: "CaseInsensitiveDict[str]") -> None:
+		remaining = headers.get("X-RateLimit-Remaining")
+		reset = headers.get("X-RateLimit-Reset")
+
+		with self._lock:
+			# Other resources, such as search, have separate and much smaller limits,
+			# and some responses (such as 304 Not Modified) don't count against the limit.
+			# Without the headers the estimate can't be corrected, so the request is no longer counted.
+			if remaining is None or reset is None or headers.get("X-RateLimit-Resource", "core") != "core":
+				self._release(request)
+				return
+
+			self._reservations.pop(request, None)
+			quota = self._quotas[token]
+
+			if quota.remaining is not None and quota.reset == float(reset):
+				# Responses to concurrent requests can arrive out of order,
+				# and the estimate already accounts for requests still in progress.
+				quota.remaining = min(quota.remaining, int(remaining))
+			else:
+				quota.remaining = int(remaining)
+				quota.reset = float(reset)
+
+	def __call__(self, request: PreparedRequest) -> PreparedRequest:
+		"""
+		Authenticate the request with the token which has the most requests remaining.
+
+		:param request:
+
+		:raises: :exc:`~.RateLimitExceeded` if every token's quota is used up.
+		"""
+
+		request.headers["Authorization"] = _TOKEN_PREFIX + self._acquire(request)
+
+		if self._handle_response not in request.hooks["response"]:
+			request.register_hook("response", self._handle_response)
+
+		return request
+
+	def _handle_response(self, response: Response, **kwargs: Any) -> Response:
+		sent = _sent_request(response)
+		token = _token_for(sent)
+		if token not in self._quotas:
+			return response
+
+		if sent is not response.request:
+			# This request was never sent, so its token's quota wasn't used.
+			with self._lock:
+				self._release(response.request)
+
+		self._update(token, sent, response.headers)
+
+		if not _is_rate_limited(response):
+			return response
+
+		tried = {token, *(_token_for(_sent_request(previous)) for previous in response.history)}
+		request = response.request.copy()
+
+		# Raises RateLimitExceeded if there are no tokens left to try.
+		request.headers["Authorization"] = _TOKEN_PREFIX + self._acquire(request, exclude=tried)
+
+		# The session only passes the final response to the hooks registered after this one
+		# (such as those of RequestMetrics and Tracer), so they are given the rejected response here.
+		hooks = response.request.hooks["response"]
+		later_hooks = hooks[hooks.index(self._handle_response) + 1:]
+		dispatch_hook("response", {"response": later_hooks}, response, **kwargs)
+
+		# Release the connection before retrying.
+		response.content  # pylint: disable=pointless-statement
+		response.close()
+
+		# The connection is the outermost adapter (e.g. a SingleFlightAdapter), as for a request sent by the session.
+		new_response: Response = response.connection.send(request, **kwargs)
+		new_response.history = [*response.history, response]
+		new_response.request = request
+
+		return self._handle_response(new_response, **kwargs)
+
+
+def _token_for(request: PreparedRequest) -> str:
+	authorization = request.headers.get("Authorization", '')
+	return authorization[len(_TOKEN_PREFIX):] if authorization.startswith(_TOKEN_PREFIX) else ''
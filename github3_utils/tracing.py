@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+#
+#  tracing.py
+"""
+Optional tracing of ``github3_utils`` helper functions and the HTTP requests they make.
+
+.. versionadded:: 0.9.0
+
+.. code-block:: python
+
+	tracer = Tracer(JSONLinesExporter("spans.jsonl"))
+	tracer.install(github)
+
+	label_pr_failures(pull)
+
+	tracer.shutdown()
+
+Each call to a public helper function (such as :func:`~.label_pr_failures`) opens a span,
+and each HTTP request made while it executes is recorded as a child span
+with the endpoint template, status code and page number.
+"""
+#
+#  Copyright © 2026 Dominic Davis-Foster <dominic@davis-foster.co.uk>
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+#  EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+#  MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+#  IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+#  DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+#  OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+#  OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+# stdlib
+import json
+import os
+import sys
+import threading
+import time
+from typing import IO, TYPE_CHECKING, Any, Dict, List, Optional, Union
+from urllib.parse import parse_qs, urlsplit
+
+# 3rd party
+import attr
+
+# this package
+from github3_utils._instrumentation import HelperCall, add_listener, current_call, remove_listener
+from github3_utils.metrics import _get_session, normalise_endpoint
+
+if TYPE_CHECKING:
+	# 3rd party
+	from github3 import GitHub
+	from requests import Response, Session
+
+if sys.version_info >= (3, 8):  # pragma: no cover (<py38)
+	# stdlib
+	from typing import Protocol
+else:  # pragma: no cover (py38+)
+	# 3rd party
+	from typing_extensions import Protocol
+
+__all__ = ("InMemoryExporter", "JSONLinesExporter", "Span", "SpanExporter", "Tracer")
+
+
+def _new_id(nbytes: int) -> str:
+	return os.urandom(nbytes).hex()
+
+
+@attr.s(slots=True)
+class Span:
+	"""
+	Represents a timed operation: either a call to a helper function, or an HTTP request.
+	"""
+
+	#: The name of the helper function, or ``<METHOD> <endpoint template>`` for HTTP requests.
+	name: str = attr.ib()
+
+	#: Either ``'helper'`` or ``'http'``.
+	kind: str = attr.ib()
+
+	#: Identifies the tree of spans this span belongs to.
+	trace_id: str = attr.ib()
+
+	#: Uniquely identifies this span.
+	span_id: str = attr.ib()
+
+	#: The :attr:`~.Span.span_id` of the span this span is a child of.
+	parent_id: Optional[str] = attr.ib()
+
+	#: The time the operation started, in seconds since the epoch.
+	start_time: float = attr.ib()
+
+	#: The time the operation finished, in seconds since the epoch.
+	end_time: Optional[float] = attr.ib(default=None)
+
+	#: Either ``'ok'`` or ``'error'``.
+	status: str = attr.ib(default="ok")
+
+	#: Additional information about the operation.
+	attributes: Dict[str, Any] = attr.ib(factory=dict)
+
+	@property
+	def duration(self) -> Optional[float]:
+		"""
+		The duration of the operation in seconds, or :py:obj:`None` if it has not finished.
+		"""
+
+		if self.end_time is None:
+			return None
+
+		return self.end_time - self.start_time
+
+	def to_dict(self) -> Dict[str, Any]:
+		"""
+		Return the :class:`~.Span` as a dictionary.
+		"""
+
+		return attr.asdict(self)
+
+
+class SpanExporter(Protocol):
+	"""
+	:class:`typing.Protocol` for objects which receive finished spans from a :class:`~.Tracer`.
+	"""
+
+	def export(self, span: Span) -> None:
+		"""
+		Export the given finished span.
+
+		:param span:
+		"""
+
+	def shutdown(self) -> None:
+		"""
+		Flush any buffered spans and release resources.
+		"""
+
+
+class InMemoryExporter:
+	"""
+	Collects finished spans in a list.
+	"""
+
+	def __init__(self) -> None:
+		#: The finished spans, in the order they finished.
+		self.spans: List[Span] = []
+
+	def export(self, span: Span) -> None:  # noqa: D102
+		self.spans.append(span)
+
+	def shutdown(self) -> None:  # noqa: D102
+		pass
+
+
+class JSONLinesExporter:
+	"""
+	Writes finished spans to a file, one JSON object per line.
+
+	:param filename: The file to append spans to.
+	"""
+
+	def __init__(self, filename: Union[str, "os.PathLike[str]"]):
+		self.filename = os.fspath(filename)
+		self._file: Optional[IO[str]] = None
+		self._lock = threading.Lock()
+
+	def export(self, span: Span) -> None:  # noqa: D102
+		line = json.dumps(span.to_dict())
+
+		with self._lock:
+			if self._file is None:
+				self._file = open(self.filename, 'a', encoding="UTF-8")
+			self._file.write(line + '\n')
+			self._file.flush()
+
+	def shutdown(self) -> None:  # noqa: D102
+		with self._lock:
+			if self._file is not None:
+				self._file.close()
+				self._file = None
+
+
+class Tracer:
+	"""
+	Records spans for helper function calls and HTTP requests, and passes them to an exporter.
+
+	:param exporter:
+
+	While a tracer is installed on at least one session,
+	calls to helper functions from any thread are traced.
+	"""
+
+	def __init__(self, exporter: SpanExporter):
+		self.exporter = exporter
+		self._sessions: List["Session"] = []
+
+	def install(self, github: Union["GitHub", "Session"]) -> None:
+		"""
+		Start tracing requests made through the given client or session, and calls to helper functions.
+
+		:param github:
+		"""
+
+		session = _get_session(github)
+		hooks = session.hooks["response"]
+
+		if self.record not in hooks:
+			hooks.append(self.record)
+			self._sessions.append(session)
+
+		add_listener(self)
+
+	def uninstall(self, github: Union["GitHub", "Session"]) -> None:
+		"""
+		Stop tracing requests made through the given client or session.
+
+		Helper function calls are no longer traced once the tracer has been removed from all sessions.
+
+		:param github:
+		"""
+
+		session = _get_session(github)
+		hooks = session.hooks["response"]
+
+		if self.record in hooks:
+			hooks.remove(self.record)
+			self._sessions.remove(session)
+
+		if not self._sessions:
+			remove_listener(self)
+
+	def shutdown(self) -> None:
+		"""
+		Uninstall the tracer from all sessions and shut down the exporter.
+		"""
+
+		for session in list(self._sessions):
+			self.uninstall(session)
+
+		remove_listener(self)
+		self.exporter.shutdown()
+
+	def _parent_span(self, call: Optional[HelperCall]) -> Optional[Span]:
+		while call is not None:
+			span = call.data.get(self)
+			if span is not None:
+				return span
+			call = call.parent
+
+		return None
+
+	def _new_span(self, name: str, kind: str, start_time: float, parent: Optional[Span]) -> Span:
+		return Span(
+				name=name,
+				kind=kind,
+				trace_id=_new_id(16) if parent is None else parent.trace_id,
+				span_id=_new_id(8),
+				parent_id=None if parent is None else parent.span_id,
+				start_time=start_time,
+				)
+
+	def helper_started(self, call: HelperCall) -> None:  # noqa: D102
+		call.data[self] = self._new_span(call.name, "helper", time.time(), self._parent_span(call.parent))
+
+	def helper_finished(self, call: HelperCall, error: Optional[BaseException]) -> None:  # noqa: D102
+		span: Optional[Span] = call.data.pop(self, None)
+		if span is None:
+			return
+
+		span.end_time = time.time()
+
+		if error is not None:
+			span.status = "error"
+			span.attributes["error"] = f"{type(error).__name__}: {error}"
+
+		self.exporter.export(span)
+
+	def record(self, response: "Response", *args: Any, **kwargs: Any) -> None:
+		"""
+		Record a span for the given response.
+
+		This is installed as a :mod:`requests` response hook by :meth:`~.Tracer.install`.
+
+		:param response:
+		"""
+
+		end_time = time.time()
+		request = response.request
+		method = request.method or "GET"
+		url = request.url or response.url
+		endpoint = normalise_endpoint(url)
+		page = parse_qs(urlsplit(url).query).get("page", ['1'])[0]
+
+		span = self._new_span(
+				f"{method} {endpoint}",
+				"http",
+				end_time - response.elapsed.total_seconds(),
+				self._parent_span(current_call()),
+				)
+		span.end_time = end_time
+		span.attributes.update({
+				"http.method": method,
+				"http.url_template": endpoint,
+				"http.status_code": response.status_code,
+				"http.page": int(page) if page.isdigit() else 1,
+				})
+
+		if response.status_code >= 400:
+			span.status = "error"
+
+		self.exporter.export(span)
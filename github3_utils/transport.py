@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+#
+#  transport.py
+"""
+Send a client's requests with `httpx <https://www.python-httpx.org>`_ over HTTP/2.
+
+.. extras-require:: http2
+	:pyproject:
+
+.. versionadded:: 0.9.0
+
+.. code-block:: python
+
+	github = GitHub(token=...)
+	HTTPXAdapter.install(github)
+
+	with ThreadPoolExecutor(8) as pool:
+		pool.map(sync_secrets, iter_repos(github, orgs=["sphinx-toolbox"]))
+
+:mod:`requests` only speaks HTTP/1.1, so each request in flight at once needs its own connection,
+and each new connection needs its own TCP and TLS handshakes.
+Over HTTP/2 any number of concurrent requests share one connection.
+
+The :class:`~.HTTPXAdapter` is a :mod:`requests` transport adapter,
+so the rest of the client (authentication, hooks, redirects, and :mod:`github3`'s handling of the responses)
+is unchanged, and every helper in this package works with it.
+It should be installed before any adapter which wraps the existing one,
+such as those installed by :meth:`SingleFlight.install() <.SingleFlight.install>`.
+
+Responses are always read in full, even if streaming was requested.
+TLS verification, client certificates and proxies are configured on the :class:`httpx.Client`
+rather than for each request.
+"""
+#
+#  Copyright © 2026 Dominic Davis-Foster <dominic@davis-foster.co.uk>
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+#  EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+#  MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+#  IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+#  DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+#  OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+#  OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+# stdlib
+import io
+from typing import TYPE_CHECKING, Any, Optional, Tuple, Union
+
+# 3rd party
+from github3 import GitHub
+from requests import PreparedRequest, Response, exceptions
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+if TYPE_CHECKING:
+	# 3rd party
+	import httpx  # nodep
+
+__all__ = ("HTTPXAdapter", )
+
+_Timeout = Union[None, float, Tuple[Optional[float], Optional[float]]]
+
+
+def _import_httpx() -> Any:
+	try:
+		# 3rd party
+		import httpx  # nodep
+	except ImportError:  # pragma: no cover
+		raise ImportError(
+				"The HTTP/2 transport requires the 'httpx' package. "
+				"Install it with 'pip install github3-utils[http2]'.",
+				) from None
+
+	return httpx
+
+
+class HTTPXAdapter(BaseAdapter):
+	"""
+	A :mod:`requests` transport adapter which sends requests with :mod:`httpx`.
+
+	:param client: The client to send the requests with.
+		If omitted a new client using HTTP/2 is created, and closed when the adapter is closed.
+
+	One adapter can be used from many threads at once.
+	"""
+
+	def __init__(self, client: Optional["httpx.Client"] = None):
+		super().__init__()
+
+		self._owns_client = client is None
+		self.client: "httpx.Client" = _import_httpx().Client(http2=True) if client is None else client
+
+	@classmethod
+	def install(cls, github: GitHub, client: Optional["httpx.Client"] = None) -> "HTTPXAdapter":
+		"""
+		Send the requests made by the given client with :mod:`httpx`, returning the new adapter.
+
+		Clients which share connection pools, such as those created by :class:`~.ContextSwitcher`,
+		also share the :mod:`httpx` client once this is installed on the original client.
+
+		:param github:
+		:param client: The client to send the requests with.
+			If omitted a new client using HTTP/2 is created.
+		"""
+
+		adapter = cls(client)
+		github.session.mount("https://", adapter)
+		github.session.mount("http://", adapter)
+		return adapter
+
+	def _timeout(self, timeout: _Timeout) -> Any:
+		httpx = _import_httpx()
+
+		if isinstance(timeout, tuple):
+			connect, read = timeout
+			return httpx.Timeout(None, connect=connect, read=read)
+
+		return httpx.Timeout(timeout)
+
+	def send(  # type: ignore[override]
+			self,
+			request: PreparedRequest,
+			stream: bool = False,
+			timeout: _Timeout = None,
+			**kwargs: Any,
+			) -> Response:
+		"""
+		Send the request.
+
+		:param request:
+		:param stream: Ignored. The response is always read in full.
+		:param timeout: The connect and read timeouts, as for :meth:`requests.adapters.HTTPAdapter.send`.
+		:param kwargs: Other options, which are configured on the :mod:`httpx` client instead.
+		"""
+
+		httpx = _import_httpx()
+
+		body = request.body.encode("UTF-8") if isinstance(request.body, str) else request.body
+
+		try:
+			httpx_response = self.client.request(
+					request.method or "GET",
+					request.url or '',
+					headers=dict(request.headers),
+					content=body,
+					timeout=self._timeout(timeout),
+					)
+		except httpx.ConnectTimeout as e:
+			raise exceptions.ConnectTimeout(e, request=request) from e
+		except httpx.TimeoutException as e:
+			raise exceptions.ReadTimeout(e, request=request) from e
+		except httpx.ProxyError as e:
+			raise exceptions.ProxyError(e, request=request) from e
+		except httpx.TransportError as e:
+			raise exceptions.ConnectionError(e, request=request) from e
+
+		return self._build_response(request, httpx_response)
+
+	def _build_response(self, request: PreparedRequest, httpx_response: "httpx.Response") -> Response:
+		response = Response()
+		response.status_code = httpx_response.status_code
+
+		# Repeated headers, such as Link, are joined with commas as urllib3 does.
+		response.headers = CaseInsensitiveDict(httpx_response.headers.items())
+		response.encoding = get_encoding_from_headers(response.headers)
+		response.reason = httpx_response.reason_phrase
+		response.url = str(httpx_response.url)
+		response.elapsed = httpx_response.elapsed
+		response.request = request
+		response.connection = self  # type: ignore[assignment]
+
+		content = httpx_response.content
+		response.raw = io.BytesIO(content)
+		response._content = content
+		response._content_consumed = True  # type: ignore[attr-defined]
+
+		return response
+
+	def close(self) -> None:
+		"""
+		Close the :mod:`httpx` client, if it was created by the adapter.
+		"""
+
+		if self._owns_client:
+			self.client.close()
@@ -1,8 +1,76 @@
+# stdlib
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlsplit, urlunsplit
+
 # 3rd party
+import pytest
 from betamax import Betamax  # type: ignore[import-untyped]
+from betamax.matchers import BaseMatcher  # type: ignore[import-untyped]
 from domdf_python_tools.paths import PathPlus
+from requests import PreparedRequest
+
+# this package
+from github3_utils.fake_github import FakeGitHub
 
 with Betamax.configure() as config:
 	config.cassette_library_dir = PathPlus(__file__).parent / "cassettes"
 
 pytest_plugins = ("coincidence", "github3_utils.testing")
+
+
+class URIWithoutPerPageMatcher(BaseMatcher):
+	"""
+	Matches on the URI, ignoring the ``per_page`` query parameter.
+
+	For cassettes recorded before the helpers requested full pages.
+	"""
+
+	name = "uri-without-per-page"
+
+	@staticmethod
+	def _strip_per_page(uri: str) -> Tuple[str, List[Tuple[str, str]]]:
+		parts = urlsplit(uri)
+		query = sorted((key, value) for key, value in parse_qsl(parts.query) if key != "per_page")
+		return urlunsplit(parts._replace(query='')), query
+
+	def match(self, request: PreparedRequest, recorded_request: Dict[str, Any]) -> bool:  # noqa: D102
+		return self._strip_per_page(request.url or '') == self._strip_per_page(recorded_request["uri"])
+
+
+Betamax.register_request_matcher(URIWithoutPerPageMatcher)
+
+
+class FakeTimer:
+	"""
+	A clock which only moves when ``now`` is changed.
+
+	:param now: The initial time, in seconds since the epoch. Defaults to the current time.
+	"""
+
+	def __init__(self, now: Optional[float] = None) -> None:
+		self.now = time.time() if now is None else now
+
+	def __call__(self) -> float:
+		return self.now
+
+
+def wait_for(condition: Callable[[], bool]) -> None:
+	"""
+	Wait up to five seconds for the condition to become true.
+	"""
+
+	deadline = time.time() + 5
+	while not condition():
+		assert time.time() < deadline
+		time.sleep(0.01)
+
+
+@pytest.fixture()
+def limited_github() -> Iterator[FakeGitHub]:
+	"""
+	A :class:`~.FakeGitHub` where each token may only make 10 requests.
+	"""
+
+	with FakeGitHub(rate_limit=10) as server:
+		yield server
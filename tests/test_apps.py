@@ -1,6 +1,7 @@
 # stdlib
 import datetime
-from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
 
 # 3rd party
 import pytest
@@ -10,7 +11,8 @@ from domdf_python_tools.stringlist import StringList
 from github3 import GitHub
 
 # this package
-from github3_utils.apps import iter_installed_repos, make_footer_links
+from github3_utils.apps import ContextSwitcher, iter_installed_repos, make_footer_links
+from github3_utils.fake_github import FakeGitHub
 
 # This is a fake key generated from https://travistidwell.com/jsencrypt/demo/
 FAKE_KEY = StringList([
@@ -39,7 +41,12 @@ def test_iter_installed_repos(advanced_data_regression: AdvancedDataRegressionFi
 	GITHUBAPP_KEY = str(FAKE_KEY).encode("UTF-8")
 
 	with Betamax(github.session) as vcr:
-		vcr.use_cassette("test_iter_installed_repos", record="once")
+		# Recorded when the app's ID was passed as the number of installations to list.
+		vcr.use_cassette(
+				"test_iter_installed_repos",
+				record="once",
+				match_requests_on=["method", "uri-without-per-page"],
+				)
 
 		repo_names = []
 
@@ -70,6 +77,68 @@ def test_iter_installed_repos_errors() -> None:
 		next(iter_installed_repos(client=GitHub()))
 
 
+def test_installation_client(fake_github: FakeGitHub) -> None:
+	installation_ids = []
+
+	for owner in ["domdfcoding", "sphinx-toolbox", "repo-helper"]:
+		fake_github.add_user(owner)
+		fake_github.add_repo(owner, f"{owner}-repo")
+		installation_ids.append(fake_github.add_installation(owner, app_id=89426))
+
+	client = fake_github.client(None)
+	switcher = ContextSwitcher(client, str(FAKE_KEY).encode("UTF-8"), 89426, max_clients=2)
+
+	first = switcher.installation_client(installation_ids[0])
+	assert switcher.installation_client(installation_ids[0]) is first
+	assert first is not client
+
+	# The original client is unchanged, and its connection pool is shared.
+	assert client.session.auth is None
+	assert first.session.adapters["http://"] is client.session.adapters["http://"]
+	assert first.session.base_url == client.session.base_url
+
+	second = switcher.installation_client(installation_ids[1])
+	assert second is not first
+	assert second.session.auth.token != first.session.auth.token
+
+	# The least recently used client is discarded.
+	switcher.installation_client(installation_ids[0])
+	switcher.installation_client(installation_ids[2])
+	assert switcher.installation_client(installation_ids[0]) is first
+	assert switcher.installation_client(installation_ids[1]) is not second
+
+	# A client is replaced before its token expires.
+	first.session.auth.expires_at = datetime.datetime.now(datetime.timezone.utc)
+	assert switcher.installation_client(installation_ids[0]) is not first
+
+	app_client = switcher.app_client()
+	assert switcher.app_client() is app_client
+	assert [installation.id for installation in app_client.app_installations()] == installation_ids
+
+
+def test_installation_client_threads(fake_github: FakeGitHub) -> None:
+	owners = [f"user-{idx}" for idx in range(8)]
+
+	for owner in owners:
+		fake_github.add_user(owner)
+		fake_github.add_repo(owner, "repo")
+		fake_github.add_installation(owner, app_id=89426)
+
+	switcher = ContextSwitcher(fake_github.client(None), str(FAKE_KEY).encode("UTF-8"), 89426)
+
+	def list_repos(installation_id: int) -> List[str]:
+		github = switcher.installation_client(installation_id)
+		response = github.session.get(f"{fake_github.api}/installation/repositories")
+		return [repo["full_name"] for repo in response.json()["repositories"]]
+
+	installation_ids = [installation.id for installation in switcher.app_client().app_installations()]
+
+	with ThreadPoolExecutor(4) as pool:
+		results = list(pool.map(list_repos, installation_ids * 3))
+
+	assert results == [[f"{owner}/repo"] for owner in owners] * 3
+
+
 @pytest.mark.usefixtures("fixed_datetime")
 @pytest.mark.parametrize("event_date", [datetime.date(2020, 12, 25), datetime.date(2020, 7, 4), None])
 def test_make_footer_links_marketplace(
@@ -0,0 +1,185 @@
+# stdlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+
+# 3rd party
+import pytest
+from github3 import GitHub
+from github3.exceptions import NotFoundError
+
+# this package
+from github3_utils import get_user, iter_repos
+from github3_utils.caching import ChecksCache, TTLCache, credentials_hash
+from github3_utils.check_labels import get_checks_for_pr
+from github3_utils.fake_github import FakeGitHub
+from github3_utils.token_pool import TokenPool
+from tests.conftest import FakeTimer
+
+
+def test_ttl() -> None:
+	timer = FakeTimer(1000.0)
+	cache = TTLCache(ttl=60, timer=timer)
+
+	cache.set("domdfcoding", 1)
+	assert cache.get("domdfcoding") == 1
+	assert "domdfcoding" in cache
+
+	timer.now += 59
+	assert cache.get("domdfcoding") == 1
+
+	timer.now += 1
+	assert cache.get("domdfcoding") is None
+	assert cache.get("domdfcoding", 2) == 2
+	assert "domdfcoding" not in cache
+	assert len(cache) == 0
+
+
+def test_maxsize() -> None:
+	cache = TTLCache(maxsize=2)
+
+	cache.set('a', 1)
+	cache.set('b', 2)
+	assert cache.get('a') == 1
+
+	# 'b' is the least recently used.
+	cache.set('c', 3)
+	assert len(cache) == 2
+	assert 'b' not in cache
+	assert cache.get('a') == 1
+	assert cache.get('c') == 3
+
+	assert cache.pop('a') == 1
+	assert cache.pop('a', 4) == 4
+
+	cache.clear()
+	assert len(cache) == 0
+
+	with pytest.raises(ValueError, match="'maxsize' must be at least 1."):
+		TTLCache(maxsize=0)
+
+
+def test_threads() -> None:
+	cache = TTLCache(maxsize=50)
+
+	def worker(offset: int) -> None:
+		for idx in range(1000):
+			cache.set((offset + idx) % 80, idx)
+			cache.get(idx % 80)
+
+	with ThreadPoolExecutor(4) as executor:
+		list(executor.map(worker, range(4)))
+
+	assert len(cache) == 50
+
+
+def test_credentials_hash(fake_github: FakeGitHub) -> None:
+	first = credentials_hash(fake_github.client("FIRST"))
+	assert first == credentials_hash(fake_github.client("FIRST"))
+	assert first != credentials_hash(fake_github.client("SECOND"))
+	assert first != credentials_hash(fake_github.client(None))
+	assert "FIRST" not in first
+
+	assert credentials_hash(TokenPool(["FIRST", "SECOND"]).client()) != credentials_hash(GitHub(token="FIRST"))
+
+
+def repo_names(github: GitHub, cache: TTLCache) -> List[str]:
+	return [repo.name for repo in iter_repos(github, ["domdfcoding"], ["Sphinx-Toolbox"], cache=cache)]
+
+
+def test_iter_repos(fake_github: FakeGitHub, fake_github_client: GitHub) -> None:
+	fake_github.add_user("domdfcoding")
+	fake_github.add_org("sphinx-toolbox")
+	fake_github.add_repo("domdfcoding", "github3-utils")
+	fake_github.add_repo("sphinx-toolbox", "sphinx-toolbox")
+
+	cache = TTLCache()
+	assert repo_names(fake_github_client, cache) == ["github3-utils", "sphinx-toolbox"]
+
+	# 2 owner lookups, then 1 page for each owner.
+	assert fake_github.request_count == 4
+	assert len(cache) == 2
+
+	# The owners are looked up once, but the repositories are listed every time.
+	fake_github.add_repo("sphinx-toolbox", "toctree_plus")
+	assert repo_names(fake_github_client, cache) == ["github3-utils", "sphinx-toolbox", "toctree_plus"]
+	assert fake_github.request_count == 6
+
+	# Different credentials don't share entries.
+	other_client = fake_github.client("OTHER_TOKEN")
+	assert repo_names(other_client, cache) == ["github3-utils", "sphinx-toolbox", "toctree_plus"]
+	assert fake_github.request_count == 10
+	assert len(cache) == 4
+
+
+def test_iter_repos_missing(fake_github: FakeGitHub, fake_github_client: GitHub) -> None:
+	cache = TTLCache()
+
+	with pytest.raises(NotFoundError):
+		list(iter_repos(fake_github_client, ["octocat"], cache=cache))
+
+	assert len(cache) == 0
+
+
+def test_get_user(fake_github: FakeGitHub) -> None:
+	fake_github.add_user("domdfcoding", name="Dominic Davis-Foster")
+	github = fake_github.client()
+	cache = TTLCache()
+
+	for _ in range(3):
+		user = get_user(github, cache=cache)
+		assert user.login == "domdfcoding"
+		assert user.name == "Dominic Davis-Foster"
+
+	assert fake_github.request_count == 1
+
+
+def test_checks_cache(fake_github: FakeGitHub, fake_github_client: GitHub) -> None:
+	fake_github.add_repo("sphinx-toolbox", "sphinx-autofixture")
+	for number in (10, 11):
+		fake_github.add_pull(
+				"sphinx-toolbox",
+				"sphinx-autofixture",
+				number,
+				check_runs={"Flake8": "failure", "mypy": "success", "docs": "in_progress"},
+				)
+
+	fake_github.add_pull("sphinx-toolbox", "sphinx-autofixture", 12, check_runs={})
+
+	repo = fake_github_client.repository("sphinx-toolbox", "sphinx-autofixture")
+	pull = repo.pull_request(10)
+	cache = ChecksCache(maxsize=1)
+	request_count = fake_github.request_count
+
+	# Commits with runs in progress are fetched every time.
+	assert get_checks_for_pr(pull, cache=cache).running == {"docs"}
+	assert get_checks_for_pr(pull, cache=cache).running == {"docs"}
+	assert len(cache) == 0
+	assert fake_github.request_count == request_count + 2
+
+	fake_github.set_check_run("sphinx-toolbox", "sphinx-autofixture", 10, "docs", "success")
+
+	for _ in range(3):
+		checks = get_checks_for_pr(pull, cache=cache)
+		assert checks.successful == {"docs", "mypy"}
+		assert checks.failing == {"Flake8"}
+		assert checks.running == set()
+
+	assert fake_github.request_count == request_count + 3
+	assert len(cache) == 1
+
+	# The cached result can't be changed by callers.
+	checks.failing.clear()
+	assert get_checks_for_pr(pull, cache=cache).failing == {"Flake8"}
+
+	# Commits without any runs yet aren't cached.
+	get_checks_for_pr(repo.pull_request(12), cache=cache)
+	assert len(cache) == 1
+
+	# The least recently used commit is discarded.
+	fake_github.set_check_run("sphinx-toolbox", "sphinx-autofixture", 11, "docs", "failure")
+	assert get_checks_for_pr(repo.pull_request(11), cache=cache).failing == {"docs", "Flake8"}
+	assert len(cache) == 1
+
+	request_count = fake_github.request_count
+	get_checks_for_pr(pull, cache=cache)
+	assert fake_github.request_count == request_count + 1
@@ -0,0 +1,120 @@
+# stdlib
+import random
+import sys
+
+# 3rd party
+import pytest
+from github3 import GitHub
+
+# this package
+from github3_utils.check_labels import Checks, get_checks_for_pr
+from github3_utils.check_matrix import CheckMatrix, CheckStatus
+from github3_utils.fake_github import FakeGitHub
+
+
+def make_checks(
+		successful: str = '',
+		failing: str = '',
+		running: str = '',
+		skipped: str = '',
+		neutral: str = '',
+		) -> Checks:
+	return Checks(*(set(names.split()) for names in (successful, failing, running, skipped, neutral)))
+
+
+@pytest.fixture()
+def matrix() -> CheckMatrix:
+	return CheckMatrix.from_checks({
+			1: make_checks(successful="mypy docs", failing="Flake8"),
+			2: make_checks(successful="Flake8 mypy", running="docs"),
+			3: make_checks(failing="Flake8 mypy", skipped="docs"),
+			4: make_checks(successful="Flake8", neutral="coverage"),
+			})
+
+
+def test_shape(matrix: CheckMatrix) -> None:
+	assert matrix.shape == (4, 4)
+	assert len(matrix) == 4
+	assert matrix.keys == [1, 2, 3, 4]
+	assert set(matrix.checks) == {"mypy", "docs", "Flake8", "coverage"}
+	assert matrix.nbytes == 16
+	assert 3 in matrix
+	assert 5 not in matrix
+
+
+def test_status(matrix: CheckMatrix) -> None:
+	assert matrix.status(1, "Flake8") is CheckStatus.FAILING
+	assert matrix.status(2, "docs") is CheckStatus.RUNNING
+	assert matrix.status(4, "mypy") is CheckStatus.MISSING
+	assert matrix.status(4, "not-a-check") is CheckStatus.MISSING
+
+	assert matrix.checks_for(3) == make_checks(failing="Flake8 mypy", skipped="docs")
+
+	with pytest.raises(KeyError):
+		matrix.status(5, "mypy")
+
+
+def test_counts(matrix: CheckMatrix) -> None:
+	assert matrix.counts(CheckStatus.FAILING) == {"mypy": 1, "docs": 0, "Flake8": 2, "coverage": 0}
+	assert matrix.counts(CheckStatus.MISSING)["coverage"] == 3
+
+	assert matrix.failure_rates() == {"mypy": 1 / 3, "docs": 0.0, "Flake8": 0.5, "coverage": 0.0}
+
+
+def test_where(matrix: CheckMatrix) -> None:
+	assert matrix.where(failing=["Flake8"]) == [1, 3]
+	assert matrix.where(failing=["Flake8"], successful=["mypy"]) == [1]
+	assert matrix.where(successful=["Flake8", "mypy"]) == [2]
+	assert matrix.where(missing=["mypy"]) == [4]
+	assert matrix.where(failing=["not-a-check"]) == []
+	assert matrix.where() == [1, 2, 3, 4]
+
+
+def test_replace(matrix: CheckMatrix) -> None:
+	matrix.add(1, make_checks(successful="Flake8 mypy docs"))
+
+	assert matrix.shape == (4, 4)
+	assert matrix.where(failing=["Flake8"]) == [3]
+	assert matrix.status(1, "docs") is CheckStatus.SUCCESSFUL
+
+
+def test_large() -> None:
+	rng = random.Random(1234)
+	names = [f"check-{idx}" for idx in range(40)]
+
+	def random_checks() -> Checks:
+		groups: Checks = make_checks()
+		for name in names:
+			groups[rng.randrange(5)].add(name)
+		return groups
+
+	checks = {number: random_checks() for number in range(5000)}
+	matrix = CheckMatrix.from_checks(checks.items())
+
+	assert matrix.shape == (5000, 40)
+	assert matrix.nbytes == 5000 * 40
+
+	# The matrix is much smaller than the sets it was built from.
+	sets_size = sum(sys.getsizeof(group) for groups in checks.values() for group in groups)
+	assert matrix.nbytes * 10 < sets_size
+
+	expected = []
+	for number, groups in checks.items():
+		if "check-0" in groups.failing and "check-1" in groups.successful:
+			expected.append(number)
+
+	assert matrix.where(failing=["check-0"], successful=["check-1"]) == expected
+
+	failing = sum("check-2" in groups.failing for groups in checks.values())
+	assert matrix.failure_rates()["check-2"] == failing / 5000
+
+
+def test_from_pulls(fake_github: FakeGitHub, fake_github_client: GitHub) -> None:
+	fake_github.add_repo("sphinx-toolbox", "sphinx-autofixture")
+	fake_github.add_pull("sphinx-toolbox", "sphinx-autofixture", 10, check_runs={"Flake8": "failure"})
+	fake_github.add_pull("sphinx-toolbox", "sphinx-autofixture", 11, check_runs={"Flake8": "success"})
+
+	repo = fake_github_client.repository("sphinx-toolbox", "sphinx-autofixture")
+	matrix = CheckMatrix.from_checks((pull.number, get_checks_for_pr(pull)) for pull in repo.pull_requests())
+
+	assert matrix.where(failing=["Flake8"]) == [10]
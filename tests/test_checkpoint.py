@@ -0,0 +1,169 @@
+# stdlib
+from contextlib import closing
+from typing import Iterator, List
+
+# 3rd party
+import pytest
+from domdf_python_tools.paths import PathPlus
+from github3 import GitHub
+
+# this package
+from github3_utils import RateLimitExceeded
+from github3_utils.apps import ContextSwitcher
+from github3_utils.checkpoint import Checkpoint, Cursor
+from github3_utils.fake_github import FakeGitHub
+from github3_utils.token_pool import TokenPool
+from tests.test_apps import FAKE_KEY
+
+
+class Interrupted(Exception):
+	pass
+
+
+@pytest.fixture()
+def many_repos(fake_github: FakeGitHub) -> List[str]:
+	fake_github.add_user("domdfcoding")
+	fake_github.add_org("sphinx-toolbox")
+	fake_github.add_org("repo-helper")
+
+	names = []
+	for owner, count in [("domdfcoding", 30), ("sphinx-toolbox", 250), ("repo-helper", 20)]:
+		for idx in range(count):
+			fake_github.add_repo(owner, f"repo-{idx:03d}")
+			names.append(f"{owner}/repo-{idx:03d}")
+
+	return names
+
+
+def scan(checkpoint: Checkpoint, github: GitHub, stop_after: int = -1) -> List[str]:
+	names: List[str] = []
+	repos = checkpoint.iter_repos(github, users=["domdfcoding"], orgs=["sphinx-toolbox", "repo-helper"])
+
+	with closing(repos):
+		for repo in repos:
+			if len(names) == stop_after:
+				raise Interrupted
+			names.append(repo.full_name)
+
+	return names
+
+
+def test_resume(fake_github: FakeGitHub, many_repos: List[str], tmp_pathplus: PathPlus) -> None:
+	github = fake_github.client()
+	checkpoint = Checkpoint(tmp_pathplus / "scan.json", interval=50)
+
+	with pytest.raises(Interrupted):
+		scan(checkpoint, github, stop_after=180)
+
+	loaded = checkpoint.load()
+	assert loaded is not None
+	assert loaded[1] == Cursor(owner="orgs/sphinx-toolbox", page=2, index=50)
+
+	# Only the page the scan had reached is requested again.
+	fake_github.requests.clear()
+	second = scan(Checkpoint(tmp_pathplus / "scan.json"), github)
+
+	assert second[0] == "sphinx-toolbox/repo-150"
+	assert len(second) == len(many_repos) - 180
+	assert fake_github.requests == [
+			("GET", "/orgs/sphinx-toolbox/repos"),
+			("GET", "/orgs/sphinx-toolbox/repos"),
+			("GET", "/orgs/repo-helper/repos"),
+			]
+
+	# The file is removed once the scan finishes, so the next scan starts again.
+	assert not (tmp_pathplus / "scan.json").exists()
+	assert scan(checkpoint, github) == many_repos
+
+
+def test_interval(fake_github: FakeGitHub, many_repos: List[str], tmp_pathplus: PathPlus) -> None:
+	checkpoint = Checkpoint(tmp_pathplus / "scan.json", interval=40)
+	repos = checkpoint.iter_repos(fake_github.client(), orgs=["sphinx-toolbox"])
+
+	def position() -> Cursor:
+		loaded = checkpoint.load()
+		assert loaded is not None
+		return loaded[1]
+
+	next(repos)
+	assert position() == Cursor(owner="orgs/sphinx-toolbox")
+
+	for _ in range(40):
+		next(repos)
+	assert position() == Cursor(owner="orgs/sphinx-toolbox", index=40)
+
+	for _ in range(80):
+		next(repos)
+	assert position() == Cursor(owner="orgs/sphinx-toolbox", page=2, index=20)
+
+
+def test_rate_limit(fake_github: FakeGitHub, many_repos: List[str], tmp_pathplus: PathPlus) -> None:
+	fake_github.set_remaining(2)
+
+	def pooled_client() -> GitHub:
+		github = TokenPool(["FAKE_TOKEN"]).client()
+		github.session.base_url = fake_github.api
+		return github
+
+	checkpoint = Checkpoint(tmp_pathplus / "scan.json")
+	names: List[str] = []
+
+	repos = checkpoint.iter_repos(pooled_client(), users=["domdfcoding"], orgs=["sphinx-toolbox"])
+	with pytest.raises(RateLimitExceeded):
+		names.extend(repo.full_name for repo in repos)
+
+	assert len(names) == 130
+
+	# Later, once the limit has been reset.
+	fake_github.set_remaining(100)
+	for repo in checkpoint.iter_repos(pooled_client(), users=["domdfcoding"], orgs=["sphinx-toolbox"]):
+		names.append(repo.full_name)
+
+	assert names == many_repos[:280]
+
+
+def test_different_scan(fake_github: FakeGitHub, many_repos: List[str], tmp_pathplus: PathPlus) -> None:
+	github = fake_github.client()
+	checkpoint = Checkpoint(tmp_pathplus / "scan.json")
+
+	with pytest.raises(Interrupted):
+		scan(checkpoint, github, stop_after=10)
+
+	with pytest.raises(ValueError, match="is for a different scan"):
+		next(checkpoint.iter_repos(github, orgs=["sphinx-toolbox"]))
+
+	checkpoint.clear()
+	assert next(checkpoint.iter_repos(github, orgs=["sphinx-toolbox"])).name == "repo-000"
+
+
+def installed_repos(checkpoint: Checkpoint, switcher: ContextSwitcher) -> Iterator[str]:
+	for repo in checkpoint.iter_installed_repos(switcher):
+		yield repo["full_name"]
+
+
+def test_iter_installed_repos(fake_github: FakeGitHub, many_repos: List[str], tmp_pathplus: PathPlus) -> None:
+	# The app's ID is lower than the number of installations, so it mustn't be used to limit them.
+	installations = [
+			fake_github.add_installation(owner, app_id=2)
+			for owner in ["domdfcoding", "sphinx-toolbox", "repo-helper"]
+			]
+
+	switcher = ContextSwitcher(fake_github.client(None), str(FAKE_KEY).encode("UTF-8"), 2)
+	checkpoint = Checkpoint(tmp_pathplus / "installations.json", interval=10)
+
+	names = []
+	for full_name in installed_repos(checkpoint, switcher):
+		names.append(full_name)
+		if len(names) == 135:
+			break
+
+	loaded = checkpoint.load()
+	assert loaded is not None
+	assert loaded[1] == Cursor(installation=installations[1], page=2, index=4)
+
+	# The repository being processed is yielded again.
+	names.pop()
+	names.extend(installed_repos(checkpoint, switcher))
+
+	assert sorted(names) == sorted(many_repos)
+	assert not (tmp_pathplus / "installations.json").exists()
@@ -1,3 +1,6 @@
+# stdlib
+from typing import Tuple
+
 # 3rd party
 import click
 from click.testing import CliRunner, Result
@@ -58,3 +61,24 @@ def test_token_option_alt_name(
 
 	result = runner.invoke(demo, catch_exceptions=False, args=["--help"])
 	advanced_file_regression.check(result.stdout.rstrip())
+
+
+def test_token_option_multiple(monkeypatch) -> None:
+
+	@token_option(multiple=True)
+	@click_command()
+	def demo(tokens: Tuple[str, ...]) -> None:
+		click.echo(f"The tokens are: {', '.join(tokens)}")
+
+	runner = CliRunner()
+
+	result: Result = runner.invoke(demo, catch_exceptions=False, args=["-t", "FIRST", "--token", "SECOND"])
+	assert result.stdout == "The tokens are: FIRST, SECOND\n"
+
+	monkeypatch.setenv("GITHUB_TOKEN", "FIRST, SECOND,,FIRST")
+	result = runner.invoke(demo, catch_exceptions=False)
+	assert result.stdout == "The tokens are: FIRST, SECOND\n"
+
+	monkeypatch.delenv("GITHUB_TOKEN")
+	result = runner.invoke(demo)
+	assert result.exit_code == 2
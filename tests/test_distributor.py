@@ -0,0 +1,79 @@
+# stdlib
+from typing import Dict, List
+
+# 3rd party
+import pytest
+from github3 import GitHub
+
+# this package
+from github3_utils.apps import ContextSwitcher
+from github3_utils.distributor import InstallationDistributor
+from github3_utils.fake_github import FakeGitHub
+from tests.conftest import FakeTimer, wait_for
+from tests.test_apps import FAKE_KEY
+
+
+def get_repo(client: GitHub, owner: str, name: str) -> str:
+	return client.repository(owner, name).full_name
+
+
+def make_switcher(fake_github: FakeGitHub) -> ContextSwitcher:
+	return ContextSwitcher(fake_github.client(None), str(FAKE_KEY).encode("UTF-8"), 89426)
+
+
+def test_map_installed_repos(fake_github: FakeGitHub) -> None:
+	expected: List[str] = []
+
+	for owner, count in [("domdfcoding", 30), ("sphinx-toolbox", 150), ("repo-helper", 5)]:
+		fake_github.add_org(owner)
+		for idx in range(count):
+			fake_github.add_repo(owner, f"repo-{idx:03d}")
+			expected.append(f"{owner}/repo-{idx:03d}")
+		fake_github.add_installation(owner, app_id=2)
+
+	def job(client: GitHub, repo: Dict) -> str:
+		return get_repo(client, repo["owner"]["login"], repo["name"])
+
+	# The app's ID is lower than the number of installations, so it mustn't be used to limit them.
+	switcher = ContextSwitcher(fake_github.client(None), str(FAKE_KEY).encode("UTF-8"), 2)
+
+	with InstallationDistributor(switcher) as distributor:
+		results = [(repo["full_name"], future.result()) for repo, future in distributor.map_installed_repos(job)]
+
+	assert sorted(results) == [(name, name) for name in sorted(expected)]
+
+
+def test_pause_installation(limited_github: FakeGitHub) -> None:
+	for owner in ["domdfcoding", "sphinx-toolbox"]:
+		limited_github.add_org(owner)
+		for idx in range(15):
+			limited_github.add_repo(owner, f"repo-{idx:03d}")
+
+	busy = limited_github.add_installation("domdfcoding", app_id=89426)
+	quiet = limited_github.add_installation("sphinx-toolbox", app_id=89426)
+	timer = FakeTimer()
+
+	with InstallationDistributor(make_switcher(limited_github), workers=1, timer=timer) as distributor:
+		busy_futures = [distributor.submit(busy, get_repo, "domdfcoding", f"repo-{idx:03d}") for idx in range(15)]
+		quiet_futures = [
+				distributor.submit(quiet, get_repo, "sphinx-toolbox", f"repo-{idx:03d}") for idx in range(3)
+				]
+
+		# The quiet installation finishes while the busy one is held.
+		for future in quiet_futures:
+			assert future.result(timeout=5).startswith("sphinx-toolbox/")
+
+		wait_for(lambda: distributor.remaining(busy) == 0)
+		assert sum(future.done() for future in busy_futures) == 10
+		assert distributor.scheduler(busy).pending == 5
+		assert distributor.remaining(quiet) == 7
+
+		# The busy installation continues once its own limit resets.
+		limited_github.set_remaining(10, token=distributor.client(busy).session.auth.token)
+		timer.now += 3600
+
+		for idx, future in enumerate(busy_futures):
+			assert future.result(timeout=5) == f"domdfcoding/repo-{idx:03d}"
+
+	with pytest.raises(RuntimeError, match="Cannot submit jobs after the distributor has been shut down."):
+		distributor.submit(quiet, get_repo, "sphinx-toolbox", "repo-000")
@@ -0,0 +1,132 @@
+# stdlib
+import hashlib
+import hmac
+import json
+import time
+from typing import Any, Dict, List, Tuple
+
+# 3rd party
+import pytest
+import requests
+
+# this package
+from github3_utils.events import (
+		EventProcessor,
+		PullRequestKey,
+		WebhookReceiver,
+		pull_requests_for_event,
+		verify_signature
+		)
+
+SECRET = "It's a Secret to Everybody"
+
+
+def check_run_event(
+		number: int = 10,
+		head_sha: str = "108346fee3ef6a780defddeecb004f5ce22f32e5",
+		) -> Dict[str, Any]:
+	return {
+			"action": "completed",
+			"check_run": {"head_sha": head_sha, "pull_requests": [{"number": number}]},
+			"repository": {"name": "sphinx-autofixture", "owner": {"login": "sphinx-toolbox"}},
+			}
+
+
+def sign(body: bytes) -> str:
+	return "sha256=" + hmac.new(SECRET.encode("UTF-8"), body, hashlib.sha256).hexdigest()
+
+
+def test_verify_signature() -> None:
+	# Example from GitHub's documentation
+	signature = "sha256=757107ea0eb2509fc211221cce984b8a37570b6d7586c22c46f4379c8b043e17"
+	assert verify_signature(SECRET, b"Hello, World!", signature)
+	assert verify_signature(SECRET.encode("UTF-8"), b"Hello, World!", signature)
+	assert not verify_signature(SECRET, b"Hello, World?", signature)
+	assert not verify_signature(SECRET, b"Hello, World!", None)
+	assert not verify_signature(SECRET, b"Hello, World!", signature[7:])
+
+
+def test_pull_requests_for_event() -> None:
+	key = PullRequestKey("sphinx-toolbox", "sphinx-autofixture", 10)
+	sha = "108346fee3ef6a780defddeecb004f5ce22f32e5"
+	assert pull_requests_for_event("check_run", check_run_event()) == {key: sha}
+
+	payload = check_run_event()
+	payload["check_suite"] = payload.pop("check_run")
+	assert pull_requests_for_event("check_suite", payload) == {key: sha}
+
+	assert pull_requests_for_event("push", {}) == {}
+
+
+def test_coalescing() -> None:
+	calls: List[Tuple[PullRequestKey, str]] = []
+	processor = EventProcessor(window=60, handler=lambda key, sha: calls.append((key, sha)))
+
+	for _ in range(80):
+		processor.submit("check_run", check_run_event())
+
+	processor.submit("check_run", check_run_event(number=11))
+	processor.submit("push", {})
+
+	assert processor.events_received == 81
+	assert processor.pending == 2
+
+	processor.flush()
+
+	assert processor.runs == 2
+	assert sorted(key.number for key, sha in calls) == [10, 11]
+	assert processor.pending == 0
+
+
+def test_window() -> None:
+	calls: List[Tuple[PullRequestKey, str]] = []
+
+	with EventProcessor(window=0.1, handler=lambda key, sha: calls.append((key, sha))) as processor:
+		for _ in range(10):
+			processor.submit("check_run", check_run_event())
+
+		assert calls == []
+
+		deadline = time.monotonic() + 5
+		while not calls and time.monotonic() < deadline:
+			time.sleep(0.05)
+
+		assert len(calls) == 1
+
+
+def test_processor_requires_github_or_handler() -> None:
+	with pytest.raises(ValueError, match="Either 'github' or 'handler' must be provided."):
+		EventProcessor()
+
+
+def test_receiver() -> None:
+	calls: List[Tuple[PullRequestKey, str]] = []
+	processor = EventProcessor(window=60, handler=lambda key, sha: calls.append((key, sha)))
+
+	with WebhookReceiver(processor, secret=SECRET) as receiver:
+		body = json.dumps(check_run_event()).encode("UTF-8")
+
+		headers = {"X-GitHub-Event": "check_run", "X-Hub-Signature-256": sign(body)}
+		assert requests.post(receiver.url, data=body, headers=headers).status_code == 202
+		assert requests.post(receiver.url, data=body, headers=headers).status_code == 202
+
+		headers["X-Hub-Signature-256"] = sign(b"something else")
+		assert requests.post(receiver.url, data=body, headers=headers).status_code == 401
+
+		# Valid JSON, but not the shape of the event.
+		for body in [b"[]", b"{}", b"not json"]:
+			headers = {"X-GitHub-Event": "check_run", "X-Hub-Signature-256": sign(body)}
+			assert requests.post(receiver.url, data=body, headers=headers).status_code == 400
+
+		assert processor.events_received == 2
+		assert calls == []
+
+	assert len(calls) == 1
+
+
+def test_receiver_not_started() -> None:
+	processor = EventProcessor(window=60, handler=lambda key, sha: None)
+	receiver = WebhookReceiver(processor, secret=SECRET)
+
+	# Stopping a server which was never started must not block.
+	receiver.stop()
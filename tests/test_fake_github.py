@@ -0,0 +1,266 @@
+# stdlib
+import datetime
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# 3rd party
+import pytest
+from github3 import GitHub
+from github3.exceptions import ForbiddenError, NotFoundError
+
+# this package
+from github3_utils import (
+		RateLimitExceeded,
+		echo_rate_limit,
+		get_user,
+		iter_owner_repos,
+		iter_repos,
+		protect_branch
+		)
+from github3_utils.apps import iter_installed_repos
+from github3_utils.check_labels import get_checks_for_pr, label_pr_failures
+from github3_utils.fake_github import FakeGitHub
+from github3_utils.secrets import get_public_key, get_secrets, set_secret
+from tests.test_apps import FAKE_KEY
+
+
+def test_iter_repos(fake_github: FakeGitHub, fake_github_client: GitHub) -> None:
+	fake_github.add_user("domdfcoding")
+	fake_github.add_org("sphinx-toolbox")
+
+	for idx in range(75):
+		fake_github.add_repo("sphinx-toolbox", f"repo-{idx:03d}")
+	fake_github.add_repo("domdfcoding", "github3-utils")
+
+	names = [repo.full_name for repo in iter_repos(fake_github_client, ["domdfcoding"], ["sphinx-toolbox"])]
+
+	assert names == [
+			"domdfcoding/github3-utils",
+			*(f"sphinx-toolbox/repo-{idx:03d}" for idx in range(75)),
+			]
+
+	# 2 owner lookups, then 1 page of 100 for each owner
+	assert fake_github.request_count == 4
+	assert ("GET", "/orgs/sphinx-toolbox") in fake_github.requests
+
+	with pytest.raises(NotFoundError):
+		list(iter_repos(fake_github_client, ["octocat"]))
+
+
+def test_iter_owner_repos(fake_github: FakeGitHub, fake_github_client: GitHub) -> None:
+	fake_github.add_user("domdfcoding")
+	fake_github.add_org("sphinx-toolbox")
+	fake_github.add_repo("domdfcoding", "github3-utils")
+
+	for idx in range(150):
+		fake_github.add_repo("sphinx-toolbox", f"repo-{idx:03d}", fork=idx % 3 == 0, private=idx % 5 == 0)
+
+	# No lookup of the owner, and the server does the filtering.
+	names = [repo.name for repo in iter_owner_repos(fake_github_client, "sphinx-toolbox", org=True, type="forks")]
+	assert names == [f"repo-{idx:03d}" for idx in range(0, 150, 3)]
+	assert fake_github.requests == [("GET", "/orgs/sphinx-toolbox/repos")]
+
+	repos = iter_owner_repos(fake_github_client, "sphinx-toolbox", org=True, type="private", direction="desc")
+	assert [repo.name for repo in repos] == [f"repo-{idx:03d}" for idx in range(145, -1, -5)]
+
+	with pytest.raises(ValueError, match="doesn't filter a user's or organization's repositories by 'visibility'"):
+		next(iter_owner_repos(fake_github_client, "sphinx-toolbox", org=True, visibility="private"))
+
+	# Without resolving owners, the same repositories are listed with two fewer requests.
+	resolved = [repo.full_name for repo in iter_repos(fake_github_client, ["domdfcoding"], ["sphinx-toolbox"])]
+	request_count = fake_github.request_count
+	unresolved = iter_repos(fake_github_client, ["domdfcoding"], ["sphinx-toolbox"], resolve=False)
+	assert [repo.full_name for repo in unresolved] == resolved
+	assert fake_github.request_count - request_count == 3
+
+	with pytest.raises(NotFoundError):
+		list(iter_repos(fake_github_client, ["octocat"], resolve=False))
+
+
+def test_iter_owner_repos_since(fake_github: FakeGitHub, fake_github_client: GitHub) -> None:
+	fake_github.add_org("sphinx-toolbox")
+
+	start = datetime.datetime(2021, 1, 1, tzinfo=datetime.timezone.utc)
+	for idx in range(250):
+		pushed_at = (start + datetime.timedelta(days=idx)).strftime("%Y-%m-%dT%H:%M:%SZ")
+		fake_github.add_repo("sphinx-toolbox", f"repo-{idx:03d}", pushed_at=pushed_at)
+
+	since = datetime.datetime(2021, 9, 1)
+	repos = iter_owner_repos(fake_github_client, "sphinx-toolbox", org=True, sort="pushed", since=since)
+
+	# Only the first page is needed.
+	assert [repo.name for repo in repos] == [f"repo-{idx:03d}" for idx in range(249, 242, -1)]
+	assert fake_github.request_count == 1
+
+	repos = iter_owner_repos(
+			fake_github_client, "sphinx-toolbox", org=True, sort="pushed", since="2021-05-01T00:00:00Z"
+			)
+	assert len(list(repos)) == 130
+	assert fake_github.request_count == 3
+
+	with pytest.raises(ValueError, match="'since' requires sort='pushed' or sort='updated', in descending order."):
+		list(iter_owner_repos(fake_github_client, "sphinx-toolbox", org=True, since=since))
+
+
+def test_get_user(fake_github: FakeGitHub) -> None:
+	fake_github.add_user("domdfcoding", name="Dominic Davis-Foster")
+
+	assert get_user(fake_github.client()).login == "domdfcoding"
+
+
+def test_iter_installed_repos(fake_github: FakeGitHub) -> None:
+	fake_github.add_org("sphinx-toolbox")
+	fake_github.add_user("domdfcoding")
+
+	for idx in range(150):
+		fake_github.add_repo("sphinx-toolbox", f"repo-{idx:03d}")
+
+	fake_github.add_repo("domdfcoding", "github3-utils")
+	fake_github.add_repo("domdfcoding", "private-repo")
+
+	# The app's ID is lower than the number of installations, so it mustn't be used to limit them.
+	fake_github.add_installation("sphinx-toolbox", app_id=1)
+	fake_github.add_installation("domdfcoding", repositories=["github3-utils"], app_id=1)
+
+	repos = iter_installed_repos(
+			client=fake_github.client(None),
+			private_key_pem=str(FAKE_KEY).encode("UTF-8"),
+			app_id=1,
+			)
+	names = [repo["full_name"] for repo in repos]
+
+	assert len(names) == 151
+	assert names[-1] == "domdfcoding/github3-utils"
+
+
+def test_label_pr_failures(fake_github: FakeGitHub, fake_github_client: GitHub) -> None:
+	fake_github.add_repo("sphinx-toolbox", "sphinx-autofixture")
+	fake_github.add_pull(
+			"sphinx-toolbox",
+			"sphinx-autofixture",
+			10,
+			check_runs={"Flake8": "failure", "mypy": "success", "docs": "in_progress"},
+			commits=3,
+			labels=["failure: mypy", "enhancement"],
+			)
+
+	pull = fake_github_client.pull_request("sphinx-toolbox", "sphinx-autofixture", 10)
+	assert pull is not None
+
+	checks = get_checks_for_pr(pull)
+	assert checks.failing == {"Flake8"}
+	assert checks.successful == {"mypy"}
+	assert checks.running == {"docs"}
+
+	assert label_pr_failures(pull) == {"failure: flake8", "enhancement"}
+	assert fake_github.labels("sphinx-toolbox", "sphinx-autofixture", 10) == ["enhancement", "failure: flake8"]
+
+	fake_github.set_check_run("sphinx-toolbox", "sphinx-autofixture", 10, "Flake8", "success")
+	assert label_pr_failures(pull) == {"enhancement"}
+
+
+def test_secrets(fake_github: FakeGitHub, fake_github_client: GitHub) -> None:
+	fake_github.add_repo("domdfcoding", "github3-utils")
+	repo = fake_github_client.repository("domdfcoding", "github3-utils")
+
+	assert get_secrets(repo) == []
+
+	public_key = get_public_key(repo)
+	assert set_secret(repo, "PYPI_TOKEN", "hunter2", public_key).status_code == 201
+	assert set_secret(repo, "PYPI_TOKEN", "hunter3", public_key).status_code == 204
+
+	assert get_secrets(repo) == ["PYPI_TOKEN"]
+	assert fake_github.secrets("domdfcoding", "github3-utils") == {"PYPI_TOKEN": "hunter3"}
+
+
+def test_protect_branch(fake_github: FakeGitHub, fake_github_client: GitHub) -> None:
+	fake_github.add_repo("domdfcoding", "github3-utils")
+	repo = fake_github_client.repository("domdfcoding", "github3-utils")
+	branch = repo.branch("master")
+
+	assert not branch.protected
+	assert protect_branch(branch, ["Flake8", "mypy"])
+
+	protection = fake_github.protection("domdfcoding", "github3-utils", "master")
+	assert protection is not None
+	assert protection["required_status_checks"]["contexts"] == ["Flake8", "mypy"]
+	assert repo.branch("master").protected
+
+	with pytest.raises(NotFoundError):
+		repo.branch("develop")
+
+
+def test_rate_limit(fake_github: FakeGitHub, fake_github_client: GitHub) -> None:
+	fake_github.add_user("domdfcoding")
+	fake_github.set_remaining(2)
+
+	response = fake_github_client.session.get(f"{fake_github.api}/users/domdfcoding")
+	assert response.headers["X-RateLimit-Limit"] == "5000"
+	assert response.headers["X-RateLimit-Remaining"] == '1'
+
+	fake_github_client.user("domdfcoding")
+
+	with pytest.raises(ForbiddenError, match="API rate limit exceeded"):
+		fake_github_client.user("domdfcoding")
+
+	# Other tokens have their own limit.
+	assert fake_github.client("OTHER_TOKEN").user("domdfcoding") is not None
+
+	with pytest.raises(RateLimitExceeded):
+		with echo_rate_limit(fake_github_client, verbose=False):
+			pass
+
+
+def test_rate_limit_reset() -> None:
+	with FakeGitHub(rate_limit=2, rate_limit_window=1) as server:
+		server.add_user("domdfcoding")
+		github = server.client()
+		server.set_remaining(0)
+
+		response = github.session.get(f"{server.api}/users/domdfcoding")
+		assert response.status_code == 403
+
+		# Once the window has passed the token gets a new limit.
+		time.sleep(max(int(response.headers["X-RateLimit-Reset"]) - time.time(), 0) + 0.05)
+
+		response = github.session.get(f"{server.api}/users/domdfcoding")
+		assert response.status_code == 200
+		assert response.headers["X-RateLimit-Remaining"] == '1'
+
+
+def test_server_error(fake_github: FakeGitHub, fake_github_client: GitHub) -> None:
+	fake_github.add_org("sphinx-toolbox")
+
+	response = fake_github_client.session.get(f"{fake_github.api}/orgs/sphinx-toolbox/repos?per_page=all")
+	assert response.status_code == 500
+	assert "Server Error" in response.json()["message"]
+	assert "X-RateLimit-Remaining" in response.headers
+
+	response = fake_github_client.session.post(f"{fake_github.api}/repos/sphinx-toolbox/a/labels", data=b"{")
+	assert response.status_code == 400
+
+
+def test_secondary_limit() -> None:
+	with FakeGitHub(secondary_limit_every=3, retry_after=30) as server:
+		server.add_user("domdfcoding")
+		github = server.client()
+
+		statuses = [github.session.get(f"{server.api}/users/domdfcoding") for _ in range(6)]
+
+	assert [response.status_code for response in statuses] == [200, 200, 403, 200, 200, 403]
+	assert statuses[2].headers["Retry-After"] == "30"
+	assert "secondary rate limit" in statuses[2].json()["message"]
+
+
+def test_max_concurrent_requests() -> None:
+	with FakeGitHub(latency=0.1, max_concurrent_requests=2, retry_after=5) as server:
+		server.add_user("domdfcoding")
+
+		def fetch(idx: int) -> int:
+			return server.client().session.get(f"{server.api}/users/domdfcoding").status_code
+
+		with ThreadPoolExecutor(6) as pool:
+			statuses = list(pool.map(fetch, range(6)))
+
+	assert statuses.count(200) >= 2
+	assert statuses.count(403) >= 1
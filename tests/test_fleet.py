@@ -0,0 +1,155 @@
+# 3rd party
+import pytest
+from domdf_python_tools.paths import PathPlus
+
+# this package
+from github3_utils.check_labels import Label
+from github3_utils.fake_github import FakeGitHub
+from github3_utils.fleet import Change, Plan, Snapshot, apply_plan, make_plan, take_snapshot
+
+LABELS = [
+		Label("failure: flake8", "#B60205", "The Flake8 check is failing."),
+		Label("stale", "ededed", "No activity for 30 days."),
+		]
+
+
+@pytest.fixture()
+def fleet(fake_github: FakeGitHub) -> FakeGitHub:
+	fake_github.add_org("sphinx-toolbox")
+	for idx in range(3):
+		fake_github.add_repo("sphinx-toolbox", f"repo-{idx}")
+	fake_github.add_repo("sphinx-toolbox", "old", archived=True)
+	return fake_github
+
+
+def test_snapshot(fleet: FakeGitHub, tmp_pathplus: PathPlus) -> None:
+	snapshot = take_snapshot(fleet.client(), orgs=["sphinx-toolbox"], jobs=2)
+
+	assert sorted(snapshot.repositories) == [
+			"sphinx-toolbox/old",
+			"sphinx-toolbox/repo-0",
+			"sphinx-toolbox/repo-1",
+			"sphinx-toolbox/repo-2",
+			]
+
+	state = snapshot.repositories["sphinx-toolbox/repo-0"]
+	assert state.default_branch == "master"
+	assert state.required_checks is None
+	assert state.labels == {}
+	assert state.secrets == []
+	assert state.error is None
+	assert snapshot.repositories["sphinx-toolbox/old"].archived
+
+	# One page of repositories, then three reads for each repository which isn't archived.
+	assert fleet.request_count == 1 + 3 * 3
+
+	snapshot.save(tmp_pathplus / "fleet.json")
+	assert Snapshot.load(tmp_pathplus / "fleet.json") == snapshot
+
+
+def test_snapshot_errors() -> None:
+	# The first read of repo-1 is rejected.
+	with FakeGitHub(secondary_limit_every=5) as server:
+		server.add_org("sphinx-toolbox")
+		for idx in range(3):
+			server.add_repo("sphinx-toolbox", f"repo-{idx}")
+
+		snapshot = take_snapshot(server.client(), orgs=["sphinx-toolbox"], jobs=1)
+
+	assert sorted(snapshot.repositories) == [
+			"sphinx-toolbox/repo-0",
+			"sphinx-toolbox/repo-1",
+			"sphinx-toolbox/repo-2",
+			]
+
+	error = snapshot.repositories["sphinx-toolbox/repo-1"].error
+	assert error is not None
+	assert "secondary rate limit" in error
+	assert snapshot.repositories["sphinx-toolbox/repo-0"].error is None
+	assert snapshot.repositories["sphinx-toolbox/repo-2"].error is None
+
+	# Repositories which couldn't be read aren't changed.
+	plan = make_plan(snapshot, labels=LABELS)
+	assert {change.repository for change in plan} == {"sphinx-toolbox/repo-0", "sphinx-toolbox/repo-2"}
+
+
+def test_plan_and_apply(fleet: FakeGitHub, tmp_pathplus: PathPlus) -> None:
+	github = fleet.client()
+	snapshot = take_snapshot(github, orgs=["sphinx-toolbox"])
+	requests_made = fleet.request_count
+
+	plan = make_plan(snapshot, status_checks=["Flake8", "mypy"], labels=LABELS, secrets=["PYPI_TOKEN"])
+
+	# Planning doesn't make any requests.
+	assert fleet.request_count == requests_made
+
+	assert len(plan) == 3 * 4
+	assert Change("sphinx-toolbox/repo-1", "protect_branch", "master", None, ["Flake8", "mypy"]) in plan
+	assert not any(change.repository == "sphinx-toolbox/old" for change in plan)
+	assert "sphinx-toolbox/repo-0: set secret 'PYPI_TOKEN'" in plan.describe().splitlines()
+
+	plan.save(tmp_pathplus / "plan.json")
+	assert Plan.load(tmp_pathplus / "plan.json") == plan
+
+	with pytest.raises(ValueError, match="No value was given for the secret"):
+		apply_plan(github, plan)
+
+	assert fleet.request_count == requests_made
+
+	results = apply_plan(github, plan, secrets={"PYPI_TOKEN": "hunter2"}, jobs=2)
+	assert [error for change, error in results] == [None] * len(plan)
+
+	# One write for each change, and the public key for each repository's secrets.
+	assert fleet.request_count == requests_made + len(plan) + 3
+
+	assert fleet.secrets("sphinx-toolbox", "repo-2") == {"PYPI_TOKEN": "hunter2"}
+	assert fleet.protection("sphinx-toolbox", "repo-2", "master") is not None
+
+	# Once applied, there is nothing left to do.
+	snapshot = take_snapshot(github, orgs=["sphinx-toolbox"])
+	assert snapshot.repositories["sphinx-toolbox/repo-0"].required_checks == ["Flake8", "mypy"]
+	plan = make_plan(snapshot, status_checks=["mypy", "Flake8"], labels=LABELS, secrets=["PYPI_TOKEN"])
+	assert len(plan) == 0
+	assert plan.describe() == "No changes."
+
+	# Unless the secrets are to be overwritten.
+	plan = make_plan(snapshot, secrets=["PYPI_TOKEN"], overwrite_secrets=True)
+	assert len(plan) == 3
+
+
+def test_update_label(fleet: FakeGitHub) -> None:
+	github = fleet.client()
+	apply_plan(github, make_plan(take_snapshot(github, orgs=["sphinx-toolbox"]), labels=LABELS))
+
+	labels = [Label("failure: flake8", "d93f0b", "The Flake8 check is failing."), LABELS[1]]
+	plan = make_plan(take_snapshot(github, orgs=["sphinx-toolbox"]), labels=labels)
+
+	assert [change.action for change in plan] == ["update_label"] * 3
+	assert plan.changes[0].before == {"color": "b60205", "description": "The Flake8 check is failing."}
+
+	assert [error for change, error in apply_plan(github, plan)] == [None] * 3
+	assert len(make_plan(take_snapshot(github, orgs=["sphinx-toolbox"]), labels=labels)) == 0
+
+
+def test_errors(fleet: FakeGitHub) -> None:
+	github = fleet.client()
+	plan = Plan([
+			Change(
+					"sphinx-toolbox/missing",
+					"create_label",
+					"stale",
+					None,
+					{"color": "ededed", "description": ''},
+					),
+			Change(
+					"sphinx-toolbox/repo-0",
+					"create_label",
+					"stale",
+					None,
+					{"color": "ededed", "description": ''},
+					),
+			])
+
+	(_, error), (_, success) = apply_plan(github, plan)
+	assert error is not None
+	assert success is None
@@ -0,0 +1,70 @@
+# stdlib
+import subprocess
+import sys
+from typing import Callable, Set
+
+# 3rd party
+import pytest
+
+# this package
+import github3_utils
+
+_CHECK_MODULES = """
+import sys
+import {imports}
+
+loaded = sorted({{name.split('.')[0] for name in sys.modules}} & {unwanted!r})
+print(','.join(loaded))
+"""
+
+_HEAVY_MODULES = {"github3", "attr", "apeye_core", "click", "requests", "nacl", "domdf_python_tools"}
+
+
+@pytest.mark.parametrize(
+		"imports, unwanted",
+		[
+				("github3_utils, github3_utils.headers, github3_utils.secrets", _HEAVY_MODULES),
+				("github3_utils.index, github3_utils.events, github3_utils.metrics", _HEAVY_MODULES),
+				# ContextSwitcher and the tracing spans are attrs classes.
+				("github3_utils.apps, github3_utils.tracing", _HEAVY_MODULES - {"attr"}),
+				],
+		)
+def test_import_is_lazy(imports: str, unwanted: Set[str]) -> None:
+	result = subprocess.run(
+			[sys.executable, "-c", _CHECK_MODULES.format(imports=imports, unwanted=unwanted)],
+			check=True,
+			capture_output=True,
+			text=True,
+			)
+
+	assert result.stdout.strip() == ''
+
+
+def _import_time(module: str) -> int:
+	# Returns the cumulative time taken to import the module, in microseconds.
+
+	result = subprocess.run(
+			[sys.executable, "-X", "importtime", "-c", f"import {module}"],
+			check=True,
+			capture_output=True,
+			text=True,
+			)
+
+	# The last line is the cumulative time for the module itself.
+	return int(result.stderr.strip().splitlines()[-1].split('|')[1])
+
+
+def test_import_time(record_property: Callable[[str, object], None]) -> None:
+	cumulative_us = _import_time("github3_utils")
+	record_property("import_time_us", cumulative_us)
+
+	# Importing github3_utils should take a fraction of the time needed to import github3,
+	# which it used to import eagerly. This only fails if a heavy dependency is imported again.
+	assert cumulative_us < _import_time("github3") / 2
+
+
+def test_impersonate() -> None:
+	assert github3_utils.Impersonate.__module__ == "github3_utils"
+
+	with pytest.raises(AttributeError, match="has no attribute 'Nonexistent'"):
+		github3_utils.Nonexistent
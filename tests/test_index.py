@@ -0,0 +1,159 @@
+# stdlib
+import base64
+import gzip
+import json
+import threading
+from typing import Any, Callable, Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+# 3rd party
+import pytest
+import requests
+from domdf_python_tools.paths import PathPlus
+from github3 import GitHub
+from requests.adapters import BaseAdapter
+
+# this package
+from github3_utils.index import RepositoryIndex
+
+cassette_dir = PathPlus(__file__).parent / "cassettes"
+
+
+def load_org_repos() -> List[Dict[str, Any]]:
+	cassette = (cassette_dir / "test_get_repos_org.json").load_json()
+	body = cassette["http_interactions"][1]["response"]["body"]["base64_string"]
+	return json.loads(gzip.decompress(base64.b64decode(body)))
+
+
+class RepoListAdapter(BaseAdapter):
+	"""
+	Serves a repository listing, most recently updated first, two repositories per page.
+	"""
+
+	def __init__(self, repos: List[Dict[str, Any]]):
+		super().__init__()
+		self.repos = repos
+		self.urls: List[str] = []
+		self.on_send: Optional[Callable[[int], None]] = None
+
+	def send(self, request: requests.PreparedRequest, **kwargs) -> requests.Response:  # type: ignore[override]
+		assert request.url is not None
+		self.urls.append(request.url)
+
+		query = parse_qs(urlparse(request.url).query)
+		page = int(query.get("page", ['1'])[0])
+
+		if self.on_send is not None:
+			self.on_send(page)
+		repos = sorted(self.repos, key=lambda r: r["updated_at"], reverse=True)
+
+		response = requests.Response()
+		response.status_code = 200
+		response.url = request.url
+		response.request = request
+		response._content = json.dumps(repos[(page - 1) * 2:page * 2]).encode("UTF-8")
+		response.headers["Content-Type"] = "application/json"
+
+		if page * 2 < len(repos):
+			next_url = f"https://api.github.com/orgs/sphinx-toolbox/repos?page={page + 1}"
+			response.headers["Link"] = f'<{next_url}>; rel="next"'
+
+		return response
+
+	def close(self) -> None:
+		pass
+
+
+@pytest.fixture()
+def repos() -> List[Dict[str, Any]]:
+	return load_org_repos()
+
+
+def test_update_and_query(repos: List[Dict[str, Any]]) -> None:
+	repos[0]["topics"] = ["sphinx", "python"]
+	repos[1]["topics"] = ["sphinx"]
+	repos[2]["archived"] = True
+
+	with RepositoryIndex() as index:
+		assert index.update(repos) == 8
+		assert len(index) == 8
+		assert "sphinx-toolbox/dict2css" in index
+		assert "sphinx-toolbox/not-a-repo" not in index
+
+		# Unchanged repositories are not rewritten.
+		assert index.update(repos) == 0
+
+		assert index.full_names(topic="sphinx") == ["sphinx-toolbox/default_values", "sphinx-toolbox/dict2css"]
+		assert index.full_names(topic="python") == ["sphinx-toolbox/default_values"]
+		assert index.full_names(language="html") == ["sphinx-toolbox/toctree_plus"]
+		assert index.full_names(archived=True) == ["sphinx-toolbox/extras_require"]
+		assert len(index.full_names(owner="Sphinx-Toolbox", archived=False)) == 7
+		assert index.full_names(owner="domdfcoding") == []
+
+		repo = index.get("sphinx-toolbox/toctree_plus")
+		assert repo is not None
+		assert repo["language"] == "HTML"
+		assert index.get("sphinx-toolbox/not-a-repo") is None
+
+		assert index.repos(language="HTML") == [repos[7]]
+
+
+def test_sync_incremental(repos: List[Dict[str, Any]], tmp_pathplus: PathPlus) -> None:
+	github = GitHub(token="FAKE_TOKEN")  # nosec: B106
+	adapter = RepoListAdapter(repos)
+	github.session.mount("https://", adapter)
+
+	with RepositoryIndex(tmp_pathplus / "repos.db") as index:
+		assert index.sync(github, orgs=["sphinx-toolbox"]) == 8
+		assert len(adapter.urls) == 4
+		assert "sort=updated" in adapter.urls[0]
+		assert "direction=desc" in adapter.urls[0]
+		assert index.last_updated("sphinx-toolbox") == "2021-01-19T23:14:11Z"
+
+	repos[6]["updated_at"] = "2021-02-01T00:00:00Z"
+
+	# Updated in the same second as the newest repository seen by the previous sync.
+	repos[0]["updated_at"] = repos[0]["pushed_at"] = "2021-01-19T23:14:11Z"
+	adapter.urls.clear()
+
+	with RepositoryIndex(tmp_pathplus / "repos.db") as index:
+		assert index.sync(github, orgs=["sphinx-toolbox"]) == 2
+		assert len(adapter.urls) == 2
+		repo = index.get("sphinx-toolbox/default_values")
+		assert repo is not None
+		assert repo["pushed_at"] == "2021-01-19T23:14:11Z"
+		assert index.last_updated("sphinx-toolbox") == "2021-02-01T00:00:00Z"
+
+		index.remove_owner("sphinx-toolbox")
+		assert len(index) == 0
+		assert index.last_updated("sphinx-toolbox") is None
+
+
+def test_sync_without_lock(repos: List[Dict[str, Any]]) -> None:
+	github = GitHub(token="FAKE_TOKEN")  # nosec: B106
+	adapter = RepoListAdapter(repos)
+	github.session.mount("https://", adapter)
+	counts: List[int] = []
+
+	with RepositoryIndex() as index:
+
+		def on_send(page: int) -> None:
+			# Queries from other threads aren't held up while pages are fetched.
+			thread = threading.Thread(target=lambda: counts.append(len(index)))
+			thread.start()
+			thread.join(timeout=5)
+			assert not thread.is_alive()
+
+			if page == 3:
+				raise ConnectionError
+
+		adapter.on_send = on_send
+
+		with pytest.raises(ConnectionError):
+			index.sync(github, orgs=["sphinx-toolbox"])
+
+		assert counts == [0, 2, 4]
+
+		# The pages fetched are kept, but the next sync starts again from the top.
+		assert len(index) == 4
+		assert index.last_updated("sphinx-toolbox") is None
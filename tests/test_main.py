@@ -0,0 +1,181 @@
+# stdlib
+import json
+from typing import Any, Dict, List, Sequence
+
+# 3rd party
+import pytest
+from click.testing import CliRunner, Result
+from domdf_python_tools.paths import PathPlus
+
+# this package
+from github3_utils.__main__ import main
+from github3_utils.fake_github import FakeGitHub
+from tests.test_apps import FAKE_KEY
+
+
+def invoke(fake_github: FakeGitHub, *args: str, tokens: Sequence[str] = ("FAKE_TOKEN", )) -> Result:
+	token_args = [arg for token in tokens for arg in ("-t", token)]
+	return CliRunner().invoke(main, args=[*args, "--api-url", fake_github.api, *token_args])
+
+
+def records(result: Result) -> List[Dict[str, Any]]:
+	return [json.loads(line) for line in result.stdout.splitlines()]
+
+
+@pytest.mark.parametrize("jobs", ['1', '4'])
+def test_repos(fake_github: FakeGitHub, jobs: str) -> None:
+	fake_github.add_user("domdfcoding")
+	fake_github.add_org("sphinx-toolbox")
+	fake_github.add_repo("domdfcoding", "github3-utils")
+
+	for idx in range(120):
+		fake_github.add_repo("sphinx-toolbox", f"repo-{idx:03d}")
+
+	result = invoke(fake_github, "repos", "-u", "domdfcoding", "-o", "sphinx-toolbox", "--jobs", jobs)
+	assert result.exit_code == 0, result.output
+
+	names = [record["full_name"] for record in records(result)]
+	assert len(names) == 121
+	assert set(names) == {"domdfcoding/github3-utils", *(f"sphinx-toolbox/repo-{idx:03d}" for idx in range(120))}
+
+	# The repositories for each owner are in order, regardless of the number of jobs.
+	assert [name for name in names if name.startswith("sphinx-toolbox/")
+			] == sorted(name for name in names if name.startswith("sphinx-toolbox/"))
+
+
+def test_repos_error(fake_github: FakeGitHub) -> None:
+	fake_github.add_user("domdfcoding")
+	fake_github.add_repo("domdfcoding", "github3-utils")
+
+	result = invoke(fake_github, "repos", "-u", "domdfcoding", "-u", "octocat", "-j", '2')
+	assert result.exit_code == 1
+
+	output = records(result)
+	assert {"target": "octocat", "error": "NotFoundError: 404 Not Found"} in output
+	assert any(record.get("full_name") == "domdfcoding/github3-utils" for record in output)
+
+
+def test_installations(fake_github: FakeGitHub, tmp_pathplus: PathPlus) -> None:
+	fake_github.add_org("sphinx-toolbox")
+	fake_github.add_user("domdfcoding")
+
+	for idx in range(150):
+		fake_github.add_repo("sphinx-toolbox", f"repo-{idx:03d}")
+
+	fake_github.add_repo("domdfcoding", "github3-utils")
+	fake_github.add_repo("domdfcoding", "private-repo")
+
+	org_installation = fake_github.add_installation("sphinx-toolbox", app_id=89426)
+	user_installation = fake_github.add_installation("domdfcoding", repositories=["github3-utils"], app_id=89426)
+
+	(tmp_pathplus / "key.pem").write_text(str(FAKE_KEY))
+
+	result = CliRunner().invoke(
+			main,
+			args=[
+					"installations",
+					"--app-id",
+					"89426",
+					"--private-key",
+					str(tmp_pathplus / "key.pem"),
+					"--api-url",
+					fake_github.api,
+					"-j",
+					'2',
+					],
+			)
+	assert result.exit_code == 0, result.output
+
+	output = records(result)
+	assert len(output) == 151
+	user_repos = [record["full_name"] for record in output if record["installation_id"] == user_installation]
+	assert user_repos == ["domdfcoding/github3-utils"]
+	assert sum(record["installation_id"] == org_installation for record in output) == 150
+
+
+def test_label_failures(fake_github: FakeGitHub) -> None:
+	fake_github.add_repo("sphinx-toolbox", "sphinx-autofixture")
+	fake_github.add_pull("sphinx-toolbox", "sphinx-autofixture", 10, check_runs={"Flake8": "failure"})
+	fake_github.add_pull("sphinx-toolbox", "sphinx-autofixture", 11, check_runs={"mypy": "failure"})
+	fake_github.add_pull("sphinx-toolbox", "sphinx-autofixture", 12, check_runs={"mypy": "success"})
+
+	result = invoke(fake_github, "label-failures", "sphinx-toolbox/sphinx-autofixture", "-j", '3')
+	assert result.exit_code == 0, result.output
+
+	assert sorted(
+			records(result), key=lambda record: record["number"]
+			) == [
+					{
+							"repository": "sphinx-toolbox/sphinx-autofixture",
+							"number": 10,
+							"labels": ["failure: flake8"]
+							},
+					{"repository": "sphinx-toolbox/sphinx-autofixture", "number": 11, "labels": ["failure: mypy"]},
+					{"repository": "sphinx-toolbox/sphinx-autofixture", "number": 12, "labels": []},
+					]
+
+	fake_github.set_check_run("sphinx-toolbox", "sphinx-autofixture", 10, "Flake8", "success")
+	result = invoke(fake_github, "label-failures", "sphinx-toolbox/sphinx-autofixture", "--number", "10")
+	assert records(result) == [{"repository": "sphinx-toolbox/sphinx-autofixture", "number": 10, "labels": []}]
+
+
+def test_sync_secrets(fake_github: FakeGitHub, monkeypatch) -> None:
+	fake_github.add_repo("domdfcoding", "github3-utils")
+	fake_github.add_repo("domdfcoding", "domdf_python_tools")
+
+	monkeypatch.setenv("PYPI_TOKEN", "hunter2")
+	monkeypatch.setenv("ANACONDA_TOKEN", "hunter3")
+
+	args = ["sync-secrets", "domdfcoding/github3-utils", "domdfcoding/domdf_python_tools", "-j", '2']
+	result = invoke(fake_github, *args, "-s", "PYPI_TOKEN", "-s", "ANACONDA_TOKEN")
+	assert result.exit_code == 0, result.output
+
+	output = records(result)
+	assert len(output) == 4
+	assert {record["status"] for record in output} == {"created"}
+
+	for repo in ["github3-utils", "domdf_python_tools"]:
+		assert fake_github.secrets("domdfcoding", repo) == {"PYPI_TOKEN": "hunter2", "ANACONDA_TOKEN": "hunter3"}
+
+	result = invoke(fake_github, "sync-secrets", "domdfcoding/github3-utils", "-s", "PYPI_TOKEN")
+	assert records(result) == [
+			{"repository": "domdfcoding/github3-utils", "secret": "PYPI_TOKEN", "status": "updated"},
+			]
+
+	result = invoke(fake_github, "sync-secrets", "domdfcoding/github3-utils", "-s", "NOT_SET")
+	assert result.exit_code == 2
+	assert "NOT_SET" in result.output
+
+
+def test_protect(fake_github: FakeGitHub) -> None:
+	fake_github.add_repo("domdfcoding", "github3-utils")
+
+	result = invoke(fake_github, "protect", "domdfcoding/github3-utils", "domdfcoding/missing", "-c", "Flake8")
+	assert result.exit_code == 1
+
+	assert records(result) == [
+			{"repository": "domdfcoding/github3-utils", "branch": "master", "protected": True},
+			{"target": "domdfcoding/missing", "error": "NotFoundError: 404 Not Found"},
+			]
+
+	protection = fake_github.protection("domdfcoding", "github3-utils", "master")
+	assert protection is not None
+	assert protection["required_status_checks"]["contexts"] == ["Flake8"]
+
+
+def test_bad_repository(fake_github: FakeGitHub) -> None:
+	result = invoke(fake_github, "protect", "github3-utils")
+	assert result.exit_code == 2
+	assert "'github3-utils' is not of the form OWNER/REPO" in result.output
+
+
+def test_multiple_tokens(fake_github: FakeGitHub) -> None:
+	fake_github.add_user("domdfcoding")
+	for idx in range(3):
+		fake_github.add_repo("domdfcoding", f"repo-{idx}")
+
+	fake_github.set_remaining(0, "FIRST_TOKEN")
+
+	result = invoke(fake_github, "repos", "-u", "domdfcoding", tokens=["FIRST_TOKEN", "SECOND_TOKEN"])
+	assert result.exit_code == 0, result.output
+	assert len(records(result)) == 3
@@ -0,0 +1,113 @@
+# stdlib
+import re
+from typing import Dict, Tuple
+
+# 3rd party
+import pytest
+from github3 import GitHub
+
+# this package
+from github3_utils import get_repos
+from github3_utils.metrics import RequestMetrics, normalise_endpoint
+
+
+@pytest.mark.parametrize(
+		"url, expected",
+		[
+				("https://api.github.com/user", "/user"),
+				("https://api.github.com/users/domdfcoding/repos?per_page=100", "/users/{username}/repos"),
+				("https://api.github.com/user/8050853/repos?page=2", "/user/{id}/repos"),
+				("https://api.github.com/orgs/sphinx-toolbox", "/orgs/{org}"),
+				("https://api.github.com/repos/domdfcoding/repo_helper_demo", "/repos/{owner}/{repo}"),
+				(
+						"https://api.github.com/repos/sphinx-toolbox/sphinx-autofixture/pulls/10/commits",
+						"/repos/{owner}/{repo}/pulls/{id}/commits",
+						),
+				(
+						"https://api.github.com/repos/a/b/commits/108346fee3ef6a780defddeecb004f5ce22f32e5/check-runs",
+						"/repos/{owner}/{repo}/commits/{ref}/check-runs",
+						),
+				(
+						"https://api.github.com/repos/a/b/git/trees/108346fee3ef6a780defddeecb004f5ce22f32e5",
+						"/repos/{owner}/{repo}/git/trees/{sha}",
+						),
+				(
+						"https://api.github.com/repos/a/b/issues/10/labels/bug",
+						"/repos/{owner}/{repo}/issues/{id}/labels/{name}",
+						),
+				(
+						"https://api.github.com/repos/a/b/branches/master/protection",
+						"/repos/{owner}/{repo}/branches/{branch}/protection",
+						),
+				(
+						"https://api.github.com/repos/a/b/actions/secrets/GREETING",
+						"/repos/{owner}/{repo}/actions/secrets/{secret_name}",
+						),
+				(
+						"https://api.github.com/repos/a/b/actions/secrets/public-key",
+						"/repos/{owner}/{repo}/actions/secrets/public-key",
+						),
+				(
+						"https://api.github.com/app/installations/13501683/access_tokens",
+						"/app/installations/{installation_id}/access_tokens",
+						),
+				("https://github.example.com/api/v3/repos/a/b", "/repos/{owner}/{repo}"),
+				],
+		)
+def test_normalise_endpoint(url: str, expected: str) -> None:
+	assert normalise_endpoint(url) == expected
+
+
+def parse_samples(output: str) -> Dict[Tuple[str, ...], float]:
+	"""
+	Parse the Prometheus output into a mapping of ``(metric name, *label values)`` to values.
+	"""
+
+	samples = {}
+
+	for line in output.splitlines():
+		if line.startswith('#') or not line:
+			continue
+
+		match = re.match(r"^github3_utils_(\w+)\{(.*)\} (.*)$", line)
+		assert match is not None, line
+		labels = re.findall(r'\w+="([^"]*)"', match.group(2))
+		key = (match.group(1), *labels)
+		samples[key] = float(match.group(3))
+
+	return samples
+
+
+@pytest.mark.usefixtures("cassette")
+def test_get_repos(github_client: GitHub) -> None:
+	metrics = RequestMetrics()
+	metrics.install(github_client)
+	metrics.install(github_client)
+	assert github_client.session.hooks["response"].count(metrics.record) == 1
+
+	user = github_client.user("domdfcoding")
+	repos = list(get_repos(user))
+
+	metrics.uninstall(github_client)
+	assert metrics.record not in github_client.session.hooks["response"]
+
+	output = metrics.to_prometheus()
+	samples = parse_samples(output)
+
+	assert "# TYPE github3_utils_requests_total counter" in output
+	assert samples["requests_total", "GET", "/users/{username}", '', "200"] == 1
+	assert samples["requests_total", "GET", "/users/{username}/repos", "get_repos", "200"] == 1
+	assert samples["requests_total", "GET", "/user/{id}/repos", "get_repos", "200"] == 1
+
+	assert "# TYPE github3_utils_request_duration_seconds histogram" in output
+	assert samples["request_duration_seconds_bucket", "GET", "/users/{username}/repos", "get_repos", "+Inf"] == 1
+	assert samples["request_duration_seconds_count", "GET", "/users/{username}", ''] == 1
+
+	assert samples["ratelimit_cost_total", "core", "/users/{username}/repos", "get_repos"] == 1
+	assert samples["ratelimit_remaining", "core"] >= 0
+	assert samples["response_bytes_total", "/users/{username}/repos", "get_repos"] > 0
+
+	assert len(repos) > 100
+
+	metrics.reset()
+	assert "github3_utils_requests_total{" not in metrics.to_prometheus()
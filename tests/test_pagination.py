@@ -0,0 +1,165 @@
+# stdlib
+import json
+import threading
+from typing import Any, Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+# 3rd party
+import pytest
+import requests
+from github3 import GitHub
+from github3.exceptions import NotFoundError
+from github3.repos import ShortRepository
+from requests.adapters import BaseAdapter
+
+# this package
+from github3_utils import get_repos
+from github3_utils.fake_github import FakeGitHub
+from github3_utils.pagination import Paginator
+
+URL = "https://api.github.com/items"
+
+
+class PageAdapter(BaseAdapter):
+	"""
+	Serves numbered items, giving either a ``Link`` header or the ``total_count``.
+	"""
+
+	def __init__(self, num_items: int, *, links: bool = True, missing_page: Optional[int] = None):
+		super().__init__()
+		self.num_items = num_items
+		self.links = links
+		self.missing_page = missing_page
+		self.pages: List[int] = []
+		self.requested = threading.Condition()
+
+	def send(self, request: requests.PreparedRequest, **kwargs) -> requests.Response:  # type: ignore[override]
+		assert request.url is not None
+
+		query = parse_qs(urlparse(request.url).query)
+		page = int(query.get("page", ['1'])[0])
+		per_page = int(query.get("per_page", ["30"])[0])
+		numbers = range((page - 1) * per_page, min(page * per_page, self.num_items))
+		items = [{"number": number} for number in numbers]
+
+		response = requests.Response()
+		response.url = request.url
+		response.request = request
+		response.headers["Content-Type"] = "application/json"
+
+		if page == self.missing_page:
+			response.status_code = 404
+			response._content = b'{"message": "Not Found"}'
+		elif self.links:
+			response.status_code = 200
+			response._content = json.dumps(items).encode("UTF-8")
+			if page * per_page < self.num_items:
+				response.headers["Link"] = f'<{URL}?per_page={per_page}&page={page + 1}>; rel="next"'
+		else:
+			response.status_code = 200
+			response._content = json.dumps({"total_count": self.num_items, "items": items}).encode("UTF-8")
+
+		with self.requested:
+			self.pages.append(page)
+			self.requested.notify_all()
+
+		return response
+
+	def wait_for(self, num_pages: int, timeout: float = 1) -> bool:
+		with self.requested:
+			return self.requested.wait_for(lambda: len(self.pages) >= num_pages, timeout)
+
+	def close(self) -> None:
+		pass
+
+
+def make_client(adapter: BaseAdapter) -> GitHub:
+	github = GitHub(token="FAKE_TOKEN")  # nosec: B106
+	github.session.mount("https://", adapter)
+	return github
+
+
+@pytest.mark.parametrize("read_ahead", [0, 1, 3])
+@pytest.mark.parametrize("links", [True, False])
+def test_all_pages(read_ahead: int, links: bool) -> None:
+	adapter = PageAdapter(250, links=links)
+	github = make_client(adapter)
+
+	items_key = None if links else "items"
+	paginator: Paginator[Dict[str, Any]] = Paginator(
+			github,
+			URL,
+			items_key=items_key,
+			read_ahead=read_ahead,
+			)
+
+	assert [item["number"] for item in paginator] == list(range(250))
+	assert paginator.pages_fetched == 3
+	assert adapter.pages == [1, 2, 3]
+
+
+def test_read_ahead() -> None:
+	adapter = PageAdapter(250)
+	pages = iter(Paginator(make_client(adapter), URL, per_page=50, read_ahead=2))
+
+	# While the caller is working on the first page the next two are fetched, but no more.
+	next(pages)
+	assert adapter.wait_for(3)
+	assert not adapter.wait_for(4, timeout=0.2)
+
+	assert len(list(pages)) == 249
+	assert adapter.pages == [1, 2, 3, 4, 5]
+
+
+def test_no_read_ahead() -> None:
+	adapter = PageAdapter(250)
+	pages = iter(Paginator(make_client(adapter), URL, read_ahead=0))
+
+	next(pages)
+	assert not adapter.wait_for(2, timeout=0.2)
+
+
+def test_close_early() -> None:
+	adapter = PageAdapter(1000)
+	pages = iter(Paginator(make_client(adapter), URL, per_page=10))
+
+	for _ in range(15):
+		next(pages)
+
+	pages.close()  # type: ignore[attr-defined]
+
+	# The background thread has finished, and stopped once it noticed the caller had.
+	assert not any(thread.name == "github3-utils-paginator" for thread in threading.enumerate())
+	assert len(adapter.pages) <= 4
+
+
+def test_error() -> None:
+	adapter = PageAdapter(250, missing_page=2)
+	pages = iter(Paginator(make_client(adapter), URL))
+
+	assert len([next(pages) for _ in range(100)]) == 100
+
+	with pytest.raises(NotFoundError):
+		next(pages)
+
+	assert not any(thread.name == "github3-utils-paginator" for thread in threading.enumerate())
+
+
+def test_fake_github(fake_github: FakeGitHub, fake_github_client: GitHub) -> None:
+	fake_github.add_org("sphinx-toolbox")
+
+	for idx in range(250):
+		fake_github.add_repo("sphinx-toolbox", f"repo-{idx:03d}")
+
+	org = fake_github_client.organization("sphinx-toolbox")
+	assert org is not None
+
+	url = org._build_url("users", "sphinx-toolbox", "repos")
+	paginator = Paginator(org, url, {"sort": "full_name"}, ShortRepository)
+
+	repos = list(paginator)
+	assert all(isinstance(repo, ShortRepository) for repo in repos)
+	assert [repo.name for repo in repos] == [f"repo-{idx:03d}" for idx in range(250)]
+	assert paginator.pages_fetched == 3
+
+	assert [repo.name for repo in get_repos(org)] == [repo.name for repo in repos]
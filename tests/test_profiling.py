@@ -0,0 +1,86 @@
+# stdlib
+import io
+import pstats
+from typing import Iterator
+
+# 3rd party
+import pytest
+from domdf_python_tools.paths import PathPlus
+from github3.models import GitHubCore
+from requests import Response, Session
+
+# this package
+from github3_utils import get_user, iter_repos
+from github3_utils.fake_github import FakeGitHub
+from github3_utils.profiling import Profiler
+
+
+@pytest.fixture()
+def slow_github() -> Iterator[FakeGitHub]:
+	with FakeGitHub(latency=0.01) as server:
+		server.add_user("domdfcoding")
+		for idx in range(150):
+			server.add_repo("domdfcoding", f"repo-{idx:03d}")
+		yield server
+
+
+def test_phases(slow_github: FakeGitHub) -> None:
+	github = slow_github.client()
+	output = io.StringIO()
+
+	with Profiler(output=output) as profiler:
+		names = [repo.name for repo in iter_repos(github, ["domdfcoding"])]
+		assert get_user(github).login == "domdfcoding"
+
+		# Requests made outside of a helper are recorded separately.
+		github.repository("domdfcoding", "repo-000")
+
+	assert len(names) == 150
+
+	stats = profiler.stats["iter_repos"]
+	assert stats.calls == 1
+	assert stats.network >= 0.01  # Looking up the user.
+	assert stats.construct > 0
+	assert stats.children > 0
+
+	# The two pages of repositories are listed by get_repos.
+	stats = profiler.stats["get_repos"]
+	assert stats.calls == 1
+	assert stats.network >= 0.02
+	assert stats.decode > 0
+	assert stats.total >= stats.network + stats.decode
+
+	assert profiler.stats["get_user"].calls == 1
+	assert profiler.stats["<no helper>"].network >= 0.01
+
+	lines = output.getvalue().splitlines()
+	assert lines[0].split() == ["helper", "calls", "total", "network", "decode", "construct", "other"]
+	helpers = [line.rsplit(maxsplit=6)[0] for line in lines[1:]]
+	assert sorted(helpers) == ["<no helper>", "get_repos", "get_user", "iter_repos"]
+
+
+def test_restores_methods(slow_github: FakeGitHub) -> None:
+	originals = (Session.send, Response.json, GitHubCore.__init__)
+
+	with Profiler():
+		assert Session.send is not originals[0]
+
+		with pytest.raises(RuntimeError, match="Another profiler is already running."):
+			Profiler().start()
+
+	assert (Session.send, Response.json, GitHubCore.__init__) == originals
+
+	# Nothing is recorded once stopped.
+	profiler = Profiler()
+	profiler.start()
+	profiler.stop()
+	get_user(slow_github.client())
+	assert profiler.stats == {}
+
+
+def test_stats_file(slow_github: FakeGitHub, tmp_pathplus: PathPlus) -> None:
+	with Profiler(stats_file=tmp_pathplus / "profile.pstats"):
+		get_user(slow_github.client())
+
+	stats = pstats.Stats(str(tmp_pathplus / "profile.pstats"))
+	assert any(function == "get_user" for (filename, line, function) in stats.stats)  # type: ignore[attr-defined]
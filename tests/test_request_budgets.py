@@ -0,0 +1,134 @@
+"""
+Benchmarks which replay the recorded cassettes, measuring each public function's
+wall time, peak memory use and number of HTTP requests.
+
+Each function has a declared request budget, and the benchmark fails if the function exceeds it.
+The measurements are attached to the test report as ``user_properties``
+(e.g. they are included in the output of ``pytest --junitxml``).
+"""  # noqa: D400
+
+# stdlib
+import time
+import tracemalloc
+from typing import Any, Callable, Iterator, NamedTuple
+
+# 3rd party
+import pytest
+from _pytest.fixtures import FixtureRequest
+from betamax import Betamax  # type: ignore[import-untyped]
+from github3 import GitHub
+
+# this package
+from github3_utils import get_repos, protect_branch
+from github3_utils.apps import iter_installed_repos
+from github3_utils.check_labels import get_checks_for_pr, label_pr_failures
+from github3_utils.secrets import get_public_key, get_secrets
+from tests.test_apps import FAKE_KEY
+
+
+class Measurement(NamedTuple):
+	requests: int
+	seconds: float
+	peak_memory: int
+
+
+def measure(github: GitHub, function: Callable[[], Any]) -> Measurement:
+	"""
+	Call ``function``, fully consuming the result if it is an iterator.
+	"""
+
+	tracemalloc.start()
+	start_requests = github.session.request_counter
+	start_time = time.perf_counter()
+
+	try:
+		result = function()
+		if isinstance(result, Iterator):
+			for _ in result:
+				pass
+
+		seconds = time.perf_counter() - start_time
+		peak_memory = tracemalloc.get_traced_memory()[1]
+	finally:
+		tracemalloc.stop()
+
+	return Measurement(github.session.request_counter - start_requests, seconds, peak_memory)
+
+
+@pytest.fixture()
+def check_budget(request: FixtureRequest) -> Callable[[GitHub, Callable[[], Any], int], Measurement]:
+
+	def check(github: GitHub, function: Callable[[], Any], budget: int) -> Measurement:
+		measurement = measure(github, function)
+
+		for name, value in measurement._asdict().items():
+			request.node.user_properties.append((name, value))
+		request.node.user_properties.append(("budget", budget))
+
+		assert measurement.requests <= budget, (
+				f"Made {measurement.requests} requests, but the budget is {budget}."
+				)
+
+		return measurement
+
+	return check
+
+
+def use_cassette(github: GitHub, cassette_name: str, **kwargs: Any) -> Betamax:
+	vcr = Betamax(github.session)
+	vcr.use_cassette(cassette_name, record="none", **kwargs)
+	return vcr
+
+
+def test_get_repos(github_client: GitHub, check_budget: Callable) -> None:
+	with use_cassette(github_client, "test_get_repos"):
+		user = github_client.user("domdfcoding")
+		check_budget(github_client, lambda: get_repos(user), budget=2)
+
+
+def test_iter_installed_repos(check_budget: Callable) -> None:
+	github = GitHub()
+
+	# Recorded when the app's ID was passed as the number of installations to list.
+	with use_cassette(github, "test_iter_installed_repos", match_requests_on=["method", "uri-without-per-page"]):
+
+		def function() -> Iterator:
+			return iter_installed_repos(
+					client=github,
+					private_key_pem=str(FAKE_KEY).encode("UTF-8"),
+					app_id=89426,
+					)
+
+		# 3 installations, one of which has two pages of repositories.
+		check_budget(github, function, budget=11)
+
+
+def test_get_checks_for_pr(github_client: GitHub, check_budget: Callable) -> None:
+	with use_cassette(github_client, "test_check_labels"):
+		pull = github_client.repository("sphinx-toolbox", "sphinx-autofixture").pull_request(10)
+		check_budget(github_client, lambda: get_checks_for_pr(pull), budget=1)
+
+
+def test_label_pr_failures(github_client: GitHub, check_budget: Callable) -> None:
+	with use_cassette(github_client, "test_check_labels"):
+		pull = github_client.repository("sphinx-toolbox", "sphinx-autofixture").pull_request(10)
+		check_budget(github_client, lambda: label_pr_failures(pull), budget=4)
+
+
+def test_get_secrets(github_client: GitHub, check_budget: Callable) -> None:
+	# Recorded before get_secrets requested full pages.
+	with use_cassette(github_client, "test_get_secrets", match_requests_on=["method", "uri-without-per-page"]):
+		repo = github_client.repository("domdfcoding", "repo_helper_demo")
+		check_budget(github_client, lambda: get_secrets(repo), budget=1)
+
+
+def test_get_public_key(github_client: GitHub, check_budget: Callable) -> None:
+	with use_cassette(github_client, "test_secrets"):
+		repo = github_client.repository("domdfcoding", "repo_helper_demo")
+		check_budget(github_client, lambda: get_public_key(repo), budget=1)
+
+
+def test_protect_branch(github_client: GitHub, check_budget: Callable) -> None:
+	with use_cassette(github_client, "test_protect_branch"):
+		branch = github_client.repository("domdfcoding", "repo_helper_demo").branch("master")
+		check_budget(github_client, lambda: protect_branch(branch, ["Flake8"]), budget=1)
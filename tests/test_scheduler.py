@@ -0,0 +1,138 @@
+# stdlib
+import datetime
+import threading
+import time
+from typing import List
+
+# 3rd party
+import pytest
+from github3.exceptions import ForbiddenError
+
+# this package
+from github3_utils import RateLimitExceeded
+from github3_utils.fake_github import FakeGitHub
+from github3_utils.scheduler import HIGH, LOW, NORMAL, Scheduler
+from tests.conftest import FakeTimer, wait_for
+
+
+def test_priority_order() -> None:
+	order: List[str] = []
+	started = threading.Event()
+	release = threading.Event()
+
+	def blocker() -> None:
+		started.set()
+		release.wait()
+
+	with Scheduler(workers=1) as scheduler:
+		scheduler.submit(blocker)
+		started.wait()
+
+		futures = [
+				scheduler.submit(order.append, "low", priority=LOW),
+				scheduler.submit(order.append, "normal-1"),
+				scheduler.submit(order.append, "high", priority=HIGH),
+				scheduler.submit(order.append, "normal-2", priority=NORMAL),
+				]
+		assert scheduler.pending == 4
+		release.set()
+
+	assert all(future.done() for future in futures)
+	assert order == ["high", "normal-1", "normal-2", "low"]
+
+
+def test_reserve(limited_github: FakeGitHub) -> None:
+	limited_github.add_user("domdfcoding")
+	github = limited_github.client()
+	timer = FakeTimer()
+
+	with Scheduler(github, workers=1, reserve=5, timer=timer) as scheduler:
+		low = [scheduler.submit(github.user, "domdfcoding", priority=LOW) for _ in range(8)]
+
+		# Only 5 requests are left for low priority jobs. The rest are held.
+		wait_for(lambda: scheduler.pending == 3)
+		time.sleep(0.1)
+		assert scheduler.pending == 3
+		assert scheduler.remaining == 5
+		assert sum(future.done() for future in low) == 5
+
+		# High priority jobs may use the reserved requests.
+		high = [scheduler.submit(github.user, "domdfcoding", priority=HIGH) for _ in range(3)]
+		for future in high:
+			assert future.result(timeout=5) is not None
+		assert scheduler.remaining == 2
+		assert scheduler.pending == 3
+
+		# Once the limit resets the held jobs continue.
+		limited_github.set_remaining(10)
+		timer.now += 3600
+
+		for future in low:
+			assert future.result(timeout=5) is not None
+
+	assert limited_github.request_count == 11
+
+
+def test_rate_limited_job(limited_github: FakeGitHub) -> None:
+	limited_github.add_user("domdfcoding")
+	github = limited_github.client()
+	timer = FakeTimer()
+	limited_github.set_remaining(0)
+
+	with Scheduler(github, workers=1, timer=timer) as scheduler:
+		future = scheduler.submit(github.user, "domdfcoding", priority=HIGH)
+
+		# The job fails with the rate limit, and is held until the reset.
+		wait_for(lambda: scheduler.remaining == 0)
+		assert scheduler.pending == 1
+		assert not future.done()
+
+		limited_github.set_remaining(10)
+		timer.now += 3600
+		assert future.result(timeout=5).login == "domdfcoding"
+
+
+def test_rate_limit_exceeded() -> None:
+	timer = FakeTimer()
+	attempts = []
+
+	def job() -> int:
+		attempts.append(timer())
+		if len(attempts) == 1:
+			raise RateLimitExceeded(datetime.datetime.fromtimestamp(timer.now + 60))
+		return len(attempts)
+
+	with Scheduler(timer=timer) as scheduler:
+		future = scheduler.submit(job)
+		wait_for(lambda: scheduler.remaining == 0)
+
+		timer.now += 61
+		assert future.result(timeout=5) == 2
+
+
+def test_errors() -> None:
+	with Scheduler() as scheduler:
+		future = scheduler.submit(int, "not a number")
+
+		with pytest.raises(ValueError, match="invalid literal"):
+			future.result(timeout=5)
+
+	with pytest.raises(RuntimeError, match="Cannot submit jobs after the scheduler has been shut down."):
+		scheduler.submit(int, '1')
+
+
+def test_cancel_pending(limited_github: FakeGitHub) -> None:
+	limited_github.add_user("domdfcoding")
+	github = limited_github.client()
+	limited_github.set_remaining(0)
+
+	scheduler = Scheduler(github, workers=1)
+	parked = scheduler.submit(github.user, "domdfcoding")
+	wait_for(lambda: scheduler.remaining == 0)
+	queued = scheduler.submit(github.user, "domdfcoding")
+
+	scheduler.shutdown(cancel_pending=True)
+
+	assert queued.cancelled()
+	with pytest.raises(ForbiddenError, match="API rate limit exceeded"):
+		parked.result(timeout=5)
@@ -0,0 +1,186 @@
+# stdlib
+import functools
+import multiprocessing
+import os
+import pickle
+import stat
+import time
+from typing import Dict, Optional
+
+# 3rd party
+import pytest
+from domdf_python_tools.paths import PathPlus
+from github3 import GitHub
+
+# this package
+from github3_utils import RateLimitExceeded
+from github3_utils.apps import ContextSwitcher
+from github3_utils.fake_github import FakeGitHub
+from github3_utils.sharding import Coordinator, ShardedExecutor
+from tests.conftest import FakeTimer
+from tests.test_apps import FAKE_KEY
+
+
+def test_budget(tmp_pathplus: PathPlus) -> None:
+	timer = FakeTimer(1000.0)
+	coordinator = Coordinator(tmp_pathplus / "budget.json", lease_size=1, timer=timer)
+
+	# Requests are allowed until a response gives the limit.
+	coordinator.acquire("abc")
+	assert coordinator.remaining("abc") is None
+
+	coordinator.update("abc", 2, 1060)
+	coordinator.acquire("abc")
+	coordinator.acquire("abc")
+	assert coordinator.remaining("abc") == 0
+
+	with pytest.raises(RateLimitExceeded):
+		coordinator.acquire("abc")
+
+	# A response to an earlier request can't raise the estimate.
+	coordinator.update("abc", 1, 1060)
+	assert coordinator.remaining("abc") == 0
+
+	# Other credentials have their own quota.
+	coordinator.acquire("def")
+
+	# Once the limit resets requests are allowed again.
+	timer.now += 60
+	assert coordinator.remaining("abc") is None
+	coordinator.acquire("abc")
+
+	coordinator.update("abc", 5000, 4600)
+	assert coordinator.remaining("abc") == 5000
+
+
+def test_leases(tmp_pathplus: PathPlus) -> None:
+	timer = FakeTimer(1000.0)
+	filename = tmp_pathplus / "budget.json"
+	coordinator = Coordinator(filename, lease_size=10, timer=timer)
+	other = pickle.loads(pickle.dumps(coordinator))
+
+	coordinator.update("abc", 25, 1060)
+	mtime = filename.stat().st_mtime_ns
+
+	# The first request takes a lease of 10 requests from the file.
+	coordinator.acquire("abc")
+	assert coordinator.remaining("abc") == 15
+
+	# The rest of the lease, and the responses for the same period, don't touch the file.
+	os.utime(filename, ns=(mtime, mtime))
+	for _ in range(9):
+		coordinator.acquire("abc")
+		coordinator.update("abc", 20, 1060)
+	assert filename.stat().st_mtime_ns == mtime
+
+	# Other processes take their own leases.
+	other.acquire("abc")
+	assert coordinator.remaining("abc") == 5
+
+	# Responses noted during a lease are written when the next lease is taken.
+	coordinator.update("abc", 3, 1060)
+	coordinator.acquire("abc")
+	assert coordinator.remaining("abc") == 0
+
+	# Once the quota is leased out no more requests are allowed.
+	for _ in range(2):
+		coordinator.acquire("abc")
+	with pytest.raises(RateLimitExceeded):
+		coordinator.acquire("abc")
+
+	# A response for the next period replaces the lease.
+	coordinator.update("abc", 5000, 4600)
+	timer.now += 60
+	assert coordinator.remaining("abc") == 5000
+	coordinator.acquire("abc")
+
+	with pytest.raises(ValueError, match="'lease_size' must be at least 1."):
+		Coordinator(filename, lease_size=0)
+
+
+def test_reserve(tmp_pathplus: PathPlus) -> None:
+	coordinator = Coordinator(tmp_pathplus / "budget.json", reserve=1, timer=FakeTimer(1000.0))
+	coordinator.update("abc", 2, 1060)
+	coordinator.acquire("abc")
+
+	with pytest.raises(RateLimitExceeded):
+		coordinator.acquire("abc")
+
+
+def test_tokens(tmp_pathplus: PathPlus) -> None:
+	timer = FakeTimer(1000.0)
+	coordinator = Coordinator(tmp_pathplus / "budget.json", timer=timer)
+
+	expires_at = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(timer.now + 3600))
+	coordinator.set_token(1234, "ghs_abc", expires_at)
+
+	assert coordinator.get_token(1234) == {"token": "ghs_abc", "expires_at": expires_at}
+
+	# Copies share the same state.
+	copy = pickle.loads(pickle.dumps(coordinator))
+	assert copy.get_token(1234) == {"token": "ghs_abc", "expires_at": expires_at}
+	assert coordinator.get_token(5678) is None
+
+	if os.name != "nt":
+		assert stat.S_IMODE((tmp_pathplus / "budget.json").stat().st_mode) == 0o600
+
+	# Tokens which are about to expire aren't used.
+	timer.now += 3550
+	assert coordinator.get_token(1234) is None
+
+
+def test_shared_installation_token(fake_github: FakeGitHub, tmp_pathplus: PathPlus) -> None:
+	fake_github.add_org("sphinx-toolbox")
+	fake_github.add_repo("sphinx-toolbox", "sphinx-toolbox")
+	installation_id = fake_github.add_installation("sphinx-toolbox", app_id=89426)
+
+	coordinator = Coordinator(tmp_pathplus / "budget.json")
+
+	for _ in range(3):
+		switcher = ContextSwitcher(
+				fake_github.client(None),
+				str(FAKE_KEY).encode("UTF-8"),
+				89426,
+				token_cache=coordinator,
+				)
+		client = switcher.installation_client(installation_id)
+		assert client.repository("sphinx-toolbox", "sphinx-toolbox") is not None
+
+	assert fake_github.requests.count(("POST", f"/app/installations/{installation_id}/access_tokens")) == 1
+
+
+def make_client(api_url: str) -> GitHub:
+	github = GitHub(token="FAKE_TOKEN")
+	github.session.base_url = api_url
+	return github
+
+
+def get_repo(github: GitHub, full_name: str) -> Optional[str]:
+	owner, name = full_name.split('/')
+
+	try:
+		return github.repository(owner, name).full_name
+	except RateLimitExceeded:
+		return None
+
+
+def test_sharded_executor(tmp_pathplus: PathPlus) -> None:
+	with FakeGitHub(rate_limit=10) as server:
+		server.add_org("sphinx-toolbox")
+		names = [f"sphinx-toolbox/repo-{idx:03d}" for idx in range(20)]
+		for full_name in names:
+			server.add_repo(*full_name.split('/'))
+
+		coordinator = Coordinator(tmp_pathplus / "budget.json")
+		factory = functools.partial(make_client, server.api)
+		context = multiprocessing.get_context("spawn")
+
+		with ShardedExecutor(factory, coordinator, processes=2, mp_context=context) as executor:
+			results = list(executor.map(get_repo, names, chunksize=2))
+
+		# The processes share the quota, so once it is used up no more requests are sent.
+		# A process may finish with some of its lease unused.
+		succeeded: Dict[str, str] = {name: result for name, result in zip(names, results) if result is not None}
+		assert 5 <= len(succeeded) <= 10
+		assert all(name == result for name, result in succeeded.items())
+		assert server.request_count == len(succeeded)
@@ -0,0 +1,150 @@
+# stdlib
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator, List, Optional
+
+# 3rd party
+import pytest
+from github3 import GitHub
+from github3.exceptions import NotFoundError
+
+# this package
+from github3_utils.fake_github import FakeGitHub
+from github3_utils.single_flight import SingleFlight, SingleFlightAdapter
+from github3_utils.token_pool import TokenPool
+
+
+@pytest.fixture()
+def slow_github() -> Iterator[FakeGitHub]:
+	with FakeGitHub(latency=0.2) as server:
+		server.add_repo("domdfcoding", "github3-utils")
+		yield server
+
+
+def fetch_concurrently(github: GitHub, num_threads: int = 8, name: str = "github3-utils") -> List[Optional[str]]:
+	barrier = threading.Barrier(num_threads)
+
+	def fetch(idx: int) -> Optional[str]:
+		barrier.wait()
+		repo = github.repository("domdfcoding", name)
+		return repo.full_name
+
+	with ThreadPoolExecutor(num_threads) as executor:
+		return list(executor.map(fetch, range(num_threads)))
+
+
+def test_shared(slow_github: FakeGitHub) -> None:
+	github = slow_github.client()
+	single_flight = SingleFlight()
+	single_flight.install(github)
+	single_flight.install(github)
+
+	# Installing twice doesn't wrap the adapters again.
+	adapter = github.session.adapters["https://"]
+	assert isinstance(adapter, SingleFlightAdapter)
+	assert not isinstance(adapter.adapter, SingleFlightAdapter)
+
+	assert fetch_concurrently(github) == ["domdfcoding/github3-utils"] * 8
+	assert slow_github.request_count == 1
+	assert single_flight.shared == 7
+
+	# Later requests are sent again.
+	assert github.repository("domdfcoding", "github3-utils") is not None
+	assert slow_github.request_count == 2
+
+
+def test_not_shared(slow_github: FakeGitHub) -> None:
+	assert fetch_concurrently(slow_github.client(), num_threads=4) == ["domdfcoding/github3-utils"] * 4
+	assert slow_github.request_count == 4
+
+
+def test_token_pool(slow_github: FakeGitHub) -> None:
+	pool = TokenPool(["FIRST", "SECOND"])
+	github = slow_github.client(None)
+	pool.install(github)
+	single_flight = SingleFlight()
+	single_flight.install(github)
+
+	# Prime the pool's estimates, so the concurrent requests are given different tokens.
+	for _ in range(2):
+		github.repository("domdfcoding", "github3-utils")
+
+	assert fetch_concurrently(github) == ["domdfcoding/github3-utils"] * 8
+	assert slow_github.request_count == 3
+	assert single_flight.shared == 7
+
+	# Only the token which was used has a lower estimate.
+	remaining = [pool.remaining("FIRST"), pool.remaining("SECOND")]
+	assert sorted(count for count in remaining if count is not None) == [4998, 4999]
+
+
+def test_different_tokens(slow_github: FakeGitHub) -> None:
+	single_flight = SingleFlight()
+	clients = [slow_github.client("FIRST"), slow_github.client("SECOND")]
+	for github in clients:
+		single_flight.install(github)
+
+	barrier = threading.Barrier(2)
+
+	def fetch(github: GitHub) -> None:
+		barrier.wait()
+		github.repository("domdfcoding", "github3-utils")
+
+	with ThreadPoolExecutor(2) as executor:
+		list(executor.map(fetch, clients))
+
+	assert slow_github.request_count == 2
+	assert single_flight.shared == 0
+
+
+def test_shared_error(slow_github: FakeGitHub) -> None:
+	github = slow_github.client()
+	SingleFlight().install(github)
+
+	with pytest.raises(NotFoundError):
+		fetch_concurrently(github, num_threads=4, name="missing")
+
+	assert slow_github.request_count == 1
+
+
+def test_asyncio_executor(slow_github: FakeGitHub) -> None:
+	github = slow_github.client()
+	SingleFlight().install(github)
+
+	async def main() -> List[str]:
+		loop = asyncio.get_running_loop()
+		futures = [loop.run_in_executor(None, github.repository, "domdfcoding", "github3-utils") for _ in range(4)]
+		return [repo.full_name for repo in await asyncio.gather(*futures)]
+
+	assert asyncio.run(main()) == ["domdfcoding/github3-utils"] * 4
+	assert slow_github.request_count == 1
+
+
+def test_do_async() -> None:
+	single_flight = SingleFlight()
+	calls = []
+
+	async def lookup(login: str) -> str:
+		calls.append(login)
+		await asyncio.sleep(0.05)
+		if login == "missing":
+			raise ValueError("No such user")
+		return login.upper()
+
+	async def main() -> None:
+		results = await asyncio.gather(
+				*(single_flight.do_async(login, functools.partial(lookup, login)) for login in ['a', 'a', 'b']),
+				)
+		assert sorted(results) == [('A', False), ('A', True), ('B', False)]
+
+		for outcome in await asyncio.gather(
+				*(single_flight.do_async("missing", functools.partial(lookup, "missing")) for _ in range(3)),
+				return_exceptions=True,
+				):
+			assert isinstance(outcome, ValueError)
+
+	asyncio.run(main())
+	assert calls == ['a', 'b', "missing"]
+	assert single_flight.shared == 3
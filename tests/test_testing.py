@@ -1,7 +1,24 @@
+# stdlib
+import os
+from typing import Any, List
+
 # 3rd party
 import pytest
+from betamax import Betamax  # type: ignore[import-untyped]
+from betamax.configure import Configuration  # type: ignore[import-untyped]
+from domdf_python_tools.paths import PathPlus
 from github3 import GitHub
 
+# this package
+from github3_utils import get_user, protect_branch, testing
+from github3_utils.testing import (
+		CachedJSONSerializer,
+		MsgpackSerializer,
+		clear_cassette_cache,
+		compact_cassette,
+		convert_to_msgpack
+		)
+
 # Both tests should use the same cassette.
 
 
@@ -13,3 +30,108 @@ def test_module_cassette_a(github_client: GitHub) -> None:
 @pytest.mark.usefixtures("module_cassette")
 def test_module_cassette_b(github_client: GitHub) -> None:
 	github_client.user("domdfcoding")
+
+
+def test_cassette_cache(monkeypatch, tmp_pathplus: PathPlus) -> None:
+	clear_cassette_cache()
+
+	calls = []
+	original_loads = testing.json.loads
+
+	def loads(data: str, **kwargs: Any) -> Any:
+		if "http_interactions" in data:
+			calls.append(data)
+		return original_loads(data, **kwargs)
+
+	monkeypatch.setattr(testing.json, "loads", loads)
+
+	def replay() -> None:
+		github = GitHub(token="FAKE_TOKEN")  # nosec: B106
+
+		with Betamax(github.session) as vcr:
+			vcr.use_cassette("test_get_user", record="none", serialize_with=CachedJSONSerializer.name)
+			assert get_user(github).login == "domdfcoding"
+
+	cassettes = PathPlus(__file__).parent / "cassettes"
+	(tmp_pathplus / "test_get_user.json").write_clean((cassettes / "test_get_user.json").read_text())
+	monkeypatch.setattr(Configuration, "CASSETTE_LIBRARY_DIR", os.fspath(tmp_pathplus))
+
+	for _ in range(3):
+		replay()
+
+	assert len(calls) == 1
+
+	# Cassettes which have changed are parsed again.
+	stat = (tmp_pathplus / "test_get_user.json").stat()
+	os.utime(tmp_pathplus / "test_get_user.json", ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+	replay()
+	replay()
+	assert len(calls) == 2
+
+	# Content read other than through Betamax isn't cached.
+	content = (tmp_pathplus / "test_get_user.json").read_text()
+	for _ in range(2):
+		assert CachedJSONSerializer().deserialize(content)["http_interactions"]
+	assert len(calls) == 4
+	assert len(testing._cassette_cache) == 2
+
+
+def test_msgpack_cassette(monkeypatch, tmp_pathplus: PathPlus) -> None:
+	pytest.importorskip("msgpack")
+
+	cassettes = PathPlus(__file__).parent / "cassettes"
+	(tmp_pathplus / "test_get_user.json").write_clean((cassettes / "test_get_user.json").read_text())
+
+	filename = convert_to_msgpack(tmp_pathplus / "test_get_user.json", remove=True)
+	assert filename == os.fspath(tmp_pathplus / "test_get_user.msgpack")
+	assert not (tmp_pathplus / "test_get_user.json").exists()
+
+	# The cassette library directory is global, so restore it after the test.
+	monkeypatch.setattr(Configuration, "CASSETTE_LIBRARY_DIR", os.fspath(tmp_pathplus))
+	github = GitHub(token="FAKE_TOKEN")  # nosec: B106
+
+	with Betamax(github.session) as vcr:
+		testing._use_cassette(vcr, "test_get_user")
+		assert vcr.current_cassette.serializer.proxied_serializer.name == MsgpackSerializer.name
+		assert get_user(github).login == "domdfcoding"
+
+
+def _protect(github: GitHub) -> List[str]:
+	repo = github.repository("domdfcoding", "repo_helper_demo")
+	protect_branch(repo.branch("master"), ["Python 3.6", "mypy"])
+	protection = repo.branch("master").protection()
+	return list(protection.required_status_checks.contexts())
+
+
+def test_compact_cassette(tmp_pathplus: PathPlus) -> None:
+	cassettes = PathPlus(__file__).parent / "cassettes"
+	filename = tmp_pathplus / "test_protect_branch.json"
+	filename.write_text((cassettes / "test_protect_branch.json").read_text())
+
+	result = compact_cassette(filename, drop_keys=["node_id"], check=_protect)
+
+	assert result.original_size == os.path.getsize(cassettes / "test_protect_branch.json")
+	assert result.compacted_size == os.path.getsize(filename)
+	assert result.compacted_size < result.original_size / 2
+	assert result.duplicate_bodies == 1
+
+	content = filename.read_text()
+	assert "node_id" not in content
+	assert "X-GitHub-Request-Id" not in content
+	assert "X-RateLimit-Remaining" in content
+	assert not list(tmp_pathplus.glob("*.compacting.*"))
+
+	# Compacting again changes nothing.
+	assert compact_cassette(filename, drop_keys=["node_id"]).compacted_size == result.compacted_size
+
+
+def test_compact_cassette_mismatch(tmp_pathplus: PathPlus) -> None:
+	cassettes = PathPlus(__file__).parent / "cassettes"
+	filename = tmp_pathplus / "test_protect_branch.json"
+	filename.write_text((cassettes / "test_protect_branch.json").read_text())
+
+	with pytest.raises(ValueError, match="Replaying the compacted cassette .* failed"):
+		compact_cassette(filename, drop_keys=["*_url"], check=_protect)
+
+	assert filename.read_text() == (cassettes / "test_protect_branch.json").read_text()
+	assert not list(tmp_pathplus.glob("*.compacting.*"))
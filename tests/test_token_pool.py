@@ -0,0 +1,164 @@
+# stdlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List
+
+# 3rd party
+import pytest
+from github3 import GitHub
+from github3.exceptions import ForbiddenError
+from requests import PreparedRequest, Response, Session
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+
+# this package
+from github3_utils import RateLimitExceeded
+from github3_utils.fake_github import FakeGitHub
+from github3_utils.single_flight import SingleFlight, SingleFlightAdapter
+from github3_utils.token_pool import TokenPool
+
+
+def pooled_client(fake_github: FakeGitHub, pool: TokenPool) -> GitHub:
+	github = fake_github.client(None)
+	pool.install(github)
+	return github
+
+
+def test_rotation(fake_github: FakeGitHub) -> None:
+	fake_github.add_user("domdfcoding")
+	fake_github.set_remaining(3, "FIRST")
+	fake_github.set_remaining(5, "SECOND")
+
+	pool = TokenPool(["FIRST", "SECOND", "FIRST"])
+	assert pool.tokens == ["FIRST", "SECOND"]
+	assert pool.remaining("FIRST") is None
+
+	github = pooled_client(fake_github, pool)
+
+	for _ in range(8):
+		assert github.user("domdfcoding") is not None
+
+	assert pool.remaining("FIRST") == 0
+	assert pool.remaining("SECOND") == 0
+
+	with pytest.raises(RateLimitExceeded, match="No requests available!"):
+		github.user("domdfcoding")
+
+
+def test_retry_when_exhausted(fake_github: FakeGitHub) -> None:
+	fake_github.add_user("domdfcoding")
+	fake_github.set_remaining(0, "FIRST")
+
+	pool = TokenPool(["FIRST", "SECOND"])
+	github = pooled_client(fake_github, pool)
+
+	# The first request is rejected, and retried with the other token.
+	response = github.session.get(f"{fake_github.api}/users/domdfcoding")
+	assert response.status_code == 200
+	assert [previous.status_code for previous in response.history] == [403]
+	assert response.request.headers["Authorization"] == "token SECOND"
+
+	assert pool.remaining("FIRST") == 0
+	assert pool.remaining("SECOND") == 4999
+
+	# Later requests go straight to the token with quota remaining.
+	request_count = fake_github.request_count
+	assert github.user("domdfcoding") is not None
+	assert fake_github.request_count == request_count + 1
+
+
+def test_retry_passes_through_session(fake_github: FakeGitHub) -> None:
+	fake_github.add_user("domdfcoding")
+	fake_github.set_remaining(0, "FIRST")
+
+	github = pooled_client(fake_github, TokenPool(["FIRST", "SECOND"]))
+	SingleFlight().install(github)
+
+	statuses: List[int] = []
+	github.session.hooks["response"].append(lambda response, **kwargs: statuses.append(response.status_code))
+
+	response = github.session.get(f"{fake_github.api}/users/domdfcoding")
+	assert response.status_code == 200
+
+	# Both the rejected request and the retry are seen by the session's hooks and adapters.
+	assert statuses == [403, 200]
+	assert isinstance(response.connection, SingleFlightAdapter)
+	assert isinstance(response.history[0].connection, SingleFlightAdapter)
+
+
+class StubAdapter(BaseAdapter):
+
+	def __init__(self) -> None:
+		super().__init__()
+		self.headers: Dict[str, str] = {}
+
+	def send(self, request: PreparedRequest, **kwargs: Any) -> Response:  # type: ignore[override]
+		response = Response()
+		response.status_code = 200 if self.headers else 304
+		response.headers = CaseInsensitiveDict(self.headers)
+		response.request = request
+		response._content = b''
+		response.connection = self  # type: ignore[assignment]
+		return response
+
+
+def test_reservation_released() -> None:
+	pool = TokenPool(["FIRST"])
+	adapter = StubAdapter()
+	session = Session()
+	session.auth = pool
+	session.mount("https://", adapter)
+
+	adapter.headers = {"X-RateLimit-Remaining": "10", "X-RateLimit-Reset": "9999999999"}
+	session.get("https://api.github.com/users/domdfcoding")
+	assert pool.remaining("FIRST") == 10
+
+	# Responses without the core rate limit headers (such as 304s) don't use up the estimate.
+	adapter.headers = {}
+	for _ in range(3):
+		assert session.get("https://api.github.com/users/domdfcoding").status_code == 304
+
+	adapter.headers = {
+			"X-RateLimit-Remaining": "20", "X-RateLimit-Reset": "9999999999", "X-RateLimit-Resource": "search"
+			}
+	session.get("https://api.github.com/search/repositories")
+
+	assert pool.remaining("FIRST") == 10
+
+
+def test_all_exhausted(fake_github: FakeGitHub) -> None:
+	fake_github.add_user("domdfcoding")
+	fake_github.set_remaining(0, "FIRST")
+	fake_github.set_remaining(0, "SECOND")
+
+	github = pooled_client(fake_github, TokenPool(["FIRST", "SECOND"]))
+
+	with pytest.raises(RateLimitExceeded):
+		github.user("domdfcoding")
+
+	# Without a pool the single token's limit is reported by github3.py
+	with pytest.raises(ForbiddenError):
+		fake_github.client("FIRST").user("domdfcoding")
+
+
+def test_concurrent(fake_github: FakeGitHub) -> None:
+	fake_github.add_user("domdfcoding")
+
+	for token in ["FIRST", "SECOND", "THIRD"]:
+		fake_github.set_remaining(20, token)
+
+	pool = TokenPool(["FIRST", "SECOND", "THIRD"])
+	github = pooled_client(fake_github, pool)
+
+	def fetch(idx: int) -> int:
+		return github.session.get(f"{fake_github.api}/users/domdfcoding").status_code
+
+	with ThreadPoolExecutor(6) as executor:
+		statuses = list(executor.map(fetch, range(60)))
+
+	assert statuses == [200] * 60
+	assert [pool.remaining(token) for token in pool.tokens] == [0, 0, 0]
+
+
+def test_no_tokens() -> None:
+	with pytest.raises(ValueError, match="At least one token must be provided."):
+		TokenPool(['', ''])
@@ -0,0 +1,115 @@
+# stdlib
+import json
+
+# 3rd party
+import pytest
+from betamax import Betamax  # type: ignore[import-untyped]
+from domdf_python_tools.paths import PathPlus
+from github3 import GitHub
+from github3.exceptions import AuthenticationFailed
+
+# this package
+from github3_utils import get_user, iter_repos
+from github3_utils.check_labels import label_pr_failures
+from github3_utils.tracing import InMemoryExporter, JSONLinesExporter, Tracer
+
+
+def test_label_pr_failures(github_client: GitHub) -> None:
+	exporter = InMemoryExporter()
+	tracer = Tracer(exporter)
+
+	with Betamax(github_client.session) as vcr:
+		vcr.use_cassette("test_check_labels", record="none")
+
+		pull = github_client.repository("sphinx-toolbox", "sphinx-autofixture").pull_request(10)
+
+		tracer.install(github_client)
+		label_pr_failures(pull)
+		tracer.shutdown()
+
+	spans = {span.name: span for span in exporter.spans}
+
+	assert list(spans) == [
+			"GET /repos/{owner}/{repo}/commits/{ref}/check-runs",
+			"get_checks_for_pr",
+			"GET /repos/{owner}/{repo}/issues/{id}",
+			"GET /repos/{owner}/{repo}/issues/{id}/labels",
+			"POST /repos/{owner}/{repo}/issues/{id}/labels",
+			"label_pr_failures",
+			]
+
+	root = spans["label_pr_failures"]
+	assert root.parent_id is None
+	assert root.kind == "helper"
+	assert root.status == "ok"
+	assert {span.trace_id for span in exporter.spans} == {root.trace_id}
+
+	assert spans["get_checks_for_pr"].parent_id == root.span_id
+	assert spans["POST /repos/{owner}/{repo}/issues/{id}/labels"].parent_id == root.span_id
+
+	check_runs = spans["GET /repos/{owner}/{repo}/commits/{ref}/check-runs"]
+	assert check_runs.parent_id == spans["get_checks_for_pr"].span_id
+	assert check_runs.kind == "http"
+	assert check_runs.attributes == {
+			"http.method": "GET",
+			"http.url_template": "/repos/{owner}/{repo}/commits/{ref}/check-runs",
+			"http.status_code": 200,
+			"http.page": 1,
+			}
+
+	for span in exporter.spans:
+		assert span.duration is not None
+		assert span.duration >= 0
+
+
+@pytest.mark.usefixtures("cassette")
+def test_get_repos(github_client: GitHub, tmp_pathplus: PathPlus) -> None:
+	tracer = Tracer(JSONLinesExporter(tmp_pathplus / "spans.jsonl"))
+	tracer.install(github_client)
+
+	for _ in iter_repos(github_client, ["domdfcoding"]):
+		pass
+
+	tracer.shutdown()
+
+	spans = {}
+	for line in (tmp_pathplus / "spans.jsonl").read_lines():
+		if line:
+			span = json.loads(line)
+			spans[span["name"]] = span
+
+	assert list(spans) == [
+			"GET /users/{username}",
+			"GET /users/{username}/repos",
+			"GET /user/{id}/repos",
+			"get_repos",
+			"iter_repos",
+			]
+
+	assert spans["GET /users/{username}"]["parent_id"] == spans["iter_repos"]["span_id"]
+	assert spans["GET /users/{username}/repos"]["parent_id"] == spans["get_repos"]["span_id"]
+	assert spans["GET /user/{id}/repos"]["attributes"]["http.page"] == 2
+	assert spans["get_repos"]["parent_id"] == spans["iter_repos"]["span_id"]
+
+
+def test_error() -> None:
+	github = GitHub('')
+	exporter = InMemoryExporter()
+	tracer = Tracer(exporter)
+
+	with Betamax(github.session) as vcr:
+		vcr.use_cassette("test_get_user_no_auth", record="none")
+
+		tracer.install(github)
+
+		with pytest.raises(AuthenticationFailed):
+			get_user(github)
+
+		tracer.uninstall(github)
+
+	http_span, helper_span = exporter.spans
+	assert http_span.status == "error"
+	assert http_span.attributes["http.status_code"] == 401
+	assert helper_span.name == "get_user"
+	assert helper_span.status == "error"
+	assert helper_span.attributes["error"].startswith("AuthenticationFailed: 401")
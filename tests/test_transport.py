@@ -0,0 +1,110 @@
+# stdlib
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+# 3rd party
+import pytest
+from click.testing import CliRunner
+from github3.exceptions import ConnectionError, NotFoundError
+
+# this package
+from github3_utils import get_repos, get_user, iter_repos
+from github3_utils.__main__ import main
+from github3_utils.fake_github import FakeGitHub
+from github3_utils.single_flight import SingleFlight
+
+httpx = pytest.importorskip("httpx")
+
+# this package
+from github3_utils.transport import HTTPXAdapter  # noqa: E402
+
+
+def test_helpers(fake_github: FakeGitHub) -> None:
+	fake_github.add_user("domdfcoding")
+	for idx in range(150):
+		fake_github.add_repo("domdfcoding", f"repo-{idx:03d}")
+
+	github = fake_github.client()
+	adapter = HTTPXAdapter.install(github)
+
+	# The Link header is used to find the second page.
+	names = [repo.name for repo in iter_repos(github, ["domdfcoding"])]
+	assert names == [f"repo-{idx:03d}" for idx in range(150)]
+
+	user = get_user(github)
+	assert user.login == "domdfcoding"
+	assert len(list(get_repos(user))) == 150
+	assert github.session.get_adapter(fake_github.api) is adapter
+
+	with pytest.raises(NotFoundError):
+		github.repository("domdfcoding", "missing")
+
+	github.session.close()
+	assert adapter.client.is_closed
+
+
+def test_concurrent(fake_github: FakeGitHub) -> None:
+	fake_github.add_user("domdfcoding")
+	for idx in range(20):
+		fake_github.add_repo("domdfcoding", f"repo-{idx:03d}")
+
+	github = fake_github.client()
+	HTTPXAdapter.install(github)
+	SingleFlight().install(github)
+
+	def get_repo(idx: int) -> str:
+		return github.repository("domdfcoding", f"repo-{idx:03d}").full_name
+
+	with ThreadPoolExecutor(8) as pool:
+		results = list(pool.map(get_repo, range(20)))
+
+	assert results == [f"domdfcoding/repo-{idx:03d}" for idx in range(20)]
+
+
+def test_given_client(fake_github: FakeGitHub) -> None:
+	fake_github.add_user("domdfcoding")
+
+	with httpx.Client(headers={"X-Test": "yes"}) as client:
+		github = fake_github.client()
+		HTTPXAdapter.install(github, client)
+		assert get_user(github).login == "domdfcoding"
+
+		# The client is left open for its owner to close.
+		github.session.close()
+		assert not client.is_closed
+
+
+def test_connection_error() -> None:
+	with FakeGitHub() as server:
+		github = server.client()
+		api = server.api
+
+	HTTPXAdapter.install(github)
+	github.session.base_url = api
+
+	with pytest.raises(ConnectionError):
+		get_user(github)
+
+
+def test_cli(fake_github: FakeGitHub) -> None:
+	fake_github.add_org("sphinx-toolbox")
+	for idx in range(120):
+		fake_github.add_repo("sphinx-toolbox", f"repo-{idx:03d}")
+
+	args = [
+			"repos",
+			"-o",
+			"sphinx-toolbox",
+			"--jobs",
+			'4',
+			"--http2",
+			"--api-url",
+			fake_github.api,
+			"-t",
+			"FAKE_TOKEN"
+			]
+	result = CliRunner().invoke(main, args=args)
+	assert result.exit_code == 0, result.output
+
+	names = [json.loads(line)["full_name"] for line in result.stdout.splitlines()]
+	assert names == [f"sphinx-toolbox/repo-{idx:03d}" for idx in range(120)]